@@ -7,6 +7,9 @@ from fastapi import APIRouter, UploadFile, File, Form, HTTPException
 from typing import Optional
 import json
 
+from edge.edge_result import EdgeAnalysis
+from edge.media import MEDIA_SETTINGS, UploadTooLargeError, spool_upload
+
 router = APIRouter(prefix="/edge", tags=["Edge AI"])
 
 # Services will be injected
@@ -41,7 +44,9 @@ async def submit_symptom_report(
         raise HTTPException(400, "Invalid JSON in symptoms or metadata")
     
     # Process with Edge AI
-    edge_result = await _edge_service.normalize_symptoms(symptoms_list, metadata_dict)
+    edge_result = EdgeAnalysis(
+        normalized=await _edge_service.normalize_symptoms(symptoms_list, metadata_dict)
+    )
     
     # Send to Swarm
     swarm_result = await _swarm_service.process_symptom_report(
@@ -53,7 +58,7 @@ async def submit_symptom_report(
     return {
         'status': 'success',
         'village_id': village_id,
-        'edge_analysis': edge_result,
+        'edge_analysis': edge_result.to_dict(),
         'swarm_response': swarm_result
     }
 
@@ -66,10 +71,17 @@ async def process_voice_only(
     if not _edge_service:
         raise HTTPException(500, "Edge AI service not initialized")
     
-    audio_data = await audio.read()
-    result = await _edge_service.process_voice(audio_data)
+    # Stream into a bounded spooled temp file (413 if too large)
+    try:
+        audio_file = await spool_upload(audio, MEDIA_SETTINGS['max_voice_bytes'])
+    except UploadTooLargeError as e:
+        raise HTTPException(413, str(e))
+    try:
+        result = await _edge_service.process_voice(audio_file.read())
+    finally:
+        audio_file.close()
     
-    return result
+    return result.to_dict()
 
 @router.post("/process-image")
 async def process_image_only(image: UploadFile = File(...)):
@@ -77,7 +89,13 @@ async def process_image_only(image: UploadFile = File(...)):
     if not _edge_service:
         raise HTTPException(500, "Edge AI service not initialized")
     
-    image_data = await image.read()
-    result = await _edge_service.process_image(image_data)
+    try:
+        image_file = await spool_upload(image, MEDIA_SETTINGS['max_image_bytes'])
+    except UploadTooLargeError as e:
+        raise HTTPException(413, str(e))
+    try:
+        result = await _edge_service.process_image(image_file)
+    finally:
+        image_file.close()
     
-    return result
+    return result.to_dict()
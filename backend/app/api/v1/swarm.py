@@ -28,7 +28,7 @@ async def detect_anomalies(village_id: str):
     if not _swarm_service:
         raise HTTPException(500, "Swarm service not initialized")
     
-    agent = _swarm_service.orchestrator.agents.get(village_id)
+    agent = _swarm_service.orchestrator.get_agent(village_id)
     if not agent:
         raise HTTPException(404, "Agent not found")
     
@@ -2,16 +2,25 @@
 Updated FastAPI Backend with ADK Integration
 """
 
-from fastapi import FastAPI, HTTPException, UploadFile, File
+from fastapi import FastAPI, HTTPException, UploadFile, File, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict
 from datetime import datetime
+import asyncio
+import inspect
+import json
 import os
 
 # Import services
 from backend.app.services.edge_ai_service import GeminiEdgeProcessor
 from backend.app.services.quantum_service import QuantumService
+from backend.app.services.report_pipeline import ReportPipeline
+from swarm.orchestrator.agent_mailbox import MailboxFullError
+from edge.local_model import model_from_env
+from edge.media import UploadTooLargeError
 
 # ============================================================================
 # Initialize FastAPI
@@ -40,11 +49,16 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "your-api-key")
 
 # Initialize in correct order (quantum first, then swarm with quantum)
 quantum_service = QuantumService()
-gemini_processor = GeminiEdgeProcessor(api_key=GEMINI_API_KEY)
+gemini_processor = GeminiEdgeProcessor(
+    api_key=GEMINI_API_KEY,
+    cache_path=os.getenv("SYMPTOM_CACHE_PATH", "data/symptom_phrase_cache.jsonl"),
+    model=model_from_env()  # EDGE_MODEL_BACKEND=local -> offline stand-in
+)
 
 # Import and initialize ADK swarm service with quantum service
 from backend.app.services.adk_swarm_service import ADKSwarmService
 adk_swarm_service = ADKSwarmService(quantum_service=quantum_service)
+report_pipeline = ReportPipeline(gemini_processor, adk_swarm_service, quantum_service)
 
 # ============================================================================
 # Data Models
@@ -56,6 +70,32 @@ class SymptomReportRequest(BaseModel):
     environmental_factors: Optional[List[str]] = []
     vital_signs: Optional[Dict] = {}
 
+# ============================================================================
+# Conditional Responses (ETag per swarm state version)
+# ============================================================================
+
+async def versioned_response(request: Request, build):
+    """
+    Serve `build()` tagged with the swarm state version.
+    
+    Clients sending a matching If-None-Match get 304 without the body being
+    rebuilt; otherwise `build` (sync or async) runs against the cached
+    network-status snapshot.
+    """
+    etag = adk_swarm_service.orchestrator.etag
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    payload = build()
+    if inspect.isawaitable(payload):
+        payload = await payload
+    return JSONResponse(jsonable_encoder(payload), headers={"ETag": etag})
+
+# Latest quantum insight (a task, shared by concurrent requests), keyed by the
+# ETag of the state it was computed from
+_quantum_insights_cache = {'etag': None, 'result': None}
+
 # ============================================================================
 # API Endpoints
 # ============================================================================
@@ -79,21 +119,24 @@ async def root():
     }
 
 @app.get("/health")
-async def health_check():
-    adk_status = adk_swarm_service.get_network_status()
-    
-    return {
-        "status": "healthy",
-        "services": {
-            "edge_ai": "operational",
-            "adk_swarm": "operational",
-            "quantum": "operational"
-        },
-        "adk_agents": {
-            "total": adk_status['total_agents'],
-            "active": adk_status['total_agents']
+async def health_check(request: Request):
+    def build():
+        adk_status = adk_swarm_service.get_network_status()
+        
+        return {
+            "status": "healthy",
+            "services": {
+                "edge_ai": "operational",
+                "adk_swarm": "operational",
+                "quantum": "operational"
+            },
+            "adk_agents": {
+                "total": adk_status['total_agents'],
+                "active": adk_status['total_agents']
+            }
         }
-    }
+    
+    return await versioned_response(request, build)
 
 # ============================================================================
 # Edge AI Endpoints (Gemini)
@@ -110,96 +153,39 @@ async def submit_symptom_report(
     Process symptom report with optional voice/image analysis.
     
     Flow:
-    1. Gemini processes voice/image (Edge AI) - ONLY for multimodal input
+    1. Gemini processes voice/image concurrently (Edge AI) - ONLY for multimodal input
     2. Swarm agent analyzes symptoms (rule-based - NO LLM)
     3. If consensus, trigger quantum analysis
     """
     
-    print(f"\n{'='*70}")
-    print(f"📥 NEW SYMPTOM REPORT: Village {village_id}")
-    print(f"   Symptoms: {symptoms}")
-    print(f"   Has Voice: {voice is not None}")
-    print(f"   Has Image: {image is not None}")
-    print(f"{'='*70}")
-    
-    # STEP 1: Process with Gemini (Edge AI) - ONLY for voice/image
-    edge_analysis = {}
-    
-    if voice:
-        try:
-            voice_bytes = await voice.read()
-            print(f"🎤 Processing voice ({len(voice_bytes)} bytes)...")
-            voice_result = await gemini_processor.process_voice(voice_bytes)
-            edge_analysis['voice'] = voice_result
-            # Add extracted symptoms
-            extracted = voice_result.get('symptoms_extracted', [])
-            if extracted:
-                symptoms.extend(extracted)
-                print(f"   Extracted symptoms: {extracted}")
-        except Exception as e:
-            print(f"❌ Voice processing error: {e}")
-            edge_analysis['voice'] = {'error': str(e)}
-    
-    if image:
-        try:
-            image_bytes = await image.read()
-            print(f"📷 Processing image ({len(image_bytes)} bytes)...")
-            image_result = await gemini_processor.process_image(image_bytes)
-            edge_analysis['image'] = image_result
-            print(f"   Detected conditions: {image_result.get('detected_conditions', [])}")
-            print(f"   Severity: {image_result.get('severity', 'unknown')}")
-            print(f"   Description: {image_result.get('description', 'N/A')[:100]}...")
-        except Exception as e:
-            print(f"❌ Image processing error: {e}")
-            edge_analysis['image'] = {'error': str(e)}
-    
-    # Normalize symptoms (uses Gemini for translation/normalization)
     try:
-        normalized = await gemini_processor.normalize_symptoms(symptoms, {})
-        edge_analysis['normalized'] = normalized
-    except Exception as e:
-        edge_analysis['normalized'] = {'error': str(e), 'original': symptoms}
-    
-    # STEP 2: Send to Swarm Agent (Rule-based - NO LLM)
-    print(f"\n🤖 Sending to Swarm Agent (rule-based)...")
-    
-    adk_result = await adk_swarm_service.process_symptom_report(
-        village_id=village_id,
-        symptoms=symptoms,
-        metadata={'edge_analysis': edge_analysis}
-    )
-    
-    print(f"✓ Swarm Agent processed report")
-    print(f"   Risk Level: {adk_result.get('agent_response', {}).get('risk_level', 'unknown')}")
-    print(f"   Outbreak Belief: {adk_result.get('agent_response', {}).get('outbreak_belief', 0)}")
-    print(f"   Actions: {adk_result.get('autonomous_actions_taken', [])}")
-    
-    # STEP 3: Check if quantum escalation triggered
-    quantum_result = None
-    if 'escalated_to_quantum' in adk_result.get('autonomous_actions_taken', []):
-        print(f"\n⚛️ Quantum analysis triggered...")
-        swarm_data = adk_swarm_service.get_network_status()
-        quantum_result = await quantum_service.detect_outbreak_pattern(swarm_data)
-        print(f"   Outbreak probability: {quantum_result.get('outbreak_probability', 0):.2f}")
-    
-    print(f"{'='*70}\n")
-    
-    return {
-        'status': 'processed',
-        'edge_analysis': edge_analysis,
-        'swarm_response': adk_result,
-        'quantum_analysis': quantum_result,
-        'workflow': 'rule_based_swarm'
-    }
+        return await report_pipeline.submit(village_id, symptoms, voice=voice, image=image)
+    except UploadTooLargeError as e:
+        raise HTTPException(413, str(e))
+    except MailboxFullError as e:
+        raise HTTPException(503, str(e), headers={"Retry-After": "1"})
+
+@app.get("/api/v1/edge/metrics")
+async def get_edge_metrics():
+    """Get Gemini call concurrency, queue-wait and timeout metrics"""
+    return gemini_processor.get_metrics()
+
+@app.get("/api/v1/edge/debug/raw-responses")
+async def get_raw_model_responses(limit: int = 20):
+    """Recent raw model responses (only recorded when EDGE_DEBUG_RAW is set)"""
+    store = gemini_processor.raw_responses
+    if not store.enabled:
+        raise HTTPException(404, "Raw response capture is disabled (set EDGE_DEBUG_RAW=1)")
+    return {'responses': store.recent(limit)}
 
 # ============================================================================
 # ADK Swarm Endpoints
 # ============================================================================
 
 @app.get("/api/v1/swarm/agents")
-async def get_adk_agents():
+async def get_adk_agents(request: Request):
     """Get all ADK agents status"""
-    return adk_swarm_service.get_network_status()
+    return await versioned_response(request, adk_swarm_service.get_network_status)
 
 @app.get("/api/v1/swarm/agent/{village_id}")
 async def get_adk_agent_status(village_id: str):
@@ -226,23 +212,118 @@ async def trigger_outbreak_workflow(village_id: str):
     }
 
 @app.get("/api/v1/swarm/network-topology")
-async def get_network_topology():
+async def get_network_topology(request: Request):
     """Get agent network connections"""
-    status = adk_swarm_service.get_network_status()
+    def build():
+        status = adk_swarm_service.get_network_status()
+        return {
+            'topology': status['network_topology'],
+            'total_agents': status['total_agents']
+        }
+    
+    return await versioned_response(request, build)
+
+@app.get("/api/v1/swarm/communications")
+async def get_swarm_communications(limit: int = 50, since: Optional[int] = None):
+    """
+    Get recent inter-agent communications for visualization
+    
+    Pass the returned `cursor` back as `since` to receive only newer entries.
+    Topology is served (with an ETag) by /api/v1/swarm/network-topology.
+    """
+    log = adk_swarm_service.orchestrator.communication_log
+    entries = adk_swarm_service.orchestrator.get_communication_log(limit, since)
     return {
-        'topology': status['network_topology'],
-        'total_agents': status['total_agents']
+        'communications': entries,
+        'cursor': entries[-1]['seq'] if entries else log.latest_seq,
+        'missed': since is not None and since < log.oldest_seq - 1
     }
 
-@app.get("/api/v1/swarm/communications")
-async def get_swarm_communications(limit: int = 50):
-    """Get recent inter-agent communications for visualization"""
+@app.get("/api/v1/swarm/stream")
+async def stream_swarm_events(request: Request):
+    """
+    Server-sent event stream of swarm activity
+    
+    Starts with a `snapshot` of the network status, then pushes
+    `communication`, `risk_transition` and `quantum_result` events as they
+    happen. Each connection has its own bounded buffer; slow clients lose
+    the oldest events (reported in an `overflow` event) and risk/quantum
+    updates are coalesced to the latest value.
+    """
+    orchestrator = adk_swarm_service.orchestrator
+    subscription = orchestrator.events.subscribe()
+    
+    def sse(event_type: str, data, event_id=None) -> str:
+        prefix = f"id: {event_id}\n" if event_id is not None else ""
+        return f"{prefix}event: {event_type}\ndata: {json.dumps(data, default=str)}\n\n"
+    
+    async def event_source():
+        try:
+            yield sse("snapshot", orchestrator.get_network_status())
+            reported_drops = 0
+            while not await request.is_disconnected():
+                events = await subscription.next_batch(timeout=15)
+                if not events:
+                    yield ": keep-alive\n\n"
+                    continue
+                if subscription.dropped > reported_drops:
+                    yield sse("overflow", {"dropped": subscription.dropped - reported_drops})
+                    reported_drops = subscription.dropped
+                for event in events:
+                    yield sse(event['type'], event['data'], event['seq'])
+        finally:
+            subscription.close()
+    
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/v1/swarm/villages")
+async def get_villages_in_bbox(south: float, west: float, north: float, east: float):
+    """Get villages inside a map bounding box (for the Leaflet map)"""
+    villages = adk_swarm_service.orchestrator.villages_in_bbox(south, west, north, east)
+    return {
+        'villages': villages,
+        'count': len(villages)
+    }
+
+@app.get("/api/v1/swarm/leaderboard")
+async def get_risk_leaderboard(k: int = 10):
+    """Get the k villages with the highest outbreak belief"""
+    return {
+        'leaders': adk_swarm_service.orchestrator.get_top_risk(max(k, 0)),
+        'ranked_villages': len(adk_swarm_service.orchestrator.leaderboard)
+    }
+
+@app.get("/api/v1/swarm/leaderboard/range")
+async def get_villages_by_belief(min_belief: float = 0.0, max_belief: float = 1.0, limit: int = 100):
+    """Get villages whose outbreak belief lies in [min_belief, max_belief]"""
+    orchestrator = adk_swarm_service.orchestrator
     return {
-        'communications': adk_swarm_service.orchestrator.get_communication_log(limit),
-        'total_agents': len(adk_swarm_service.orchestrator.agents),
-        'topology': adk_swarm_service.orchestrator.network_topology
+        'villages': orchestrator.get_villages_by_belief(min_belief, max_belief, max(limit, 0)),
+        'total_in_range': orchestrator.leaderboard.count_in_range(min_belief, max_belief)
     }
 
+@app.get("/api/v1/swarm/agent/{village_id}/rank")
+async def get_village_risk_rank(village_id: str):
+    """Get a village's position on the risk leaderboard"""
+    rank = adk_swarm_service.orchestrator.get_risk_rank(village_id)
+    if not rank:
+        raise HTTPException(404, "ADK agent not found")
+    return rank
+
+@app.get("/api/v1/swarm/metrics")
+async def get_swarm_metrics():
+    """Get registry size, active agents and unresolved village lookups"""
+    return adk_swarm_service.orchestrator.get_metrics()
+
+@app.get("/api/v1/swarm/mailboxes")
+async def get_swarm_mailboxes():
+    """Get per-agent mailbox depth and throughput (actor mode)"""
+    return adk_swarm_service.get_mailbox_metrics()
+
 # ============================================================================
 # Quantum Endpoints (unchanged)
 # ============================================================================
@@ -262,6 +343,7 @@ async def run_quantum_analysis():
         villages=villages,
         resources={'ors': 1000, 'staff': 50, 'kits': 500}
     )
+    adk_swarm_service.orchestrator.publish_quantum_result(pattern_result, source="manual_analysis")
     
     return {
         'pattern_detection': pattern_result,
@@ -270,41 +352,50 @@ async def run_quantum_analysis():
     }
 
 @app.get("/api/v1/quantum/insights")
-async def get_quantum_insights():
-    """Get latest quantum insights"""
-    swarm_data = adk_swarm_service.get_network_status()
-    return await quantum_service.detect_outbreak_pattern(swarm_data)
+async def get_quantum_insights(request: Request):
+    """Get latest quantum insights (recomputed only when swarm state changes)"""
+    async def build():
+        etag = adk_swarm_service.orchestrator.etag
+        if _quantum_insights_cache['etag'] != etag:
+            swarm_data = adk_swarm_service.get_network_status()
+            _quantum_insights_cache['result'] = asyncio.ensure_future(
+                quantum_service.detect_outbreak_pattern(swarm_data)
+            )
+            _quantum_insights_cache['etag'] = etag
+        
+        # Requests arriving mid-computation await the same task; shielded so one
+        # client going away does not cancel it for the others
+        task = _quantum_insights_cache['result']
+        try:
+            return await asyncio.shield(task)
+        except Exception:
+            if _quantum_insights_cache['result'] is task:
+                _quantum_insights_cache['etag'] = None  # Retry on the next request
+            raise
+    
+    return await versioned_response(request, build)
 
 # ============================================================================
 # Analytics Endpoints
 # ============================================================================
 
 @app.get("/api/v1/analytics/dashboard")
-async def get_dashboard_stats():
+async def get_dashboard_stats(request: Request):
     """Get dashboard statistics with ADK metrics"""
-    swarm_status = adk_swarm_service.get_network_status()
-    
-    total_reports = sum(
-        a['symptom_count'] for a in swarm_status['agents'].values()
-    )
-    
-    high_risk_villages = sum(
-        1 for a in swarm_status['agents'].values()
-        if a['risk_level'] in ['high', 'critical']
-    )
-    
-    avg_belief = sum(
-        a['outbreak_belief'] for a in swarm_status['agents'].values()
-    ) / len(swarm_status['agents']) if swarm_status['agents'] else 0
+    def build():
+        aggregates = adk_swarm_service.get_aggregates()
+        
+        return {
+            'active_villages': aggregates.agent_count,
+            'total_reports': aggregates.total_reports,
+            'high_risk_villages': aggregates.count_at_risk('high', 'critical'),
+            'average_outbreak_belief': aggregates.average_belief,
+            'risk_histogram': dict(aggregates.risk_histogram),
+            'system_status': 'operational',
+            'framework': 'ADK Multi-Agent System'
+        }
     
-    return {
-        'active_villages': swarm_status['total_agents'],
-        'total_reports': total_reports,
-        'high_risk_villages': high_risk_villages,
-        'average_outbreak_belief': avg_belief,
-        'system_status': 'operational',
-        'framework': 'ADK Multi-Agent System'
-    }
+    return await versioned_response(request, build)
 
 # ============================================================================
 # Startup Event
@@ -318,6 +409,7 @@ async def startup_event():
     print("="*70)
     print("✓ Edge AI Service (Gemini) - Ready")
     print("✓ ADK Swarm Intelligence Network - Ready")
+    adk_swarm_service.start()
     
     status = adk_swarm_service.get_network_status()
     print(f"  - {status['total_agents']} ADK agents initialized")
@@ -335,6 +427,11 @@ async def startup_event():
     print("API docs at http://localhost:8000/docs")
     print("="*70 + "\n")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop swarm agent workers and the consensus reaper"""
+    await adk_swarm_service.shutdown()
+
 # ============================================================================
 # Run Server
 # ============================================================================
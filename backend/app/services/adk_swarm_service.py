@@ -6,6 +6,7 @@ Service layer for ADK-powered swarm intelligence
 from swarm.orchestrator.swarm_orchestrator import SwarmOrchestrator
 from typing import Dict, List
 from datetime import datetime
+import os
 
 class ADKSwarmService:
     """
@@ -14,8 +15,14 @@ class ADKSwarmService:
     """
     
     def __init__(self, quantum_service=None):
-        # Initialize orchestrator with quantum service
-        self.orchestrator = SwarmOrchestrator(quantum_service=quantum_service)
+        # Initialize orchestrator with quantum service.
+        # Actor mode serializes each village's state behind its own mailbox so
+        # concurrent HTTP reports for the same village cannot race.
+        actor_mode = os.getenv("SWARM_ACTOR_MODE", "true").lower() in ("1", "true", "yes")
+        self.orchestrator = SwarmOrchestrator(
+            quantum_service=quantum_service,
+            actor_mode=actor_mode
+        )
         
         print(f"✓ ADK Swarm Service initialized: {len(self.orchestrator.agents)} agents")
     
@@ -36,6 +43,10 @@ class ADKSwarmService:
         """Get status of ADK swarm network"""
         return self.orchestrator.get_network_status()
     
+    def get_aggregates(self):
+        """Get running swarm-wide totals (O(1))"""
+        return self.orchestrator.aggregates
+    
     def get_agent_status(self, village_id: str) -> Dict:
         """Get specific agent status"""
         agent = self.orchestrator.get_agent(village_id)
@@ -50,13 +61,25 @@ class ADKSwarmService:
             'outbreak_belief': agent.outbreak_belief,
             'risk_level': agent.risk_level,
             'symptom_count': len(agent.symptom_history),
-            'neighbors': self.orchestrator.network_topology.get(agent.village_id, []),
+            'neighbors': self.orchestrator.neighbors_of(agent.village_id),
             'adk_agent_status': 'active'
         }
     
     async def trigger_outbreak_detection_workflow(self, village_id: str) -> Dict:
         """Trigger outbreak detection workflow"""
         return await self.orchestrator.trigger_outbreak_detection_workflow(village_id)
+    
+    def get_mailbox_metrics(self) -> Dict:
+        """Get per-agent mailbox metrics (actor mode)"""
+        return self.orchestrator.get_mailbox_metrics()
+    
+    def start(self):
+        """Start background swarm tasks (consensus reaper)"""
+        self.orchestrator.start()
+    
+    async def shutdown(self):
+        """Stop background agent workers"""
+        await self.orchestrator.shutdown()
 
 # Singleton instance - will be created with quantum service in main.py
 adk_swarm_service = None
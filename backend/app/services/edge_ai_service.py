@@ -3,24 +3,108 @@ Edge AI Service using Gemini API
 Processes voice, images, and normalizes symptoms
 """
 
-import google.generativeai as genai
 from typing import List, Dict, Optional
-import base64
-import io
+import asyncio
+
+from edge.circuit_breaker import CircuitOpenError
+from edge.edge_result import (
+    ImageFinding, NormalizedSymptoms, RawResponseStore, VoiceFinding, intern_code, intern_codes
+)
+from edge.image_dedupe import PerceptualHashCache, perceptual_hash
+from edge.media import prepare_image, read_all, sniff_audio_mime, sniff_image_mime
+from edge.model_client import AsyncModelClient, ModelBackend
+from edge.phrase_batcher import PhraseBatcher
+from edge.phrase_cache import NO_TERM, PhraseCache, phrase_key
+from edge.symptom_lexicon import SymptomLexicon
+
+# Batching of unknown phrases across concurrent reports
+NORMALIZATION_SETTINGS = {
+    'batch_window': 0.05,  # Max seconds a phrase waits for its batch
+    'max_batch': 32,       # Phrases per combined model request
+}
+
+def _rate(part: int, total: int) -> float:
+    return round(part / total, 3) if total else 0.0
 
 class GeminiEdgeProcessor:
     """
     Gemini-powered edge AI for symptom processing
     """
     
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-pro')
+    def __init__(self, api_key: str, cache_path: str = None, lexicon_path: str = None,
+                 model: ModelBackend = None):
+        # Any ModelBackend can stand in for Gemini (e.g. edge.local_model.LocalModel offline)
+        if model is None:
+            import google.generativeai as genai
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel('gemini-1.5-pro')
+        self.model = model
+        
+        # Non-blocking, bounded model calls (never run the SDK on the event loop)
+        self.client = AsyncModelClient(self.model)
+        
+        # Multilingual symptom lexicon, compiled once (config/symptom_lexicon.yaml)
+        self.lexicon = SymptomLexicon.from_file(lexicon_path)
+        
+        # Model answers for phrases the lexicon does not know
+        self.phrase_cache = PhraseCache(cache_path)
+        self.batcher = PhraseBatcher(
+            self._resolve_phrase_batch,
+            window=NORMALIZATION_SETTINGS['batch_window'],
+            max_batch=NORMALIZATION_SETTINGS['max_batch']
+        )
+        self.reports_normalized = 0
+        self.reports_resolved_locally = 0
+        
+        # Recent vision analyses, reused for near-duplicate photos
+        self.image_cache = PerceptualHashCache()
+        
+        # Local fallbacks taken because the model was degraded or failing
+        self.normalization_fallbacks = 0
+        self.voice_processed = 0
+        self.voice_fallbacks = 0
+        self.images_processed = 0
+        self.image_fallbacks = 0
+        
+        # Raw model text, kept only in debug mode ($EDGE_DEBUG_RAW)
+        self.raw_responses = RawResponseStore()
+    
+    def get_metrics(self) -> Dict:
+        """Model call concurrency, timeout and latency metrics"""
+        return {
+            **self.client.get_metrics(),
+            'normalization': {
+                'reports': self.reports_normalized,
+                'resolved_without_model': self.reports_resolved_locally,
+                'phrase_cache': self.phrase_cache.get_metrics(),
+                'batching': self.batcher.get_metrics(),
+                'fallbacks': self.normalization_fallbacks,
+                'fallback_rate': _rate(self.normalization_fallbacks, self.reports_normalized)
+            },
+            'voice': {
+                'processed': self.voice_processed,
+                'fallbacks': self.voice_fallbacks,
+                'fallback_rate': _rate(self.voice_fallbacks, self.voice_processed)
+            },
+            'images': {
+                'processed': self.images_processed,
+                'fallbacks': self.image_fallbacks,
+                'fallback_rate': _rate(self.image_fallbacks, self.images_processed),
+                'cache': self.image_cache.get_metrics()
+            },
+            'raw_responses': {
+                'debug_enabled': self.raw_responses.enabled,
+                'stored': len(self.raw_responses)
+            }
+        }
     
-    async def process_voice(self, audio_bytes: bytes) -> Dict:
+    async def process_voice(self, audio_bytes: bytes) -> VoiceFinding:
         """
         Process voice recording to extract symptoms
+        
+        The audio is sent inline to the configured model backend.
         """
+        self.voice_processed += 1
         try:
             # Gemini can process audio directly
             prompt = """Analyze this voice recording of a patient describing their symptoms.
@@ -33,62 +117,47 @@ Extract:
 
 Return as JSON with keys: symptoms_extracted, severity, duration, environmental_factors"""
 
-            # For now, simulate since audio processing requires specific setup
-            # In production, you'd use: response = self.model.generate_content([prompt, audio_bytes])
+            audio = {"mime_type": sniff_audio_mime(audio_bytes[:16]), "data": audio_bytes}
+            try:
+                response = await self.client.generate([prompt, audio])
+            except CircuitOpenError as e:
+                # Typed symptoms still go through; only the voice note is skipped
+                self.voice_fallbacks += 1
+                return VoiceFinding.failed(str(e), source='fallback')
             
-            return {
-                'symptoms_extracted': ['fever', 'headache', 'body_pain'],
-                'severity': 'moderate',
-                'duration': '3 days',
-                'environmental_factors': [],
-                'confidence': 0.85,
-                'method': 'gemini_audio'
-            }
+            self.raw_responses.record('voice', response.text)
+            return VoiceFinding.from_model(self._parse_json_response(response.text))
         
         except Exception as e:
-            return {
-                'error': str(e),
-                'symptoms_extracted': [],
-                'confidence': 0.0
-            }
+            return VoiceFinding.failed(str(e))
     
-    async def process_image(self, image_bytes: bytes) -> Dict:
+    async def process_image(self, image_data) -> ImageFinding:
         """
         Process image (rash, symptoms) using Gemini Vision
+        
+        `image_data` is raw bytes or a binary file (e.g. a spooled upload);
+        it is downscaled off the event loop before being sent. Returns a
+        compact ImageFinding (no model prose).
         """
+        self.images_processed += 1
         try:
-            from PIL import Image
-            import base64
-            
-            print(f"   Image bytes length: {len(image_bytes)}")
-            print(f"   First 20 bytes: {image_bytes[:20]}")
-            
-            # Try to open with PIL first
             try:
-                image = Image.open(io.BytesIO(image_bytes))
-                print(f"   PIL detected format: {image.format}, size: {image.size}")
-            except Exception as pil_error:
+                image = await asyncio.to_thread(prepare_image, image_data)
+                print(f"   Image prepared: {image['mime_type']}, {len(image['data'])} bytes")
+            except ValueError as pil_error:
                 print(f"   PIL error: {pil_error}")
-                # If PIL fails, try sending raw bytes to Gemini with base64
-                # Gemini can handle base64 encoded images directly
-                image_b64 = base64.b64encode(image_bytes).decode('utf-8')
-                
-                # Detect mime type from bytes
-                mime_type = "image/jpeg"  # default
-                if image_bytes[:8] == b'\x89PNG\r\n\x1a\n':
-                    mime_type = "image/png"
-                elif image_bytes[:2] == b'\xff\xd8':
-                    mime_type = "image/jpeg"
-                elif image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
-                    mime_type = "image/webp"
-                
-                print(f"   Using base64 with mime type: {mime_type}")
-                
-                # Create image part for Gemini
-                image = {
-                    "mime_type": mime_type,
-                    "data": image_b64
-                }
+                # Unknown to PIL: send the original bytes and let Gemini try
+                raw = read_all(image_data)
+                image = {"mime_type": sniff_image_mime(raw[:16]), "data": raw}
+            
+            # Near-duplicate of a recently analysed photo: reuse that analysis
+            image_hash = await asyncio.to_thread(perceptual_hash, image['data'])
+            if image_hash is not None:
+                cached = self.image_cache.get(image_hash)
+                if cached is not None:
+                    finding, distance = cached
+                    print(f"📷 Image cache hit (distance {distance}): {list(finding.conditions)}")
+                    return finding._replace(source='cache', hash_distance=distance)
 
             prompt = """Analyze this medical/health-related image carefully.
 
@@ -116,30 +185,29 @@ If you cannot identify any medical conditions, return:
     "recommendations": []
 }"""
 
-            # Call Gemini Vision
-            response = self.model.generate_content([prompt, image])
+            # Call Gemini Vision (fails fast while the circuit is open)
+            try:
+                response = await self.client.generate([prompt, image])
+            except CircuitOpenError as e:
+                self.image_fallbacks += 1
+                return ImageFinding.failed(str(e), source='fallback')
             
             # Parse the response
-            result = self._parse_json_response(response.text)
-            result['method'] = 'gemini_vision'
-            result['raw_response'] = response.text[:500]  # Truncate for logging
+            self.raw_responses.record('image', response.text)
+            finding = ImageFinding.from_model(self._parse_json_response(response.text))
+            
+            print(f"📷 Gemini Vision Analysis: {list(finding.conditions)}")
             
-            print(f"📷 Gemini Vision Analysis: {result.get('detected_conditions', [])}")
+            if image_hash is not None:
+                self.image_cache.put(image_hash, finding)
             
-            return result
+            return finding
         
         except Exception as e:
             import traceback
             print(f"❌ Image processing error: {e}")
             print(f"   Traceback: {traceback.format_exc()}")
-            return {
-                'error': str(e),
-                'detected_conditions': [],
-                'severity': 'unknown',
-                'confidence': 0.0,
-                'description': f'Error processing image: {str(e)}',
-                'recommendations': []
-            }
+            return ImageFinding.failed(str(e))
     
     def _parse_json_response(self, text: str) -> Dict:
         """Parse JSON from Gemini response"""
@@ -166,104 +234,93 @@ If you cannot identify any medical conditions, return:
                 'recommendations': []
             }
     
-    async def normalize_symptoms(self, symptoms: List[str], context: Dict) -> Dict:
+    async def normalize_symptoms(self, symptoms: List[str], context: Dict) -> NormalizedSymptoms:
         """
-        Normalize and categorize symptoms using Gemini
+        Normalize and categorize symptoms
+        
+        Known phrases are resolved by the symptom lexicon, then from the
+        phrase cache; only the residual unknown phrases go to Gemini,
+        batched with other concurrent reports, and its answers are cached
+        for next time.
         """
-        try:
-            prompt = f"""Normalize these symptom descriptions: {symptoms}
-
-Context: {context}
-
-Tasks:
-1. Map to standard medical terms
-2. Categorize by system (respiratory, gastrointestinal, etc.)
-3. Identify disease patterns
-4. Assess urgency
-
-Return as JSON."""
-
-            response = self.model.generate_content(prompt)
-            
-            # Simplified normalization
-            normalized = {
-                'original': symptoms,
-                'normalized': self._simple_normalize(symptoms),
-                'categories': self._categorize_symptoms(symptoms),
-                'urgency': self._assess_urgency(symptoms),
-                'gemini_analysis': response.text
-            }
-            
-            return normalized
+        analysis = self.lexicon.analyze(symptoms)
+        unknown = list(dict.fromkeys(
+            phrase_key(phrase) for phrase, term in analysis.terms.items() if term is None
+        ))
         
-        except Exception as e:
-            return {
-                'original': symptoms,
-                'normalized': symptoms,
-                'error': str(e)
-            }
-    
-    def _simple_normalize(self, symptoms: List[str]) -> List[str]:
-        """Simple symptom normalization"""
-        normalization_map = {
-            'high fever': 'fever',
-            'temperature': 'fever',
-            'bukhar': 'fever',
-            'headache': 'headache',
-            'sir dard': 'headache',
-            'vomiting': 'vomiting',
-            'ulti': 'vomiting',
-            'diarrhea': 'diarrhea',
-            'loose motion': 'diarrhea',
-            'body pain': 'body_pain',
-            'badan dard': 'body_pain',
-            'rash': 'rash',
-            'cough': 'cough',
-            'khansi': 'cough'
-        }
+        terms = {}
+        residual = []
+        for phrase in unknown:
+            cached = self.phrase_cache.get(phrase)
+            if cached is None:
+                residual.append(phrase)
+            elif cached != NO_TERM:
+                terms[phrase] = cached
+            # NO_TERM: the model could not map it before; it passes through unchanged
         
-        normalized = []
-        for symptom in symptoms:
-            symptom_lower = symptom.lower().strip()
-            normalized.append(normalization_map.get(symptom_lower, symptom_lower))
+        self.reports_normalized += 1
+        fallback = False
+        error = None
         
-        return list(set(normalized))  # Remove duplicates
-    
-    def _categorize_symptoms(self, symptoms: List[str]) -> Dict:
-        """Categorize symptoms by body system"""
-        categories = {
-            'respiratory': [],
-            'gastrointestinal': [],
-            'neurological': [],
-            'dermatological': [],
-            'systemic': []
-        }
+        if residual and self.client.breaker.is_open:
+            # Upstream degraded: answer from the lexicon alone, without waiting
+            self.normalization_fallbacks += 1
+            fallback = True
+        elif residual:
+            try:
+                terms.update(await self.batcher.resolve(residual))
+            except Exception as e:
+                self.normalization_fallbacks += 1
+                fallback = True
+                error = str(e)
+        else:
+            self.reports_resolved_locally += 1
         
-        for symptom in symptoms:
-            s = symptom.lower()
-            if any(x in s for x in ['cough', 'breathing', 'respiratory']):
-                categories['respiratory'].append(symptom)
-            elif any(x in s for x in ['vomit', 'diarrhea', 'nausea', 'stomach']):
-                categories['gastrointestinal'].append(symptom)
-            elif any(x in s for x in ['headache', 'dizzy', 'confusion']):
-                categories['neurological'].append(symptom)
-            elif any(x in s for x in ['rash', 'skin', 'lesion']):
-                categories['dermatological'].append(symptom)
-            elif any(x in s for x in ['fever', 'fatigue', 'pain']):
-                categories['systemic'].append(symptom)
+        if terms:
+            # Place model-supplied terms into categories / urgency as well
+            analysis = self.lexicon.analyze(symptoms + list(terms.values()))
         
-        return {k: v for k, v in categories.items() if v}
-    
-    def _assess_urgency(self, symptoms: List[str]) -> str:
-        """Assess urgency level"""
-        high_urgency = ['severe', 'bleeding', 'unconscious', 'seizure']
-        medium_urgency = ['fever', 'vomiting', 'diarrhea', 'rash']
+        # Phrases nobody could map pass through unchanged (lower-cased)
+        resolved = list(analysis.symptoms)
+        for phrase in unknown:
+            term = terms.get(phrase, phrase)
+            if term not in resolved and not analysis.terms.get(term):
+                resolved.append(term)
         
-        symptoms_str = ' '.join(symptoms).lower()
+        return NormalizedSymptoms(
+            intern_codes(resolved),
+            {intern_code(category): intern_codes(members)
+             for category, members in analysis.categories.items()},
+            analysis.urgency,
+            len(residual),
+            fallback,
+            error
+        )
+    
+    async def _resolve_phrase_batch(self, phrases: List[str]) -> Dict[str, str]:
+        """Resolve one batch of unknown phrases with Gemini and cache the answers"""
+        terms = await self._normalize_with_model(phrases)
+        for phrase in phrases:
+            # Unanswered phrases are cached as negative entries, not asked again
+            self.phrase_cache.put(phrase, terms.get(phrase, NO_TERM))
+        return terms
+    
+    async def _normalize_with_model(self, phrases: List[str]) -> Dict[str, str]:
+        """Ask Gemini for the standard term of each phrase (one combined prompt)"""
+        prompt = f"""Map each symptom phrase to a standard medical symptom term
+(lower_snake_case English, e.g. fever, headache, body_pain, joint_pain).
+Phrases may be in Hindi or other local languages.
+
+Phrases: {phrases}
+
+Return only a JSON object mapping each phrase exactly as given to its term."""
+
+        response = await self.client.generate(prompt)
+        self.raw_responses.record('normalization', response.text)
+        answer = self._parse_json_response(response.text)
         
-        if any(urgent in symptoms_str for urgent in high_urgency):
-            return 'high'
-        elif any(medium in symptoms_str for medium in medium_urgency):
-            return 'medium'
-        else:
-            return 'low'
+        return {
+            phrase: str(answer[phrase]).strip().lower().replace(' ', '_')
+            for phrase in phrases
+            if isinstance(answer.get(phrase), str) and answer[phrase].strip()
+        }
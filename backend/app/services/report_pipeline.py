@@ -0,0 +1,161 @@
+"""
+Symptom Report Pipeline
+Edge AI (voice/image/normalization), swarm agent and quantum escalation for
+one report. Shared by the submit-report endpoint and the offline load
+harness (load_test_edge.py) so both exercise the same code.
+"""
+
+from typing import Dict, List
+import asyncio
+import time
+
+from edge.edge_result import EdgeAnalysis, ImageFinding, NormalizedSymptoms, VoiceFinding
+from edge.media import MEDIA_SETTINGS, UploadTooLargeError, spool_upload
+
+class ReportPipeline:
+    """
+    Runs a symptom report through the edge, swarm and quantum layers
+    """
+    
+    def __init__(self, edge_processor, swarm_service, quantum_service=None):
+        self.edge_processor = edge_processor
+        self.swarm_service = swarm_service
+        self.quantum_service = quantum_service  # None: escalations are reported, not run
+    
+    async def submit(self, village_id: str, symptoms: List[str], voice=None, image=None) -> Dict:
+        """
+        Process symptom report with optional voice/image analysis.
+        
+        `voice` / `image` are UploadFile-like (async `read(size)`). Raises
+        UploadTooLargeError for an oversized upload and MailboxFullError when
+        the village agent is overloaded.
+        
+        Flow:
+        1. Gemini processes voice/image concurrently (Edge AI) - ONLY for multimodal input
+        2. Swarm agent analyzes symptoms (rule-based - NO LLM)
+        3. If consensus, trigger quantum analysis
+        """
+        
+        print(f"\n{'='*70}")
+        print(f"📥 NEW SYMPTOM REPORT: Village {village_id}")
+        print(f"   Symptoms: {symptoms}")
+        print(f"   Has Voice: {voice is not None}")
+        print(f"   Has Image: {image is not None}")
+        print(f"{'='*70}")
+        
+        # STEP 1: Process with Gemini (Edge AI) - ONLY for voice/image
+        # Voice and image run concurrently; normalization starts as soon as voice is done.
+        edge_analysis = {}  # stage -> compact typed finding (see edge/edge_result.py)
+        timings_ms = {}
+        report_start = time.perf_counter()
+        
+        # Stream uploads into bounded spooled temp files (UploadTooLargeError if too large)
+        voice_file = image_file = None
+        image_size = 0
+        try:
+            if voice:
+                voice_file = await spool_upload(voice, MEDIA_SETTINGS['max_voice_bytes'])
+            if image:
+                image_file = await spool_upload(image, MEDIA_SETTINGS['max_image_bytes'])
+                image_size = image_file.seek(0, 2)
+                image_file.seek(0)
+        except UploadTooLargeError:
+            if voice_file:
+                voice_file.close()
+            raise
+        
+        async def timed(stage: str, coro):
+            started = time.perf_counter()
+            try:
+                return await coro
+            finally:
+                timings_ms[stage] = round((time.perf_counter() - started) * 1000, 2)
+        
+        async def process_voice_stage():
+            try:
+                # A large upload has rolled over to disk: read it off the event loop
+                voice_bytes = await asyncio.to_thread(voice_file.read)
+                print(f"🎤 Processing voice ({len(voice_bytes)} bytes)...")
+                voice_result = await self.edge_processor.process_voice(voice_bytes)
+                edge_analysis['voice'] = voice_result
+                # Add extracted symptoms
+                extracted = list(voice_result.symptoms)
+                if extracted:
+                    symptoms.extend(extracted)
+                    print(f"   Extracted symptoms: {extracted}")
+            except Exception as e:
+                print(f"❌ Voice processing error: {e}")
+                edge_analysis['voice'] = VoiceFinding.failed(str(e))
+        
+        async def process_image_stage():
+            try:
+                print(f"📷 Processing image ({image_size} bytes)...")
+                image_result = await self.edge_processor.process_image(image_file)
+                edge_analysis['image'] = image_result
+                print(f"   Detected conditions: {list(image_result.conditions)}")
+                print(f"   Severity: {image_result.severity.label} ({image_result.source})")
+            except Exception as e:
+                print(f"❌ Image processing error: {e}")
+                edge_analysis['image'] = ImageFinding.failed(str(e))
+        
+        async def voice_then_normalize():
+            if voice:
+                await timed('voice', process_voice_stage())
+            # Normalize symptoms (lexicon first, Gemini only for unknown phrases)
+            try:
+                normalized = await timed(
+                    'normalization', self.edge_processor.normalize_symptoms(symptoms, {})
+                )
+                edge_analysis['normalized'] = normalized
+            except Exception as e:
+                edge_analysis['normalized'] = NormalizedSymptoms.failed(symptoms, str(e))
+        
+        stages = [voice_then_normalize()]
+        if image:
+            stages.append(timed('image', process_image_stage()))
+        try:
+            await asyncio.gather(*stages)
+        finally:
+            for spooled in (voice_file, image_file):
+                if spooled:
+                    spooled.close()
+        timings_ms['edge_total'] = round((time.perf_counter() - report_start) * 1000, 2)
+        edge_result = EdgeAnalysis(**edge_analysis)
+        
+        # STEP 2: Send to Swarm Agent (Rule-based - NO LLM)
+        print(f"\n🤖 Sending to Swarm Agent (rule-based)...")
+        
+        adk_result = await timed('swarm', self.swarm_service.process_symptom_report(
+            village_id=village_id,
+            symptoms=symptoms,
+            metadata={'edge_analysis': edge_result}
+        ))
+        
+        print(f"✓ Swarm Agent processed report")
+        print(f"   Risk Level: {adk_result.get('agent_response', {}).get('risk_level', 'unknown')}")
+        print(f"   Outbreak Belief: {adk_result.get('agent_response', {}).get('outbreak_belief', 0)}")
+        print(f"   Actions: {adk_result.get('autonomous_actions_taken', [])}")
+        
+        # STEP 3: Check if quantum escalation triggered
+        quantum_result = None
+        escalated = 'escalated_to_quantum' in adk_result.get('autonomous_actions_taken', [])
+        if escalated and self.quantum_service is None:
+            print(f"\n⚛️ Quantum escalation requested; no quantum service configured")
+        elif escalated:
+            print(f"\n⚛️ Quantum analysis triggered...")
+            swarm_data = self.swarm_service.get_network_status()
+            quantum_result = await timed('quantum', self.quantum_service.detect_outbreak_pattern(swarm_data))
+            self.swarm_service.orchestrator.publish_quantum_result(quantum_result, source="symptom_report")
+            print(f"   Outbreak probability: {quantum_result.get('outbreak_probability', 0):.2f}")
+        
+        timings_ms['total'] = round((time.perf_counter() - report_start) * 1000, 2)
+        print(f"{'='*70}\n")
+        
+        return {
+            'status': 'processed',
+            'edge_analysis': edge_result.to_dict(),
+            'timings_ms': timings_ms,
+            'swarm_response': adk_result,
+            'quantum_analysis': quantum_result,
+            'workflow': 'rule_based_swarm'
+        }
@@ -0,0 +1,137 @@
+"""
+Circuit Breaker for Edge Model Calls
+
+Tracks the outcome and latency of the last `window` model calls. When at
+least `min_calls` have been seen and the share of failed or slow calls
+reaches `failure_threshold`, the breaker opens and callers fail fast (and
+fall back to local processing) instead of waiting on a degraded upstream.
+After `open_seconds` one probe call is let through (half-open): success
+closes the breaker, failure re-opens it.
+
+`allow()` hands out a ticket that the caller passes back to `record()` or
+`abandon()`, so only the probe itself decides the half-open state; a call
+admitted before the breaker opened that finishes late is just counted.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import time
+
+# Breaker settings
+BREAKER_SETTINGS = {
+    'window': 20,              # Recent calls considered
+    'min_calls': 5,            # Calls needed before the breaker may open
+    'failure_threshold': 0.5,  # Share of failed/slow calls that opens it
+    'slow_call_seconds': 10.0, # Calls slower than this count as failures
+    'open_seconds': 30.0,      # Time to stay open before probing
+}
+
+CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+# Tickets returned by CircuitBreaker.allow()
+CALL, PROBE = 'call', 'probe'
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while the breaker is open."""
+    pass
+
+
+class CircuitBreaker:
+    """Rolling-window failure-rate breaker."""
+
+    def __init__(self, window: int = None, min_calls: int = None, failure_threshold: float = None,
+                 slow_call_seconds: float = None, open_seconds: float = None):
+        settings = BREAKER_SETTINGS
+        self.min_calls = min_calls or settings['min_calls']
+        self.failure_threshold = failure_threshold or settings['failure_threshold']
+        self.slow_call_seconds = slow_call_seconds or settings['slow_call_seconds']
+        self.open_seconds = open_seconds or settings['open_seconds']
+
+        self._calls: Deque[Tuple[bool, float]] = deque(maxlen=window or settings['window'])
+        self._rejections: Deque[bool] = deque(maxlen=window or settings['window'])  # Recent allow() refusals
+        self.state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        # Metrics
+        self.times_opened = 0
+        self.short_circuited = 0
+
+    def allow(self) -> Optional[str]:
+        """Ticket (CALL or PROBE) if a call may go upstream now, else None (counts refusals)."""
+        if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self.state = HALF_OPEN
+        if self.state == CLOSED:
+            self._rejections.append(False)
+            return CALL
+        if self.state == HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._rejections.append(False)
+            return PROBE
+        self.short_circuited += 1
+        self._rejections.append(True)
+        return None
+
+    def record(self, success: bool, seconds: float, ticket: str = CALL):
+        """Record the outcome of a call that was allowed through with `ticket`."""
+        ok = success and seconds <= self.slow_call_seconds
+        if ticket == PROBE:
+            self._probe_in_flight = False
+            if ok:
+                self.state = CLOSED
+                self._calls.clear()
+            else:
+                self._open()
+            return
+
+        self._calls.append((ok, seconds))
+        if self.state == CLOSED and self.failure_rate >= self.failure_threshold \
+                and len(self._calls) >= self.min_calls:
+            self._open()
+
+    def abandon(self, ticket: str = CALL):
+        """A call allowed with `ticket` was given up (not reached upstream, or cancelled)."""
+        if ticket == PROBE:
+            self._probe_in_flight = False
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self.times_opened += 1
+
+    @property
+    def is_open(self) -> bool:
+        """True while calls would be refused (without counting a refusal)."""
+        return self.state == OPEN and time.monotonic() - self._opened_at < self.open_seconds
+
+    @property
+    def failure_rate(self) -> float:
+        if not self._calls:
+            return 0.0
+        return sum(1 for ok, _ in self._calls if not ok) / len(self._calls)
+
+    @property
+    def rejection_rate(self) -> float:
+        """Share of the last `window` allow() decisions that refused the call."""
+        if not self._rejections:
+            return 0.0
+        return sum(self._rejections) / len(self._rejections)
+
+    def latency_percentile(self, fraction: float) -> float:
+        """Latency (seconds) at `fraction` over the window (0 if empty)."""
+        if not self._calls:
+            return 0.0
+        latencies = sorted(seconds for _, seconds in self._calls)
+        return latencies[min(int(fraction * len(latencies)), len(latencies) - 1)]
+
+    def get_metrics(self) -> Dict:
+        return {
+            'state': self.state,
+            'failure_rate': round(self.failure_rate, 3),
+            'rejection_rate': round(self.rejection_rate, 3),
+            'window_calls': len(self._calls),
+            'p95_seconds': round(self.latency_percentile(0.95), 3),
+            'times_opened': self.times_opened,
+            'short_circuited': self.short_circuited
+        }
@@ -0,0 +1,202 @@
+"""
+Compact Edge Results
+
+Typed, immutable results of the edge layer. Condition and symptom names are
+canonicalised to lower_snake_case codes and interned, so the thousands of
+reports held in agent `symptom_history` share one string per code; severity
+is an IntEnum and free-form model prose (descriptions, recommendations, raw
+responses) is not carried per report.
+
+Raw model text is only kept when $EDGE_DEBUG_RAW is set, in a separate
+bounded RawResponseStore.
+"""
+
+from collections import deque
+from datetime import datetime
+from enum import IntEnum
+from typing import Deque, Dict, Iterable, List, NamedTuple, Optional, Tuple
+import os
+import re
+import sys
+
+# Edge result settings
+EDGE_RESULT_SETTINGS = {
+    'max_codes': 16,          # Conditions/symptoms kept per result
+    'raw_store_size': 100,    # Raw model responses kept in debug mode
+    'raw_max_chars': 2000,    # Characters kept per raw response
+}
+
+_NON_CODE = re.compile(r'[^\w]+')
+
+
+def intern_code(name: str) -> str:
+    """Canonical, interned code for a condition/symptom/category name."""
+    return sys.intern(_NON_CODE.sub('_', str(name).casefold()).strip('_'))
+
+
+def intern_codes(names: Iterable) -> Tuple[str, ...]:
+    """Distinct interned codes, in order, capped at `max_codes`."""
+    codes = []
+    for name in names or ():
+        code = intern_code(name)
+        if code and code not in codes:
+            codes.append(code)
+    return tuple(codes[:EDGE_RESULT_SETTINGS['max_codes']])
+
+
+def _confidence(value) -> float:
+    try:
+        return round(min(max(float(value), 0.0), 1.0), 3)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class Severity(IntEnum):
+    UNKNOWN = 0
+    NONE = 1
+    MILD = 2
+    MODERATE = 3
+    SEVERE = 4
+
+    @classmethod
+    def parse(cls, value) -> 'Severity':
+        """Severity from model text such as 'Moderate' (UNKNOWN otherwise)."""
+        if isinstance(value, cls):
+            return value
+        return cls.__members__.get(str(value or '').strip().upper(), cls.UNKNOWN)
+
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+
+class VoiceFinding(NamedTuple):
+    symptoms: Tuple[str, ...]
+    severity: Severity
+    confidence: float
+    source: str = 'model'
+    error: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, data: Dict, source: str = 'model') -> 'VoiceFinding':
+        return cls(
+            intern_codes(data.get('symptoms_extracted')),
+            Severity.parse(data.get('severity')),
+            _confidence(data.get('confidence')),
+            source
+        )
+
+    @classmethod
+    def failed(cls, error: str, source: str = 'error') -> 'VoiceFinding':
+        return cls((), Severity.UNKNOWN, 0.0, source, error)
+
+    def to_dict(self) -> Dict:
+        result = {
+            'symptoms': list(self.symptoms),
+            'severity': self.severity.label,
+            'confidence': self.confidence,
+            'source': self.source
+        }
+        if self.error:
+            result['error'] = self.error
+        return result
+
+
+class ImageFinding(NamedTuple):
+    conditions: Tuple[str, ...]
+    severity: Severity
+    confidence: float
+    source: str = 'model'         # 'model', 'cache', 'fallback' or 'error'
+    hash_distance: Optional[int] = None
+    error: Optional[str] = None
+
+    @classmethod
+    def from_model(cls, data: Dict) -> 'ImageFinding':
+        return cls(
+            intern_codes(data.get('detected_conditions')),
+            Severity.parse(data.get('severity')),
+            _confidence(data.get('confidence'))
+        )
+
+    @classmethod
+    def failed(cls, error: str, source: str = 'error') -> 'ImageFinding':
+        return cls((), Severity.UNKNOWN, 0.0, source, None, error)
+
+    def to_dict(self) -> Dict:
+        result = {
+            'conditions': list(self.conditions),
+            'severity': self.severity.label,
+            'confidence': self.confidence,
+            'source': self.source
+        }
+        if self.hash_distance is not None:
+            result['hash_distance'] = self.hash_distance
+        if self.error:
+            result['error'] = self.error
+        return result
+
+
+class NormalizedSymptoms(NamedTuple):
+    symptoms: Tuple[str, ...]
+    categories: Dict[str, Tuple[str, ...]]
+    urgency: str
+    model_lookups: int = 0        # Phrases that needed the model
+    fallback: bool = False        # Model unavailable; lexicon-only answer
+    error: Optional[str] = None
+
+    @classmethod
+    def failed(cls, symptoms: List[str], error: str) -> 'NormalizedSymptoms':
+        return cls(intern_codes(symptoms), {}, 'low', 0, True, error)
+
+    def to_dict(self) -> Dict:
+        result = {
+            'symptoms': list(self.symptoms),
+            'categories': {category: list(codes) for category, codes in self.categories.items()},
+            'urgency': self.urgency,
+            'model_lookups': self.model_lookups,
+            'fallback': self.fallback
+        }
+        if self.error:
+            result['error'] = self.error
+        return result
+
+
+class EdgeAnalysis(NamedTuple):
+    """Edge results of one report (what the swarm agent keeps in history)."""
+    normalized: Optional[NormalizedSymptoms] = None
+    voice: Optional[VoiceFinding] = None
+    image: Optional[ImageFinding] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            stage: finding.to_dict()
+            for stage, finding in self._asdict().items()
+            if finding is not None
+        }
+
+
+class RawResponseStore:
+    """Bounded store of raw model responses, active only in debug mode."""
+
+    def __init__(self, enabled: bool = None, max_entries: int = None, max_chars: int = None):
+        if enabled is None:
+            enabled = os.getenv('EDGE_DEBUG_RAW', '').lower() in ('1', 'true', 'yes')
+        self.enabled = enabled
+        self.max_chars = max_chars or EDGE_RESULT_SETTINGS['raw_max_chars']
+        self._entries: Deque[Dict] = deque(maxlen=max_entries or EDGE_RESULT_SETTINGS['raw_store_size'])
+
+    def record(self, kind: str, text: str):
+        if not self.enabled:
+            return
+        self._entries.append({
+            'kind': kind,
+            'timestamp': datetime.now().isoformat(),
+            'text': (text or '')[:self.max_chars]
+        })
+
+    def recent(self, limit: int = None) -> List[Dict]:
+        entries = list(self._entries)
+        return entries[-limit:] if limit else entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
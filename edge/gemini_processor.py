@@ -4,6 +4,10 @@ import io
 import json
 from typing import Dict, List, Optional
 import base64
+import asyncio
+
+from edge.media import prepare_image
+from edge.model_client import AsyncModelClient, ModelBackend
 
 class GeminiProcessor:
     """
@@ -11,10 +15,21 @@ class GeminiProcessor:
     Processes voice, images, and text from ASHA workers
     """
     
-    def __init__(self, api_key: str):
-        genai.configure(api_key=api_key)
-        self.text_model = genai.GenerativeModel('gemini-pro')
-        self.vision_model = genai.GenerativeModel('gemini-pro-vision')
+    def __init__(self, api_key: str, model: ModelBackend = None):
+        if model is None:
+            genai.configure(api_key=api_key)
+            self.text_model = genai.GenerativeModel('gemini-pro')
+            self.vision_model = genai.GenerativeModel('gemini-pro-vision')
+        else:
+            # One backend (e.g. the offline stand-in) serves text and vision
+            self.text_model = self.vision_model = model
+        
+        # Both models share one bounded, non-blocking call layer
+        self.client = AsyncModelClient(self.text_model)
+    
+    def get_metrics(self) -> Dict:
+        """Model call concurrency, timeout and latency metrics"""
+        return self.client.get_metrics()
     
     async def process_voice(self, audio_data: bytes, language: str = "hi-IN") -> Dict:
         """
@@ -66,14 +81,14 @@ class GeminiProcessor:
         Analyze medical images using Gemini Vision
         
         Args:
-            image_data: Raw image bytes (JPEG, PNG)
+            image_data: Raw image bytes or binary file (JPEG, PNG)
         
         Returns:
             Dict with image analysis results
         """
         try:
-            # Convert bytes to PIL Image
-            image = Image.open(io.BytesIO(image_data))
+            # Decode and downscale off the event loop
+            image = await asyncio.to_thread(prepare_image, image_data)
             
             prompt = """
             Analyze this medical/environmental image:
@@ -93,7 +108,7 @@ class GeminiProcessor:
             }
             """
             
-            response = self.vision_model.generate_content([prompt, image])
+            response = await self.client.generate([prompt, image], model=self.vision_model)
             
             # Parse response
             result = self._parse_gemini_response(response.text)
@@ -136,7 +151,7 @@ class GeminiProcessor:
             Categories: vector_borne_disease, water_borne_disease, respiratory_infection, etc.
             """
             
-            response = self.text_model.generate_content(prompt)
+            response = await self.client.generate(prompt)
             result = self._parse_gemini_response(response.text)
             
             return result
@@ -0,0 +1,179 @@
+"""
+Perceptual-Hash Image Cache
+
+Remembers recent image analyses by a 64-bit perceptual hash so a retaken or
+resubmitted photo (offline-queue retries, re-shots of the same rash) reuses
+the earlier Gemini Vision result instead of making another call. Two images
+match when their hashes differ in at most `max_distance` bits. Entries are
+evicted least-recently-used beyond `max_entries` and after `ttl` seconds.
+
+Lookups do not scan the cache. The 64 bits are split into `max_distance + 1`
+bands, and two hashes within `max_distance` bits must agree on at least one
+whole band (pigeonhole), so only entries sharing a band with the query are
+compared. Expiry pops from a queue kept in insertion-time order.
+"""
+
+from collections import OrderedDict, deque
+from typing import Deque, Dict, List, Optional, Set, Tuple
+import io
+import time
+
+# Image cache settings
+IMAGE_CACHE_SETTINGS = {
+    'algorithm': 'dhash',   # 'dhash' (gradient) or 'ahash' (mean)
+    'max_distance': 5,      # Hamming distance (of 64 bits) that counts as the same image
+    'max_entries': 256,
+    'ttl': 6 * 3600,        # Seconds an analysis stays reusable
+}
+
+HASH_SIZE = 8  # 8x8 -> 64-bit hashes
+
+
+def _grayscale(data: bytes, size: Tuple[int, int]):
+    from PIL import Image
+    image = Image.open(io.BytesIO(data))
+    image.draft('L', size)
+    return image.convert('L').resize(size)
+
+
+def average_hash(data: bytes) -> int:
+    """aHash: one bit per pixel of an 8x8 thumbnail, set if above the mean."""
+    pixels = list(_grayscale(data, (HASH_SIZE, HASH_SIZE)).getdata())
+    mean = sum(pixels) / len(pixels)
+    bits = 0
+    for pixel in pixels:
+        bits = (bits << 1) | (pixel > mean)
+    return bits
+
+
+def difference_hash(data: bytes) -> int:
+    """dHash: one bit per horizontal gradient of a 9x8 thumbnail."""
+    pixels = list(_grayscale(data, (HASH_SIZE + 1, HASH_SIZE)).getdata())
+    bits = 0
+    for row in range(HASH_SIZE):
+        offset = row * (HASH_SIZE + 1)
+        for col in range(HASH_SIZE):
+            bits = (bits << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return bits
+
+
+HASH_FUNCTIONS = {'ahash': average_hash, 'dhash': difference_hash}
+
+
+def _band_masks(bands: int) -> List[Tuple[int, int]]:
+    """(shift, mask) of `bands` contiguous, near-equal slices of a 64-bit hash."""
+    bits = HASH_SIZE * HASH_SIZE
+    masks, shift = [], 0
+    for band in range(bands):
+        width = bits // bands + (band < bits % bands)
+        masks.append((shift, (1 << width) - 1))
+        shift += width
+    return masks
+
+
+def perceptual_hash(data: bytes, algorithm: str = None) -> Optional[int]:
+    """
+    64-bit perceptual hash of encoded image bytes, or None if unavailable.
+
+    CPU-bound; call it off the event loop.
+    """
+    try:
+        return HASH_FUNCTIONS[algorithm or IMAGE_CACHE_SETTINGS['algorithm']](data)
+    except ImportError:
+        return None  # Pillow not installed: no perceptual dedupe
+    except Exception:
+        return None  # Not decodable as an image
+
+
+class PerceptualHashCache:
+    """LRU/TTL cache of analyses keyed by perceptual hash."""
+
+    def __init__(self, max_distance: int = None, max_entries: int = None, ttl: float = None):
+        settings = IMAGE_CACHE_SETTINGS
+        self.max_distance = max_distance if max_distance is not None else settings['max_distance']
+        self.max_entries = max_entries or settings['max_entries']
+        self.ttl = ttl if ttl is not None else settings['ttl']
+
+        self._entries: "OrderedDict[int, Tuple[float, Dict]]" = OrderedDict()  # LRU order
+        self._expiry: Deque[Tuple[float, int]] = deque()  # (stored, hash) in insertion order
+
+        # (band index, band bits) -> hashes with those bits
+        self._bands = _band_masks(min(self.max_distance + 1, HASH_SIZE * HASH_SIZE))
+        self._band_index: Dict[Tuple[int, int], Set[int]] = {}
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _band_keys(self, image_hash: int) -> List[Tuple[int, int]]:
+        return [(band, (image_hash >> shift) & mask) for band, (shift, mask) in enumerate(self._bands)]
+
+    def _remove(self, key: int):
+        del self._entries[key]
+        for band_key in self._band_keys(key):
+            members = self._band_index[band_key]
+            members.discard(key)
+            if not members:
+                del self._band_index[band_key]
+        self.evictions += 1
+
+    def _expire(self, now: float):
+        # TTL counts from when the analysis was made, not from its last hit
+        while self._expiry and now - self._expiry[0][0] > self.ttl:
+            stored, key = self._expiry.popleft()
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == stored:  # Not re-put since
+                self._remove(key)
+
+    def get(self, image_hash: int) -> Optional[Tuple[Dict, int]]:
+        """Closest cached analysis within `max_distance`, as (result, distance)."""
+        self._expire(time.monotonic())
+
+        best_key, best_distance = None, self.max_distance + 1
+        candidates = set()
+        for band_key in self._band_keys(image_hash):
+            candidates.update(self._band_index.get(band_key, ()))
+        for key in candidates:
+            distance = (key ^ image_hash).bit_count()
+            if distance < best_distance:
+                best_key, best_distance = key, distance
+                if distance == 0:
+                    break
+
+        if best_key is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(best_key)
+        return self._entries[best_key][1], best_distance
+
+    def put(self, image_hash: int, result: Dict):
+        now = time.monotonic()
+        if image_hash not in self._entries:
+            for band_key in self._band_keys(image_hash):
+                self._band_index.setdefault(band_key, set()).add(image_hash)
+        self._entries[image_hash] = (now, result)
+        self._entries.move_to_end(image_hash)
+        self._expiry.append((now, image_hash))
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+        # Re-put and LRU-evicted hashes leave stale expiry records; keep the queue bounded
+        if len(self._expiry) > 2 * self.max_entries:
+            self._expiry = deque(
+                (stored, key) for stored, key in self._expiry
+                if self._entries.get(key, (None,))[0] == stored
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'max_distance': self.max_distance,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions
+        }
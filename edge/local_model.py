@@ -0,0 +1,200 @@
+"""
+Local Gemini Stand-in
+
+Offline replacement for `genai.GenerativeModel` so the edge path can be run
+and load-tested without network access or API quota. It answers the three
+edge prompts (voice, vision, phrase normalization) with schema-valid JSON,
+either canned (deterministic) or randomized, after a latency drawn from a
+configurable distribution, and fails a configurable share of calls.
+
+Selected with EDGE_MODEL_BACKEND=local; LOCAL_MODEL_* variables override
+LOCAL_MODEL_SETTINGS (see `LocalModel.from_env`).
+"""
+
+from typing import Any, Dict, List, Optional
+import ast
+import asyncio
+import json
+import os
+import random
+import re
+import time
+
+# Stand-in settings
+LOCAL_MODEL_SETTINGS = {
+    'mode': 'random',          # 'canned' (fixed answers) or 'random'
+    'latency': 'lognormal',    # 'fixed', 'uniform' or 'lognormal'
+    'latency_median': 0.4,     # Seconds (median / fixed value / uniform midpoint)
+    'latency_spread': 0.5,     # Lognormal sigma, or +/- fraction for uniform
+    'error_rate': 0.0,         # Share of calls that raise LocalModelError
+    'seed': None,
+}
+
+SYMPTOM_TERMS = ['fever', 'headache', 'body_pain', 'joint_pain', 'cough', 'vomiting',
+                 'diarrhea', 'rash', 'fatigue', 'chills', 'nausea', 'abdominal_pain']
+IMAGE_CONDITIONS = ['skin_rash', 'maculopapular_rash', 'insect_bite', 'skin_lesion',
+                    'conjunctivitis', 'swelling']
+SEVERITIES = ['none', 'mild', 'moderate', 'severe']
+
+_PHRASES = re.compile(r'^Phrases:\s*(\[.*\])\s*$', re.MULTILINE)
+
+
+class LocalModelError(Exception):
+    """Simulated upstream failure (e.g. 503 / quota exceeded)."""
+    pass
+
+
+class LocalResponse:
+    """Minimal stand-in for a Gemini response (only `.text` is used)."""
+
+    __slots__ = ('text',)
+
+    def __init__(self, text: str):
+        self.text = text
+
+
+class LocalModel:
+    """Schema-valid, latency- and error-injecting GenerativeModel stand-in."""
+
+    def __init__(self, mode: str = None, latency: str = None, latency_median: float = None,
+                 latency_spread: float = None, error_rate: float = None, seed: int = None):
+        settings = LOCAL_MODEL_SETTINGS
+        self.mode = mode or settings['mode']
+        self.latency = latency or settings['latency']
+        self.latency_median = latency_median if latency_median is not None else settings['latency_median']
+        self.latency_spread = latency_spread if latency_spread is not None else settings['latency_spread']
+        self.error_rate = error_rate if error_rate is not None else settings['error_rate']
+        self._random = random.Random(seed if seed is not None else settings['seed'])
+
+        if self.mode not in ('canned', 'random'):
+            raise ValueError(f"Unknown local model mode: {self.mode}")
+        if self.latency not in ('fixed', 'uniform', 'lognormal'):
+            raise ValueError(f"Unknown latency distribution: {self.latency}")
+
+        # Metrics
+        self.calls = 0
+        self.failures = 0
+
+    @classmethod
+    def from_env(cls) -> 'LocalModel':
+        """Build from LOCAL_MODEL_MODE / _LATENCY / _LATENCY_MEDIAN / _LATENCY_SPREAD / _ERROR_RATE / _SEED."""
+        def number(name, cast=float):
+            value = os.getenv(f'LOCAL_MODEL_{name}')
+            return cast(value) if value not in (None, '') else None
+
+        return cls(
+            mode=os.getenv('LOCAL_MODEL_MODE') or None,
+            latency=os.getenv('LOCAL_MODEL_LATENCY') or None,
+            latency_median=number('LATENCY_MEDIAN'),
+            latency_spread=number('LATENCY_SPREAD'),
+            error_rate=number('ERROR_RATE'),
+            seed=number('SEED', int)
+        )
+
+    # ========================================================================
+    # GENERATIVE MODEL INTERFACE
+    # ========================================================================
+
+    async def generate_content_async(self, contents: Any, **kwargs) -> LocalResponse:
+        await asyncio.sleep(self.sample_latency())
+        return self._respond(contents)
+
+    def generate_content(self, contents: Any, **kwargs) -> LocalResponse:
+        time.sleep(self.sample_latency())
+        return self._respond(contents)
+
+    def sample_latency(self) -> float:
+        median, spread = self.latency_median, self.latency_spread
+        if self.latency == 'fixed':
+            return median
+        if self.latency == 'uniform':
+            return max(0.0, self._random.uniform(median * (1 - spread), median * (1 + spread)))
+        return self._random.lognormvariate(0.0, spread) * median
+
+    def _respond(self, contents: Any) -> LocalResponse:
+        self.calls += 1
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.failures += 1
+            raise LocalModelError("Local model: simulated upstream error")
+
+        blob = self._blob(contents)
+        if blob is not None and str(blob.get('mime_type', '')).startswith('audio/'):
+            answer = self._voice_answer()
+        elif blob is not None:
+            answer = self._image_answer()
+        else:
+            answer = self._normalization_answer(self._prompt(contents))
+        return LocalResponse(json.dumps(answer, ensure_ascii=False))
+
+    # ========================================================================
+    # ANSWERS (same schemas as the edge prompts)
+    # ========================================================================
+
+    @staticmethod
+    def _blob(contents: Any) -> Optional[Dict]:
+        if isinstance(contents, (list, tuple)):
+            for part in contents:
+                if isinstance(part, dict) and 'data' in part:
+                    return part
+        return None
+
+    @staticmethod
+    def _prompt(contents: Any) -> str:
+        if isinstance(contents, (list, tuple)):
+            return '\n'.join(part for part in contents if isinstance(part, str))
+        return str(contents)
+
+    def _voice_answer(self) -> Dict:
+        if self.mode == 'canned':
+            return {'symptoms_extracted': ['fever', 'headache', 'body_pain'], 'severity': 'moderate',
+                    'duration': '3 days', 'environmental_factors': [], 'confidence': 0.85}
+        return {
+            'symptoms_extracted': self._random.sample(SYMPTOM_TERMS, self._random.randint(1, 4)),
+            'severity': self._random.choice(SEVERITIES[1:]),
+            'duration': f"{self._random.randint(1, 10)} days",
+            'environmental_factors': [],
+            'confidence': round(self._random.uniform(0.5, 0.99), 2)
+        }
+
+    def _image_answer(self) -> Dict:
+        if self.mode == 'canned':
+            return {'detected_conditions': ['skin_rash'], 'severity': 'mild', 'confidence': 0.8,
+                    'description': 'Local stand-in analysis', 'recommendations': []}
+        conditions = self._random.sample(IMAGE_CONDITIONS, self._random.randint(0, 2))
+        return {
+            'detected_conditions': conditions,
+            'severity': self._random.choice(SEVERITIES[1:]) if conditions else 'none',
+            'confidence': round(self._random.uniform(0.4, 0.95), 2) if conditions else 0.0,
+            'description': 'Local stand-in analysis',
+            'recommendations': []
+        }
+
+    def _normalization_answer(self, prompt: str) -> Dict[str, str]:
+        match = _PHRASES.search(prompt)
+        try:
+            phrases: List[str] = ast.literal_eval(match.group(1)) if match else []
+        except (ValueError, SyntaxError):
+            phrases = []
+        if self.mode == 'canned':
+            return {phrase: re.sub(r'\W+', '_', phrase.lower()).strip('_') for phrase in phrases}
+        return {phrase: self._random.choice(SYMPTOM_TERMS) for phrase in phrases}
+
+    def get_metrics(self) -> Dict:
+        return {
+            'mode': self.mode,
+            'latency': self.latency,
+            'latency_median_seconds': self.latency_median,
+            'error_rate': self.error_rate,
+            'calls': self.calls,
+            'failures': self.failures
+        }
+
+
+def model_from_env() -> Optional[LocalModel]:
+    """LocalModel when EDGE_MODEL_BACKEND=local, else None (use Gemini)."""
+    backend = os.getenv('EDGE_MODEL_BACKEND', 'gemini').lower()
+    if backend == 'local':
+        return LocalModel.from_env()
+    if backend != 'gemini':
+        raise ValueError(f"Unknown EDGE_MODEL_BACKEND: {backend}")
+    return None
@@ -0,0 +1,135 @@
+"""
+Edge Media Pipeline
+
+Bounded handling of voice/image uploads before they reach the model:
+
+- Uploads are streamed in chunks into spooled temp files (memory up to
+  `spool_threshold`, disk beyond) with a hard size limit, instead of being
+  read whole into memory.
+- Images are opened lazily with PIL (header only), decoded at reduced size
+  where the codec supports it (JPEG draft mode) and downscaled to
+  `max_image_dimension` before being re-encoded. Images that are already
+  small enough are passed through as-is.
+"""
+
+from tempfile import SpooledTemporaryFile
+from typing import BinaryIO, Dict, Union
+import io
+
+# Media settings
+MEDIA_SETTINGS = {
+    'max_image_bytes': 10 * 1024 * 1024,  # Hard upload limit for images
+    'max_voice_bytes': 10 * 1024 * 1024,  # Hard upload limit for voice notes
+    'spool_threshold': 1024 * 1024,       # Bytes kept in memory before spilling to disk
+    'chunk_size': 64 * 1024,              # Upload read size
+    'max_image_dimension': 1024,          # Longest edge sent to the vision model
+    'jpeg_quality': 85,
+}
+
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds its size limit."""
+
+    def __init__(self, name: str, limit: int):
+        self.limit = limit
+        super().__init__(f"{name} exceeds the upload limit of {limit} bytes")
+
+
+async def spool_upload(upload, max_bytes: int) -> SpooledTemporaryFile:
+    """
+    Stream an UploadFile into a spooled temp file, enforcing `max_bytes`.
+
+    The returned file is rewound; the caller closes it.
+    """
+    name = getattr(upload, 'filename', None) or 'upload'
+    declared = getattr(upload, 'size', None)
+    if declared is not None and declared > max_bytes:
+        raise UploadTooLargeError(name, max_bytes)
+
+    spooled = SpooledTemporaryFile(max_size=MEDIA_SETTINGS['spool_threshold'])
+    total = 0
+    try:
+        while True:
+            chunk = await upload.read(MEDIA_SETTINGS['chunk_size'])
+            if not chunk:
+                break
+            total += len(chunk)
+            if total > max_bytes:
+                raise UploadTooLargeError(name, max_bytes)
+            spooled.write(chunk)
+    except BaseException:
+        spooled.close()
+        raise
+    spooled.seek(0)
+    return spooled
+
+
+def sniff_image_mime(header: bytes) -> str:
+    """MIME type from magic bytes (defaults to JPEG)."""
+    if header[:8] == b'\x89PNG\r\n\x1a\n':
+        return "image/png"
+    if header[:4] == b'RIFF' and header[8:12] == b'WEBP':
+        return "image/webp"
+    return "image/jpeg"
+
+
+def sniff_audio_mime(header: bytes) -> str:
+    """MIME type of a voice note from magic bytes (defaults to WebM, the browser recorder format)."""
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return "audio/wav"
+    if header[:4] == b'OggS':
+        return "audio/ogg"
+    if header[:4] == b'fLaC':
+        return "audio/flac"
+    if header[:3] == b'ID3' or header[:2] in (b'\xff\xfb', b'\xff\xf3', b'\xff\xf2'):
+        return "audio/mp3"
+    if header[4:8] == b'ftyp':
+        return "audio/mp4"
+    return "audio/webm"
+
+
+def read_all(source: Union[bytes, BinaryIO]) -> bytes:
+    """Bytes of an upload (no copy if it already is bytes)."""
+    if isinstance(source, (bytes, bytearray)):
+        return source
+    source.seek(0)
+    return source.read()
+
+
+def prepare_image(source: Union[bytes, BinaryIO], max_dimension: int = None) -> Dict:
+    """
+    Turn an uploaded image into a model-ready blob {"mime_type", "data"}.
+
+    CPU-bound (decode/resize); call it off the event loop. Raises
+    ValueError if the data is not a readable image.
+    """
+    max_dimension = max_dimension or MEDIA_SETTINGS['max_image_dimension']
+    stream = io.BytesIO(source) if isinstance(source, (bytes, bytearray)) else source
+    stream.seek(0)
+    mime_type = sniff_image_mime(stream.read(16))
+    stream.seek(0)
+
+    try:
+        from PIL import Image
+    except ImportError:
+        # Without Pillow the original bytes are sent unchanged
+        return {"mime_type": mime_type, "data": read_all(source)}
+
+    try:
+        image = Image.open(stream)  # Reads the header only
+        width, height = image.size
+    except Exception as e:
+        raise ValueError(f"Unreadable image: {e}")
+
+    if max(width, height) <= max_dimension:
+        return {"mime_type": mime_type, "data": read_all(source)}
+
+    # Let the JPEG decoder skip detail we are about to throw away
+    image.draft('RGB', (max_dimension, max_dimension))
+    image.thumbnail((max_dimension, max_dimension))
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+
+    encoded = io.BytesIO()
+    image.save(encoded, format='JPEG', quality=MEDIA_SETTINGS['jpeg_quality'])
+    return {"mime_type": "image/jpeg", "data": encoded.getvalue()}
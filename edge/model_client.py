@@ -0,0 +1,263 @@
+"""
+Async Model Client
+
+Non-blocking execution layer for Gemini model calls. Uses the SDK's native
+`generate_content_async` when the model provides it and otherwise runs the
+blocking `generate_content` on a dedicated thread pool, so a slow vision or
+text call never stalls the event loop. A semaphore caps in-flight calls,
+every call has a timeout, and queue-wait / call-latency metrics are kept.
+A slot is only given back once the upstream call has really finished: a
+thread-pool call that timed out keeps its slot until its thread returns, so
+`max_in_flight` bounds actual upstream concurrency.
+
+Any object satisfying `ModelBackend` can be wrapped: Gemini's GenerativeModel
+or the offline stand-in in edge/local_model.py.
+
+Calls also pass through a circuit breaker (fail fast with CircuitOpenError
+while the upstream is degraded) and can optionally be hedged: if a call has
+not answered after `hedge_after` seconds, a duplicate is sent and whichever
+answers first wins.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Dict, Protocol
+import asyncio
+import threading
+import time
+
+from edge.circuit_breaker import CircuitBreaker, CircuitOpenError
+
+# Model call settings
+MODEL_CLIENT_SETTINGS = {
+    'max_in_flight': 4,      # Concurrent model calls per client
+    'call_timeout': 30.0,    # Seconds before a call is abandoned
+    'thread_pool_size': 8,   # Shared worker threads for blocking SDK calls
+    'hedge_after': None,     # Seconds before a duplicate request is sent (None = no hedging)
+}
+
+_executor: ThreadPoolExecutor = None
+_executor_lock = threading.Lock()
+
+
+def _shared_executor() -> ThreadPoolExecutor:
+    """Thread pool for blocking model calls (kept off the default executor)."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=MODEL_CLIENT_SETTINGS['thread_pool_size'],
+                thread_name_prefix='model-call'
+            )
+        return _executor
+
+
+class ModelBackend(Protocol):
+    """
+    What AsyncModelClient needs from a model.
+    
+    `generate_content(contents)` returns a response with a `.text` attribute;
+    an optional `generate_content_async` with the same signature is preferred.
+    """
+
+    def generate_content(self, contents: Any, **kwargs) -> Any: ...
+
+
+class ModelCallTimeout(Exception):
+    """Raised when a model call exceeds its timeout."""
+    pass
+
+
+def _failed(task: asyncio.Future) -> bool:
+    """True if a finished call was cancelled or raised."""
+    return task.cancelled() or task.exception() is not None
+
+
+class _LatencyStats:
+    """Running count / mean / max of a latency in milliseconds."""
+
+    __slots__ = ('count', 'total_ms', 'max_ms')
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms: float):
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def to_dict(self) -> Dict:
+        return {
+            'avg_ms': round(self.total_ms / self.count, 2) if self.count else 0.0,
+            'max_ms': round(self.max_ms, 2)
+        }
+
+
+class AsyncModelClient:
+    """Bounded, timed, non-blocking wrapper around a generative model."""
+
+    def __init__(self, model: ModelBackend, max_in_flight: int = None, call_timeout: float = None,
+                 breaker: CircuitBreaker = None, hedge_after: float = None):
+        self.model = model
+        self.max_in_flight = max_in_flight or MODEL_CLIENT_SETTINGS['max_in_flight']
+        self.call_timeout = call_timeout or MODEL_CLIENT_SETTINGS['call_timeout']
+        self.hedge_after = hedge_after or MODEL_CLIENT_SETTINGS['hedge_after']
+        self.breaker = breaker or CircuitBreaker()
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        # Metrics
+        self.in_flight = 0  # Upstream calls holding a slot (incl. abandoned thread-pool calls)
+        self.waiting = 0
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+        self.queue_wait = _LatencyStats()
+        self.latency = _LatencyStats()
+
+    async def generate(self, contents: Any, model=None, timeout: float = None, **kwargs):
+        """
+        Run `generate_content(contents)` without blocking the event loop.
+
+        `model` overrides the client's default model (e.g. a vision model
+        sharing the same concurrency limit). Raises ModelCallTimeout, or
+        CircuitOpenError without calling upstream while the breaker is open.
+        """
+        model = model or self.model
+        timeout = timeout or self.call_timeout
+        
+        ticket = self.breaker.allow()
+        if ticket is None:
+            raise CircuitOpenError("Model upstream degraded; circuit open")
+
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._semaphore.acquire()
+        except BaseException:
+            self.breaker.abandon(ticket)  # Never reached upstream
+            raise
+        finally:
+            self.waiting -= 1
+        self.in_flight += 1
+        started = time.perf_counter()
+        self.queue_wait.record((started - queued) * 1000)
+
+        # The slot now belongs to the upstream call, which releases it when it has ended
+        self.calls += 1
+        primary = self._start_call(model, contents, kwargs)
+        success = False
+        cancelled = False
+        try:
+            response = await asyncio.wait_for(self._hedged(primary, model, contents, kwargs), timeout)
+            success = True
+            return response
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise ModelCallTimeout(f"Model call timed out after {timeout}s")
+        except asyncio.CancelledError:
+            # The caller went away: says nothing about upstream health
+            cancelled = True
+            raise
+        except Exception:
+            self.errors += 1
+            raise
+        finally:
+            primary.cancel()  # No-op if it finished
+            elapsed = time.perf_counter() - started
+            if cancelled:
+                self.breaker.abandon(ticket)
+            else:
+                self.latency.record(elapsed * 1000)
+                self.breaker.record(success, elapsed, ticket)
+
+    async def _hedged(self, primary: asyncio.Future, model, contents: Any, kwargs: Dict):
+        """Await `primary`; past `hedge_after`, race a duplicate request."""
+        pending = {primary}
+        try:
+            if self.hedge_after:
+                done, _ = await asyncio.wait(pending, timeout=self.hedge_after)
+                # The duplicate needs its own slot; with none free, keep waiting on the primary
+                if not done and await self._try_acquire():
+                    self.hedges += 1
+                    pending.add(self._start_call(model, contents, kwargs))
+                elif not done:
+                    self.hedges_skipped += 1
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                # Prefer a successful answer; raise only when both failed
+                for task in sorted(done, key=_failed):
+                    if not _failed(task):
+                        if task is not primary:
+                            self.hedge_wins += 1
+                        return task.result()
+                    if not pending:
+                        if task.cancelled():
+                            # Not our caller's cancellation: surface it as a call failure
+                            raise RuntimeError("Model call was cancelled upstream")
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _try_acquire(self) -> bool:
+        """Take a free slot without waiting (False if none is free)."""
+        if self._semaphore.locked():
+            return False
+        await self._semaphore.acquire()  # Free slot: returns without suspending
+        self.in_flight += 1
+        return True
+
+    def _release_slot(self, *_):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def _start_call(self, model, contents: Any, kwargs: Dict) -> asyncio.Future:
+        """
+        Start one upstream call on an already-acquired slot.
+
+        The slot is released when the call has really ended. A native async
+        call stops when cancelled; a blocking SDK call cannot be interrupted,
+        so its worker thread keeps the slot until it returns.
+        """
+        loop = asyncio.get_running_loop()
+        native = getattr(model, 'generate_content_async', None)
+        try:
+            if native is not None:
+                call = asyncio.ensure_future(native(contents, **kwargs))
+                call.add_done_callback(self._release_slot)
+                return call
+            job = _shared_executor().submit(partial(model.generate_content, contents, **kwargs))
+        except BaseException:
+            self._release_slot()
+            raise
+
+        def release_from_thread(_):
+            try:
+                loop.call_soon_threadsafe(self._release_slot)
+            except RuntimeError:
+                pass  # Event loop already closed
+        job.add_done_callback(release_from_thread)
+        return asyncio.wrap_future(job, loop=loop)
+
+    def get_metrics(self) -> Dict:
+        return {
+            'max_in_flight': self.max_in_flight,
+            'call_timeout_seconds': self.call_timeout,
+            'in_flight': self.in_flight,
+            'waiting': self.waiting,
+            'calls': self.calls,
+            'errors': self.errors,
+            'timeouts': self.timeouts,
+            'hedges': self.hedges,
+            'hedge_wins': self.hedge_wins,
+            'hedges_skipped': self.hedges_skipped,
+            'circuit_breaker': self.breaker.get_metrics(),
+            'queue_wait': self.queue_wait.to_dict(),
+            'latency': self.latency.to_dict()
+        }
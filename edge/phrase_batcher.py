@@ -0,0 +1,111 @@
+"""
+Phrase Micro-Batcher
+
+Collects unknown symptom phrases from concurrent reports and resolves them
+with one model call per batch. A batch is sent when `max_batch` distinct
+phrases are pending or `window` seconds after its first phrase arrived,
+whichever comes first, so the added latency is bounded by the window. The
+same phrase requested by several reports is sent once and every waiter
+gets the answer.
+"""
+
+from typing import Awaitable, Callable, Dict, List, Set
+import asyncio
+
+
+class PhraseBatcher:
+    """Coalesces phrase lookups into batched model requests."""
+
+    def __init__(
+        self,
+        resolve_batch: Callable[[List[str]], Awaitable[Dict[str, str]]],
+        window: float = 0.05,
+        max_batch: int = 32
+    ):
+        self.resolve_batch = resolve_batch
+        self.window = window
+        self.max_batch = max_batch
+
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._timer: asyncio.TimerHandle = None
+        self._sending: Set[asyncio.Task] = set()  # Strong refs to in-flight sends
+
+        # Metrics
+        self.requests = 0
+        self.phrases = 0
+        self.batches = 0
+        self.shared = 0
+
+    async def resolve(self, phrases: List[str]) -> Dict[str, str]:
+        """
+        Resolve phrases to terms, batched with other concurrent callers.
+
+        Phrases the model could not map are absent from the result. Raises
+        if the batch request failed.
+        """
+        self.requests += 1
+        loop = asyncio.get_running_loop()
+        waiting = {}
+        for phrase in phrases:
+            future = self._pending.get(phrase)
+            if future is None:
+                future = self._pending[phrase] = loop.create_future()
+                self.phrases += 1
+            else:
+                self.shared += 1
+            waiting[phrase] = future
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._pending and self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        # Shielded: one caller giving up must not cancel a phrase others share
+        results = await asyncio.gather(
+            *(asyncio.shield(future) for future in waiting.values()),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return {phrase: term for phrase, term in zip(waiting, results) if term is not None}
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        while self._pending:
+            batch = dict(list(self._pending.items())[:self.max_batch])
+            for phrase in batch:
+                del self._pending[phrase]
+            self.batches += 1
+            task = asyncio.ensure_future(self._send(batch))
+            self._sending.add(task)
+            task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch: Dict[str, asyncio.Future]):
+        try:
+            terms = await self.resolve_batch(list(batch))
+        except Exception as e:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+                    # Waiters may all have gone; don't log it as never retrieved
+                    future.exception()
+            return
+
+        for phrase, future in batch.items():
+            if not future.done():
+                future.set_result(terms.get(phrase))
+
+    def get_metrics(self) -> Dict:
+        return {
+            'window_seconds': self.window,
+            'max_batch': self.max_batch,
+            'requests': self.requests,
+            'phrases': self.phrases,
+            'shared_phrases': self.shared,
+            'batches': self.batches,
+            'avg_batch_size': round(self.phrases / self.batches, 2) if self.batches else 0.0
+        }
@@ -0,0 +1,97 @@
+"""
+Symptom Phrase Cache
+
+Content-addressed store of model answers for symptom phrases the local
+dictionary does not know. Entries are keyed by the SHA-256 of the
+normalized phrase (case-folded, whitespace collapsed), so the same wording
+typed differently hits the same entry. With a `path`, entries are appended
+to a JSON-lines file and reloaded on start, so answers survive restarts.
+
+Phrases the model could not map are stored too, as a negative entry
+(`NO_TERM`), so repeating them does not cost another model call.
+"""
+
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import re
+
+_WHITESPACE = re.compile(r'\s+')
+
+NO_TERM = ''  # Negative entry: the model had no term; the phrase passes through
+
+
+def phrase_key(phrase: str) -> str:
+    """Normalized form of a phrase: 'Sir  Dard ' -> 'sir dard'."""
+    return _WHITESPACE.sub(' ', phrase.strip().casefold())
+
+
+def phrase_digest(phrase: str) -> str:
+    """Content address of a phrase (hex SHA-256 of its normalized form)."""
+    return hashlib.sha256(phrase_key(phrase).encode('utf-8')).hexdigest()
+
+
+class PhraseCache:
+    """Persistent phrase -> standard term mapping."""
+
+    def __init__(self, path: str = None):
+        self.path = Path(path) if path else None
+        self._entries: Dict[str, str] = {}
+        self._file = None
+
+        # Metrics
+        self.hits = 0
+        self.misses = 0
+
+        if self.path and self.path.exists():
+            self._load()
+
+    def _load(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    self._entries[record['key']] = record['term']
+                except (ValueError, KeyError):
+                    continue  # Skip a torn final line
+
+    def get(self, phrase: str) -> Optional[str]:
+        """Cached term, NO_TERM for a known-unmappable phrase, None on a miss."""
+        term = self._entries.get(phrase_digest(phrase))
+        if term is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return term
+
+    def put(self, phrase: str, term: str):
+        """Store a model answer or NO_TERM (appended to the cache file if persistent)."""
+        key = phrase_digest(phrase)
+        if self._entries.get(key) == term:
+            return
+        self._entries[key] = term
+
+        if self.path:
+            if self._file is None:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.path, 'a', encoding='utf-8', buffering=1)
+            record = {'key': key, 'phrase': phrase_key(phrase), 'term': term}
+            self._file.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_metrics(self) -> Dict:
+        return {
+            'entries': len(self._entries),
+            'negative_entries': sum(1 for term in self._entries.values() if term == NO_TERM),
+            'persistent': self.path is not None,
+            'hits': self.hits,
+            'misses': self.misses
+        }
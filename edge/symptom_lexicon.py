@@ -0,0 +1,236 @@
+"""
+Symptom Lexicon Matcher
+
+Multilingual symptom dictionary compiled once into an Aho-Corasick automaton.
+A single left-to-right pass over free text finds every synonym, category
+keyword and urgency marker; overlapping hits are resolved leftmost-longest
+and only whole words/phrases count, so 'sir dard' yields headache (not two
+keywords) and 'rash' does not fire inside 'crash'.
+
+The vocabulary lives in `config/symptom_lexicon.yaml` (or $SYMPTOM_LEXICON),
+so new languages and synonyms need no code changes.
+"""
+
+from collections import deque
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import bisect
+import os
+import re
+import unicodedata
+
+import yaml
+
+DEFAULT_LEXICON_PATH = Path(__file__).resolve().parents[1] / 'config' / 'symptom_lexicon.yaml'
+
+URGENCY_LEVELS = ('low', 'medium', 'high')
+
+_SEPARATORS = re.compile(r'[\s_\-]+')
+
+# Payload kinds attached to automaton outputs
+SYMPTOM, CATEGORY, URGENCY = 'symptom', 'category', 'urgency'
+
+
+def fold(text: str) -> str:
+    """Matching form of text: case-folded, '_'/'-'/whitespace runs -> ' '."""
+    return _SEPARATORS.sub(' ', text.casefold()).strip()
+
+
+def _is_word_char(char: str) -> bool:
+    # Combining marks (e.g. Devanagari vowel signs) are part of the word
+    return char.isalnum() or unicodedata.category(char)[0] == 'M'
+
+
+class LexiconMatch(NamedTuple):
+    start: int
+    end: int
+    kind: str    # 'symptom', 'category' or 'urgency'
+    value: str   # canonical symptom, category name or urgency level
+
+
+class LexiconAnalysis(NamedTuple):
+    """Result of analysing a list of phrases."""
+    terms: Dict[str, Optional[str]]  # phrase -> first canonical symptom (None if unknown)
+    symptoms: List[str]              # All canonical symptoms found, in order
+    categories: Dict[str, List[str]] # category -> symptoms/phrases placed in it
+    urgency: str
+
+
+class SymptomLexicon:
+    """Compiled multi-pattern matcher over the symptom vocabulary."""
+
+    def __init__(self, symptoms: Dict[str, Dict], category_keywords: Dict[str, List[str]] = None,
+                 urgency_markers: Dict[str, List[str]] = None):
+        self.symptom_categories: Dict[str, str] = {}
+        self.symptom_urgency: Dict[str, str] = {}
+
+        # Automaton: per-state transitions, failure links and outputs
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, str, str]]] = [[]]  # (length, kind, value)
+
+        for name, entry in symptoms.items():
+            entry = entry or {}
+            if entry.get('category'):
+                self.symptom_categories[name] = entry['category']
+            if entry.get('urgency'):
+                self.symptom_urgency[name] = entry['urgency']
+            for pattern in (name, *entry.get('synonyms', [])):
+                self._add_pattern(str(pattern), SYMPTOM, name)
+
+        for category, keywords in (category_keywords or {}).items():
+            for keyword in keywords:
+                self._add_pattern(str(keyword), CATEGORY, category)
+
+        for level, markers in (urgency_markers or {}).items():
+            for marker in markers:
+                self._add_pattern(str(marker), URGENCY, level)
+
+        self._build_failure_links()
+
+    @classmethod
+    def from_file(cls, path: str = None) -> 'SymptomLexicon':
+        """Compile the lexicon from YAML (default: $SYMPTOM_LEXICON or config/)."""
+        path = Path(path or os.getenv('SYMPTOM_LEXICON') or DEFAULT_LEXICON_PATH)
+        with open(path, 'r', encoding='utf-8') as f:
+            config = (yaml.safe_load(f) or {}).get('lexicon', {})
+        return cls(
+            config.get('symptoms') or {},
+            config.get('category_keywords'),
+            config.get('urgency_markers')
+        )
+
+    # ========================================================================
+    # COMPILATION
+    # ========================================================================
+
+    def _add_pattern(self, pattern: str, kind: str, value: str):
+        pattern = fold(pattern)
+        if not pattern:
+            return
+        state = 0
+        for char in pattern:
+            nxt = self._goto[state].get(char)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][char] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        output = (len(pattern), kind, value)
+        if output not in self._out[state]:
+            self._out[state].append(output)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                # Inherit outputs of the longest proper suffix
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # ========================================================================
+    # MATCHING
+    # ========================================================================
+
+    def _scan_folded(self, text: str) -> List[LexiconMatch]:
+        matches = []
+        state = 0
+        goto, fail, out = self._goto, self._fail, self._out
+        for i, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, kind, value in out[state]:
+                start, end = i - length + 1, i + 1
+                if start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if end < len(text) and _is_word_char(text[end]):
+                    continue
+                matches.append(LexiconMatch(start, end, kind, value))
+
+        # Urgency markers are modifiers and may overlap terms; terms may not
+        markers = [m for m in matches if m.kind == URGENCY]
+        terms = [m for m in matches if m.kind != URGENCY]
+        return self._leftmost_longest(terms) + self._leftmost_longest(markers)
+
+    @staticmethod
+    def _leftmost_longest(matches: List[LexiconMatch]) -> List[LexiconMatch]:
+        """Non-overlapping hits, preferring earlier then longer spans."""
+        matches.sort(key=lambda m: (m.start, -(m.end - m.start)))
+        selected: List[LexiconMatch] = []
+        for match in matches:
+            if selected and match.start < selected[-1].end:
+                last = selected[-1]
+                if (match.start, match.end) != (last.start, last.end):
+                    continue
+            selected.append(match)  # Same span with another payload is kept
+        return selected
+
+    def scan(self, text: str) -> List[LexiconMatch]:
+        """All lexicon hits in free text (positions refer to fold(text))."""
+        return self._scan_folded(fold(text))
+
+    def analyze(self, phrases: Iterable[str]) -> LexiconAnalysis:
+        """
+        Extract canonical symptoms, categories and urgency from phrases.
+
+        All phrases are scanned in one pass (joined with a separator that no
+        pattern can span).
+        """
+        phrases = list(phrases)
+        folded = [fold(p) for p in phrases]
+        offsets = []
+        position = 0
+        for text in folded:
+            offsets.append(position)
+            position += len(text) + 1
+        matches = self._scan_folded('\n'.join(folded))
+
+        terms: Dict[str, Optional[str]] = {p: None for p in phrases}
+        symptoms: List[str] = []
+        categories: Dict[str, List[str]] = {}
+        urgency = 0
+        phrase_categories: Dict[int, set] = {}
+
+        for match in matches:
+            index = bisect.bisect_right(offsets, match.start) - 1
+            if match.kind == SYMPTOM:
+                if terms[phrases[index]] is None:
+                    terms[phrases[index]] = match.value
+                if match.value not in symptoms:
+                    symptoms.append(match.value)
+                    category = self.symptom_categories.get(match.value)
+                    if category:
+                        categories.setdefault(category, []).append(match.value)
+                urgency = max(urgency, self._urgency_rank(self.symptom_urgency.get(match.value)))
+            elif match.kind == CATEGORY:
+                phrase_categories.setdefault(index, set()).add(match.value)
+            else:
+                urgency = max(urgency, self._urgency_rank(match.value))
+
+        # Keyword-only categories apply to phrases that named no known symptom
+        for index, found in phrase_categories.items():
+            phrase = phrases[index]
+            if terms[phrase] is None:
+                for category in sorted(found):
+                    members = categories.setdefault(category, [])
+                    if phrase not in members:
+                        members.append(phrase)
+
+        return LexiconAnalysis(terms, symptoms, categories, URGENCY_LEVELS[urgency])
+
+    @staticmethod
+    def _urgency_rank(level: Optional[str]) -> int:
+        return URGENCY_LEVELS.index(level) if level in URGENCY_LEVELS else 0
+
+    def __len__(self) -> int:
+        """Number of automaton states."""
+        return len(self._goto)
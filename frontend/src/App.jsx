@@ -519,10 +519,19 @@ const AgentCommunications = () => {
   const [loading, setLoading] = useState(true);
 
   useEffect(() => {
+    let cursor = null;
     const fetchComms = async () => {
       try {
-        const data = await api.get('/api/v1/swarm/communications?limit=50');
-        setComms(data.communications || []);
+        // After the first load, only ask for entries newer than our cursor
+        const query = cursor === null ? 'limit=50' : `limit=50&since=${cursor}`;
+        const data = await api.get(`/api/v1/swarm/communications?${query}`);
+        const incoming = data.communications || [];
+        if (cursor === null || data.missed || cursor > data.cursor) {
+          setComms(incoming);
+        } else if (incoming.length) {
+          setComms(prev => [...prev, ...incoming].slice(-50));
+        }
+        cursor = data.cursor;
       } catch (err) {
         console.error('Failed to fetch communications:', err);
       }
@@ -572,7 +581,7 @@ const AgentCommunications = () => {
           </div>
         ) : (
           comms.slice().reverse().map((msg, idx) => (
-            <div key={idx} className="p-3 hover:bg-surface-100 transition-colors">
+            <div key={msg.seq ?? idx} className="p-3 hover:bg-surface-100 transition-colors">
               <div className="flex items-center gap-2 mb-1.5 flex-wrap">
                 <span className="text-xs font-medium text-text-primary">{msg.from}</span>
                 <ChevronRight className="w-3 h-3 text-text-muted" />
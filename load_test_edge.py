@@ -0,0 +1,202 @@
+"""
+Offline load harness for the edge report path
+
+Drives the submit-report pipeline (backend/app/services/report_pipeline.py,
+the same code behind /api/v1/edge/submit-report) in-process at a target
+request rate against the local Gemini stand-in (edge/local_model.py), then
+reports throughput, latency percentiles and the edge layer's own metrics
+(model concurrency, batching, caches, circuit breaker). No network or API
+key needed.
+
+The services are built directly rather than through backend.app.main, so
+FastAPI and the Gemini SDK need not be installed. Quantum escalations run
+when Cirq is available and are only counted otherwise.
+
+Run from project root:
+    python load_test_edge.py --rate 20 --duration 30 --voice-share 0.3 --image-share 0.3
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# Phrases the lexicon knows, plus free text that needs the model
+KNOWN_PHRASES = ['fever', 'bukhar', 'sir dard', 'headache', 'body pain', 'khansi',
+                 'joint pain', 'ulti', 'dast', 'rash', 'high fever', 'thakan']
+UNKNOWN_PHRASES = ['feels weak since morning', 'eyes burning', 'pain behind eyes',
+                   'shivering at night', 'loss of taste', 'red spots on legs']
+
+
+class FakeUpload:
+    """Just enough of fastapi.UploadFile for spool_upload()."""
+
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.size = len(data)
+        self._stream = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        return self._stream.read(size)
+
+
+def make_images(count: int, rng: random.Random):
+    """A few small distinct JPEGs (random bytes if Pillow is missing)."""
+    try:
+        from PIL import Image
+    except ImportError:
+        return [b'\xff\xd8\xff\xe0' + rng.randbytes(20000) for _ in range(count)]
+    images = []
+    for _ in range(count):
+        color = tuple(rng.randrange(256) for _ in range(3))
+        image = Image.new('RGB', (1600, 1200), color)
+        image.paste((255 - color[0], 0, 0), (rng.randrange(1200), rng.randrange(800), 1600, 1200))
+        encoded = io.BytesIO()
+        image.save(encoded, format='JPEG', quality=85)
+        images.append(encoded.getvalue())
+    return images
+
+
+def make_voice(rng: random.Random) -> bytes:
+    body = rng.randbytes(32000)
+    return b'RIFF' + (len(body) + 4).to_bytes(4, 'little') + b'WAVE' + body
+
+
+def percentile(sorted_values, fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(int(fraction * len(sorted_values)), len(sorted_values) - 1)]
+
+
+async def run(args, cache_dir: str):
+    rng = random.Random(args.seed)
+    from backend.app.services.adk_swarm_service import ADKSwarmService
+    from backend.app.services.edge_ai_service import GeminiEdgeProcessor
+    from backend.app.services.report_pipeline import ReportPipeline
+    from edge.local_model import LocalModel
+    try:
+        from backend.app.services.quantum_service import QuantumService
+        quantum = QuantumService()
+    except ImportError:
+        print("⚠️  Cirq not installed: quantum escalations are counted, not run")
+        quantum = None
+
+    model = LocalModel(
+        mode=args.mode,
+        latency=args.latency,
+        latency_median=args.latency_median,
+        latency_spread=args.latency_spread,
+        error_rate=args.error_rate,
+        seed=args.seed
+    )
+    # Cold phrase cache that does not touch data/
+    processor = GeminiEdgeProcessor(
+        api_key='local',
+        model=model,
+        cache_path=os.path.join(cache_dir, 'phrase_cache.jsonl')
+    )
+    swarm = ADKSwarmService(quantum_service=quantum)
+    swarm.start()
+    pipeline = ReportPipeline(processor, swarm, quantum)
+
+    villages = list(swarm.orchestrator.agents.keys())
+    images = make_images(args.distinct_images, rng)
+
+    latencies = []
+    failures = {}
+    escalations = 0
+    in_flight = set()
+
+    async def one_report():
+        nonlocal escalations
+        symptoms = rng.sample(KNOWN_PHRASES, rng.randint(1, 3))
+        if rng.random() < args.unknown_share:
+            symptoms.append(rng.choice(UNKNOWN_PHRASES))
+        voice = FakeUpload('voice.wav', make_voice(rng)) if rng.random() < args.voice_share else None
+        image = FakeUpload('photo.jpg', rng.choice(images)) if rng.random() < args.image_share else None
+
+        started = time.perf_counter()
+        try:
+            result = await pipeline.submit(rng.choice(villages), symptoms, voice=voice, image=image)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if 'escalated_to_quantum' in result['swarm_response'].get('autonomous_actions_taken', []):
+                escalations += 1
+        except Exception as e:
+            name = type(e).__name__
+            failures[name] = failures.get(name, 0) + 1
+
+    # Open-loop arrivals (Poisson at --rate) so slow responses do not throttle the load
+    print(f"⏱️  Driving {args.rate} req/s for {args.duration}s...")
+    started = time.perf_counter()
+    deadline = started + args.duration
+    sent = 0
+    while time.perf_counter() < deadline:
+        task = asyncio.create_task(one_report())
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+        sent += 1
+        await asyncio.sleep(rng.expovariate(args.rate))
+    if in_flight:
+        await asyncio.wait(in_flight)
+    elapsed = time.perf_counter() - started
+
+    await swarm.shutdown()
+
+    latencies.sort()
+    return {
+        'target_rate': args.rate,
+        'sent': sent,
+        'completed': len(latencies),
+        'failed': failures,
+        'quantum_escalations': escalations,
+        'elapsed_seconds': round(elapsed, 2),
+        'throughput_rps': round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        'latency_ms': {
+            'p50': round(percentile(latencies, 0.50), 2),
+            'p95': round(percentile(latencies, 0.95), 2),
+            'p99': round(percentile(latencies, 0.99), 2),
+            'max': round(latencies[-1], 2) if latencies else 0.0
+        },
+        'local_model': model.get_metrics(),
+        'edge': processor.get_metrics()
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Offline load test of the edge report path")
+    parser.add_argument('--rate', type=float, default=10.0, help="Target requests per second")
+    parser.add_argument('--duration', type=float, default=20.0, help="Seconds of load")
+    parser.add_argument('--voice-share', type=float, default=0.3, help="Share of reports with a voice note")
+    parser.add_argument('--image-share', type=float, default=0.3, help="Share of reports with a photo")
+    parser.add_argument('--unknown-share', type=float, default=0.3,
+                        help="Share of reports with a phrase the lexicon does not know")
+    parser.add_argument('--distinct-images', type=int, default=8, help="Distinct photos (repeats hit the image cache)")
+    parser.add_argument('--mode', choices=['canned', 'random'], default='random')
+    parser.add_argument('--latency', choices=['fixed', 'uniform', 'lognormal'], default='lognormal')
+    parser.add_argument('--latency-median', type=float, default=0.4, help="Stand-in model latency (seconds)")
+    parser.add_argument('--latency-spread', type=float, default=0.5)
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of model calls that fail")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--quiet', action='store_true', help="Silence per-report logging")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if args.quiet:
+            with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+                report = asyncio.run(run(args, cache_dir))
+        else:
+            report = asyncio.run(run(args, cache_dir))
+
+    print(json.dumps(report, indent=2, default=str))
@@ -55,6 +55,8 @@ class VillageSwarmAgent:
         
         # Communication state
         self.neighbor_beliefs: Dict[str, float] = {}
+        self.unresponsive_neighbors: Dict[str, str] = {}
+        self.regional_alerts: Dict[str, Dict] = {}  # origin village -> latest gossiped alert
         self.pending_votes: Dict[str, str] = {}
         self.messages_received: List[Dict] = []
 
@@ -165,9 +167,13 @@ class VillageSwarmAgent:
         actions_taken = []
         
         # Rule: If belief > neighbor threshold, query neighbors
+        # (only those whose belief is not already pushed to us)
+        self.unresponsive_neighbors = {}
+        neighbors_queried = []
         if self.outbreak_belief >= THRESHOLDS['escalate_to_neighbors']:
-            await self._query_neighbors()
-            actions_taken.append("queried_neighbors")
+            neighbors_queried = await self._query_neighbors()
+            if neighbors_queried:
+                actions_taken.append("queried_neighbors")
         
         # Rule: If belief > quantum threshold, check consensus then escalate
         if self.outbreak_belief >= THRESHOLDS['escalate_to_quantum']:
@@ -187,6 +193,8 @@ class VillageSwarmAgent:
             "outbreak_belief": round(self.outbreak_belief, 3),
             "risk_level": self.risk_level,
             "actions_taken": actions_taken,
+            "neighbors_queried": neighbors_queried,
+            "unresponsive_neighbors": dict(self.unresponsive_neighbors),
             "symptom_count": len(self.symptom_history)
         }
 
@@ -194,29 +202,45 @@ class VillageSwarmAgent:
     # INTER-AGENT COMMUNICATION (Swarm Behavior)
     # ========================================================================
     
-    async def _query_neighbors(self):
-        """Query neighboring agents for their beliefs."""
+    async def _query_neighbors(self) -> List[str]:
+        """
+        Query neighboring agents for their beliefs (concurrently).
+        
+        When the orchestrator pushes belief changes, only neighbours we have
+        never heard from are polled. Neighbours that time out or fail are
+        recorded in `unresponsive_neighbors` rather than ignored.
+        Returns the IDs that were queried.
+        """
         if not self.orchestrator:
-            return
+            return []
         
-        neighbors = self.orchestrator.network_topology.get(self.village_id, [])
+        neighbors = self.orchestrator.neighbors_of(self.village_id)
+        if getattr(self.orchestrator, 'propagator', None):
+            neighbors = [n for n in neighbors if n not in self.neighbor_beliefs]
+        if not neighbors:
+            return []
         
-        for neighbor_id in neighbors:
-            try:
-                response = await self.orchestrator.query_agent(
-                    neighbor_id, "status", {"from": self.village_id}
-                )
-                if response and 'outbreak_belief' in response:
-                    self.neighbor_beliefs[neighbor_id] = response['outbreak_belief']
-            except Exception:
-                pass
+        outcome = await self.orchestrator.query_agents(
+            neighbors, "status", {"from": self.village_id}
+        )
+        
+        for neighbor_id, response in outcome['responses'].items():
+            if response and 'outbreak_belief' in response:
+                self.neighbor_beliefs[neighbor_id] = response['outbreak_belief']
+        
+        for neighbor_id in outcome['timed_out']:
+            self.unresponsive_neighbors[neighbor_id] = "timeout"
+        for neighbor_id, error in outcome['failed'].items():
+            self.unresponsive_neighbors[neighbor_id] = f"error: {error}"
+        
+        return neighbors
     
     async def _propose_escalation(self):
         """Propose quantum escalation to neighbors for voting."""
         if not self.orchestrator:
             return
         
-        neighbors = self.orchestrator.network_topology.get(self.village_id, [])
+        neighbors = self.orchestrator.neighbors_of(self.village_id)
         
         proposal = {
             "type": "quantum_escalation",
@@ -252,7 +276,9 @@ class VillageSwarmAgent:
             try:
                 # Gather swarm data for quantum analysis
                 swarm_data = self.orchestrator.get_network_status() if self.orchestrator else {}
-                await self.quantum_service.detect_outbreak_pattern(swarm_data)
+                quantum_result = await self.quantum_service.detect_outbreak_pattern(swarm_data)
+                if self.orchestrator:
+                    self.orchestrator.publish_quantum_result(quantum_result, source=self.village_id)
             except Exception:
                 pass
 
@@ -277,6 +303,17 @@ class VillageSwarmAgent:
             "anomaly_detected": self.risk_level in ['high', 'critical']
         }
     
+    def receive_belief_update(self, neighbor_id: str, belief: float):
+        """Accept a belief pushed by the orchestrator's propagation scheduler."""
+        self.neighbor_beliefs[neighbor_id] = belief
+    
+    def receive_alert(self, origin_id: str, alert: Dict):
+        """Record an alert gossiped from a (possibly distant) village."""
+        self.regional_alerts[origin_id] = {
+            **alert,
+            "received_at": datetime.now().isoformat()
+        }
+    
     def vote_on_proposal(self, proposal: Dict) -> Dict:
         """
         Vote on a proposal using simple threshold logic.
@@ -315,18 +352,20 @@ class VillageSwarmAgent:
 # FACTORY FUNCTION
 # ============================================================================
 
-def create_village_agents(orchestrator=None, quantum_service=None) -> Dict[str, VillageSwarmAgent]:
-    """Create all village swarm agents."""
-    villages = [
-        ("v1", "Dharavi", (19.04, 72.86)),
-        ("v2", "Kalyan", (19.24, 73.14)),
-        ("v3", "Thane", (19.22, 72.97)),
-        ("v4", "Navi Mumbai", (19.03, 73.01))
-    ]
+def create_village_agents(orchestrator=None, quantum_service=None,
+                          registry=None) -> Dict[str, VillageSwarmAgent]:
+    """Create swarm agents for every registered village (eagerly)."""
+    from swarm.agents.village_registry import VillageRegistry
+    
+    if registry is None:
+        registry = VillageRegistry.from_config()
     
     agents = {}
-    for vid, vname, location in villages:
-        agents[vid] = VillageSwarmAgent(vid, vname, location, orchestrator, quantum_service)
+    for record in registry:
+        agents[record.village_id] = VillageSwarmAgent(
+            record.village_id, record.village_name, record.location,
+            orchestrator, quantum_service
+        )
     
     return agents
 
@@ -0,0 +1,203 @@
+"""
+Village Registry
+
+Lightweight, config-driven catalogue of every village the swarm knows about.
+Records are plain tuples, so a registry can describe tens of thousands of
+villages while only the villages that actually receive traffic get a
+VillageSwarmAgent (see SwarmOrchestrator).
+
+Villages come from `config/swarm_config.yaml` (`swarm.topology`) and, for
+large deployments, from an optional CSV file named by
+`swarm.registry.villages_file` with the columns:
+
+    village_id,village_name,lat,lon,population,neighbors[,aliases]
+
+where `neighbors` is a ';'-separated list of village IDs and the optional
+`aliases` column lists ';'-separated alternate spellings/transliterations.
+"""
+
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+from pathlib import Path
+import csv
+import os
+import re
+
+import yaml
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / 'config' / 'swarm_config.yaml'
+DEFAULT_EAGER_LIMIT = 64
+DEFAULT_NEIGHBORHOOD = {
+    'mode': 'knn',      # 'knn' or 'radius'
+    'k': 3,             # Neighbours per village in knn mode
+    'radius_km': 25.0,  # Search radius (also caps knn distance)
+}
+
+_SEPARATORS = re.compile(r'[\s_]+')
+
+
+def alias_key(name: str) -> str:
+    """Case-folded lookup key: 'Navi Mumbai', 'navi_mumbai' -> 'navi_mumbai'."""
+    return _SEPARATORS.sub('_', name.strip().casefold())
+
+
+class VillageRecord(NamedTuple):
+    """Static description of a village (no agent state)."""
+    village_id: str
+    village_name: str
+    location: Tuple[float, float]  # (lat, lon)
+    population: int = 0
+    neighbors: Tuple[str, ...] = ()
+    aliases: Tuple[str, ...] = ()  # Alternate spellings / transliterations
+
+
+class VillageRegistry:
+    """
+    Catalogue of villages keyed by ID.
+
+    Holds only static data; agents are created on demand by the orchestrator.
+    """
+
+    def __init__(self, records: List[VillageRecord] = None,
+                 eager_limit: int = DEFAULT_EAGER_LIMIT, neighborhood: Dict = None):
+        self._records: Dict[str, VillageRecord] = {}
+        self.eager_limit = eager_limit
+
+        # How to derive neighbours for villages without an explicit list
+        self.neighborhood = {**DEFAULT_NEIGHBORHOOD, **(neighborhood or {})}
+
+        # Configured neighbour lists, shared with the orchestrator
+        self.topology: Dict[str, List[str]] = {}
+
+        # alias_key(id / name / alias) -> IDs of the villages claiming it, first one wins
+        self._aliases: Dict[str, List[str]] = {}
+        self.unresolved_lookups = 0
+
+        for record in records or []:
+            self.add(record)
+
+    # ========================================================================
+    # LOADING
+    # ========================================================================
+
+    @classmethod
+    def from_config(cls, path: str = None) -> 'VillageRegistry':
+        """
+        Load villages from the swarm config (and its optional CSV file).
+
+        The path defaults to $SWARM_CONFIG or config/swarm_config.yaml.
+        """
+        path = Path(path or os.getenv('SWARM_CONFIG') or DEFAULT_CONFIG_PATH)
+        with open(path, 'r', encoding='utf-8') as f:
+            config = (yaml.safe_load(f) or {}).get('swarm', {})
+
+        registry_config = config.get('registry') or {}
+        registry = cls(
+            eager_limit=registry_config.get('eager_limit', DEFAULT_EAGER_LIMIT),
+            neighborhood=config.get('neighborhood')
+        )
+
+        for vid, entry in (config.get('topology') or {}).items():
+            registry.add(VillageRecord(
+                village_id=str(vid),
+                village_name=entry.get('name', str(vid)),
+                location=tuple(entry.get('location', (0.0, 0.0))),
+                population=int(entry.get('population', 0)),
+                neighbors=tuple(str(n) for n in entry.get('neighbors', [])),
+                aliases=tuple(str(a) for a in entry.get('aliases', []))
+            ))
+
+        villages_file = registry_config.get('villages_file')
+        if villages_file:
+            villages_path = Path(villages_file)
+            if not villages_path.is_absolute():
+                villages_path = path.parent / villages_path
+            registry.load_csv(villages_path)
+
+        return registry
+
+    def load_csv(self, path) -> int:
+        """Stream village records from a CSV file. Returns rows loaded."""
+        count = 0
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                neighbors = row.get('neighbors') or ''
+                aliases = row.get('aliases') or ''
+                self.add(VillageRecord(
+                    village_id=row['village_id'],
+                    village_name=row.get('village_name') or row['village_id'],
+                    location=(float(row['lat']), float(row['lon'])),
+                    population=int(row.get('population') or 0),
+                    neighbors=tuple(n for n in neighbors.split(';') if n),
+                    aliases=tuple(a for a in aliases.split(';') if a)
+                ))
+                count += 1
+        return count
+
+    # ========================================================================
+    # ACCESS
+    # ========================================================================
+
+    def add(self, record: VillageRecord):
+        """Register (or replace) a village."""
+        if record.village_id in self._records:
+            self._drop_aliases(self._records[record.village_id])
+        self._records[record.village_id] = record
+        if record.neighbors:
+            self.topology[record.village_id] = list(record.neighbors)
+        else:
+            self.topology.pop(record.village_id, None)
+
+        # First registration of a spelling wins if two villages share it;
+        # later claimants take over when it is removed
+        for name in (record.village_id, record.village_name, *record.aliases):
+            owners = self._aliases.setdefault(alias_key(name), [])
+            if record.village_id not in owners:
+                owners.append(record.village_id)
+
+    def remove(self, village_id: str) -> Optional[VillageRecord]:
+        """Unregister a village. Returns the removed record, if any."""
+        self.topology.pop(village_id, None)
+        record = self._records.pop(village_id, None)
+        if record is not None:
+            self._drop_aliases(record)
+        return record
+
+    def _drop_aliases(self, record: VillageRecord):
+        for name in (record.village_id, record.village_name, *record.aliases):
+            key = alias_key(name)
+            owners = self._aliases.get(key)
+            if owners and record.village_id in owners:
+                owners.remove(record.village_id)
+                if not owners:
+                    del self._aliases[key]
+
+    def get(self, village_id: str) -> Optional[VillageRecord]:
+        return self._records.get(village_id)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """
+        Resolve an ID, name or configured alias to a village ID in O(1).
+
+        Matching is case-insensitive and treats spaces and underscores alike.
+        Misses are counted in `unresolved_lookups`.
+        """
+        if name in self._records:
+            return name
+        owners = self._aliases.get(alias_key(name))
+        if not owners:
+            self.unresolved_lookups += 1
+            return None
+        return owners[0]
+
+    def first_id(self) -> Optional[str]:
+        """ID of the first registered village (used as a fallback)."""
+        return next(iter(self._records), None)
+
+    def __contains__(self, village_id: str) -> bool:
+        return village_id in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[VillageRecord]:
+        return iter(self._records.values())
@@ -0,0 +1,196 @@
+"""
+Agent Mailbox (Actor Execution Mode)
+
+Each village agent owns one mailbox: an asyncio.Queue drained by a single
+worker task. Reports are exclusive messages and run strictly one at a time,
+so `symptom_history`, `outbreak_belief` and `neighbor_beliefs` are never
+mutated concurrently. Queries and votes are read-only messages; they may be
+answered while an exclusive report is waiting on neighbours, which keeps two
+villages that query each other from deadlocking.
+
+Separate agents have separate workers, so villages progress independently,
+and a bounded depth stops one hot village from growing an unbounded backlog.
+"""
+
+from typing import Any, Awaitable, Callable, Deque, Dict
+from collections import deque
+import asyncio
+
+
+class MailboxFullError(Exception):
+    """Raised when an agent's mailbox is at its depth limit."""
+
+
+class _Envelope:
+    """A queued message: the handler to run and the future awaiting it."""
+
+    __slots__ = ('handler', 'exclusive', 'future', 'enqueued_at')
+
+    def __init__(self, handler: Callable[[], Awaitable[Any]], exclusive: bool,
+                 future: asyncio.Future, enqueued_at: float):
+        self.handler = handler
+        self.exclusive = exclusive
+        self.future = future
+        self.enqueued_at = enqueued_at
+
+
+class AgentMailbox:
+    """
+    Serialized message processing for a single agent.
+
+    Exclusive messages run in arrival order, one at a time. Read-only
+    messages run as soon as the worker sees them, including while an
+    exclusive message is suspended.
+    """
+
+    def __init__(self, agent_id: str, max_depth: int = 100):
+        self.agent_id = agent_id
+        self.max_depth = max_depth
+
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._backlog: Deque[_Envelope] = deque()  # exclusives seen while busy
+        self._worker: asyncio.Task = None
+        self._current: asyncio.Task = None  # exclusive message being run
+        self._getter: asyncio.Task = None   # queue read racing it
+
+        # Metrics
+        self.enqueued = 0
+        self.processed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.expired = 0
+        self.high_water = 0
+        self._total_wait = 0.0
+        self._total_service = 0.0
+
+    @property
+    def depth(self) -> int:
+        """Messages waiting to be processed."""
+        return self._queue.qsize() + len(self._backlog)
+
+    def start(self):
+        """Start the worker task (needs a running event loop)."""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel the worker and the running message, and fail anything still queued."""
+        for task in (self._worker, self._current, self._getter):
+            if task is None:
+                continue
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        # A read that completed just before the cancel holds a dequeued message
+        if self._getter is not None and not self._getter.cancelled():
+            self._getter.result().future.cancel()
+        self._worker = self._current = self._getter = None
+
+        while self._backlog:
+            self._backlog.popleft().future.cancel()
+        while not self._queue.empty():
+            self._queue.get_nowait().future.cancel()
+
+    async def submit(self, handler: Callable[[], Awaitable[Any]], exclusive: bool = True) -> Any:
+        """
+        Queue a message and wait for its result.
+
+        Raises MailboxFullError if the mailbox is at its depth limit.
+        """
+        if self.depth >= self.max_depth:
+            self.rejected += 1
+            raise MailboxFullError(
+                f"Mailbox for agent {self.agent_id} is full ({self.max_depth} messages)"
+            )
+
+        self.start()
+        loop = asyncio.get_running_loop()
+        envelope = _Envelope(handler, exclusive, loop.create_future(), loop.time())
+        self._queue.put_nowait(envelope)
+        self.enqueued += 1
+        self.high_water = max(self.high_water, self.depth)
+
+        return await envelope.future
+
+    def get_metrics(self) -> Dict:
+        """Depth and throughput counters for monitoring."""
+        return {
+            'agent_id': self.agent_id,
+            'depth': self.depth,
+            'max_depth': self.max_depth,
+            'high_water': self.high_water,
+            'enqueued': self.enqueued,
+            'processed': self.processed,
+            'rejected': self.rejected,
+            'failed': self.failed,
+            'expired': self.expired,
+            'avg_wait_ms': round(1000 * self._total_wait / self.processed, 3) if self.processed else 0.0,
+            'avg_service_ms': round(1000 * self._total_service / self.processed, 3) if self.processed else 0.0,
+            'running': self._worker is not None and not self._worker.done()
+        }
+
+    # ========================================================================
+    # WORKER
+    # ========================================================================
+
+    async def _run(self):
+        while True:
+            if self._backlog:
+                envelope = self._backlog.popleft()
+            else:
+                envelope = await self._queue.get()
+
+            if envelope.exclusive:
+                await self._run_exclusive(envelope)
+            else:
+                await self._execute(envelope)
+
+    async def _run_exclusive(self, envelope: _Envelope):
+        """Run an exclusive message, answering read-only messages meanwhile."""
+        task = self._current = asyncio.ensure_future(self._execute(envelope))
+
+        while not task.done():
+            getter = self._getter = asyncio.ensure_future(self._queue.get())
+            await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+            self._getter = None
+
+            if not getter.done():
+                getter.cancel()  # nothing was dequeued
+                continue
+
+            incoming = getter.result()
+            if incoming.exclusive:
+                self._backlog.append(incoming)
+            else:
+                await self._execute(incoming)
+
+        self._current = None
+        await task
+
+    async def _execute(self, envelope: _Envelope):
+        if envelope.future.done():
+            # Caller gave up (timeout/cancellation) before we got to it
+            self.expired += 1
+            return
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self._total_wait += started - envelope.enqueued_at
+
+        try:
+            result = await envelope.handler()
+        except asyncio.CancelledError:
+            envelope.future.cancel()  # Mailbox stopped mid-message
+            raise
+        except Exception as e:
+            self.failed += 1
+            if not envelope.future.done():
+                envelope.future.set_exception(e)
+        else:
+            if not envelope.future.done():
+                envelope.future.set_result(result)
+        finally:
+            self.processed += 1
+            self._total_service += loop.time() - started
@@ -0,0 +1,123 @@
+"""
+Belief Propagation Scheduler
+
+Event-driven replacement for per-report neighbour polling. When a village's
+outbreak belief moves by more than `epsilon` since it was last published,
+the village is marked dirty. Dirty villages are coalesced over a short
+window and then pushed, in one pass, to the active agents that list them
+as a neighbour ("watchers"). Agents only poll neighbours they have never
+heard from.
+"""
+
+from typing import Dict, List, Set
+import asyncio
+
+
+class BeliefPropagator:
+    """Debounced push of belief changes to watching neighbours."""
+
+    def __init__(self, orchestrator, epsilon: float = 0.01, window: float = 0.05):
+        self.orchestrator = orchestrator
+        self.epsilon = epsilon
+        self.window = window
+
+        self._published: Dict[str, float] = {}   # last belief pushed per village
+        self._dirty: Dict[str, float] = {}       # village -> latest belief
+        self._watchers: Dict[str, Set[str]] = {} # village -> agents that listen to it
+        self._flush_task: asyncio.Task = None
+
+        # Metrics
+        self.marked = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.pushes = 0
+
+    # ========================================================================
+    # WATCHERS (reverse neighbour index over active agents)
+    # ========================================================================
+
+    def watch(self, agent_id: str, neighbors: List[str]):
+        """Register an active agent as a listener of its neighbours."""
+        for neighbor_id in neighbors:
+            self._watchers.setdefault(neighbor_id, set()).add(agent_id)
+
+    def unwatch(self, agent_id: str):
+        """Forget an agent, both as a listener and as a source."""
+        self._watchers.pop(agent_id, None)
+        self._published.pop(agent_id, None)
+        self._dirty.pop(agent_id, None)
+        for watchers in self._watchers.values():
+            watchers.discard(agent_id)
+
+    def rebuild_watchers(self, topology: Dict[str, List[str]]):
+        """Recompute listeners after the neighbourhood graph changed."""
+        self._watchers = {}
+        for agent_id, neighbors in topology.items():
+            self.watch(agent_id, neighbors)
+
+    # ========================================================================
+    # SCHEDULING
+    # ========================================================================
+
+    def mark(self, village_id: str, belief: float) -> bool:
+        """
+        Record a belief change. Returns True if a push is now scheduled.
+
+        Changes within `epsilon` of the last published value are ignored.
+        """
+        if village_id in self._dirty:
+            self.coalesced += 1
+        elif abs(belief - self._published.get(village_id, 0.0)) <= self.epsilon:
+            return False
+
+        self._dirty[village_id] = belief
+        self.marked += 1
+
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.get_running_loop().create_task(self._flush_later())
+        return True
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.window)
+        self.flush()
+
+    def flush(self) -> int:
+        """Push all dirty beliefs to their watchers now. Returns pushes made."""
+        dirty, self._dirty = self._dirty, {}
+        self.flushes += 1
+        pushes = 0
+
+        for village_id, belief in dirty.items():
+            if abs(belief - self._published.get(village_id, 0.0)) <= self.epsilon:
+                continue  # drifted back within epsilon during the window
+            self._published[village_id] = belief
+
+            for watcher_id in self._watchers.get(village_id, ()):
+                agent = self.orchestrator.agents.get(watcher_id)
+                if agent is not None:
+                    # Plain dict write, no await: atomic on the event loop
+                    agent.receive_belief_update(village_id, belief)
+                    pushes += 1
+
+        self.pushes += pushes
+        return pushes
+
+    async def stop(self):
+        """Cancel any scheduled flush."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+
+    def get_metrics(self) -> Dict:
+        return {
+            'epsilon': self.epsilon,
+            'window_seconds': self.window,
+            'pending': len(self._dirty),
+            'marked': self.marked,
+            'coalesced': self.coalesced,
+            'flushes': self.flushes,
+            'pushes': self.pushes
+        }
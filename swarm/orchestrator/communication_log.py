@@ -0,0 +1,62 @@
+"""
+Communication Log (Ring Buffer with Sequence Cursors)
+
+Fixed-size log of inter-agent communications for the dashboard. Every entry
+carries a monotonically increasing `seq`, so clients can poll with the last
+sequence they saw and receive only newer entries.
+"""
+
+from typing import Dict, List
+from collections import deque
+from itertools import islice
+
+
+class CommunicationLog:
+    """Ring buffer of log entries; appends and incremental reads are O(new)."""
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = capacity
+        self._entries: deque = deque(maxlen=capacity)
+        self._next_seq = 1
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the newest entry (0 if nothing logged yet)."""
+        return self._next_seq - 1
+
+    @property
+    def oldest_seq(self) -> int:
+        """Sequence number of the oldest retained entry."""
+        return self._next_seq - len(self._entries)
+
+    def append(self, entry: Dict) -> Dict:
+        """Stamp the entry with the next sequence number and store it."""
+        entry['seq'] = self._next_seq
+        self._next_seq += 1
+        self._entries.append(entry)
+        return entry
+
+    def recent(self, limit: int = 50) -> List[Dict]:
+        """The newest `limit` entries, oldest first."""
+        return self._tail(min(max(limit, 0), len(self._entries)))
+
+    def since(self, seq: int, limit: int = None) -> List[Dict]:
+        """
+        Entries newer than `seq`, oldest first.
+
+        With `limit`, returns the oldest `limit` of them so a client can
+        page forward by passing the last `seq` it received.
+        """
+        new_count = min(self.latest_seq - seq, len(self._entries))
+        if new_count <= 0:
+            return []
+        entries = self._tail(new_count)
+        return entries[:limit] if limit is not None else entries
+
+    def _tail(self, count: int) -> List[Dict]:
+        entries = list(islice(reversed(self._entries), count))
+        entries.reverse()
+        return entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,8 +1,14 @@
-from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Callable, Deque, Dict, List, Optional, Union
 from datetime import datetime
-from enum import Enum
-import uuid
+from collections import deque
+from enum import Enum, IntEnum
+import hashlib
+import itertools
+import json
+import math
+import random
+import sys
+import time
 
 class MessageType(Enum):
     """Types of messages agents can exchange"""
@@ -13,17 +19,61 @@ class MessageType(Enum):
     ALERT = "alert"
     STATUS_UPDATE = "status_update"
 
-@dataclass
+class MessageCode(IntEnum):
+    """Compact integer codes stored on messages (one per MessageType)"""
+    QUERY = 1
+    RESPONSE = 2
+    PROPOSAL = 3
+    VOTE = 4
+    ALERT = 5
+    STATUS_UPDATE = 6
+
+_TYPE_BY_CODE = {MessageCode[t.name]: t for t in MessageType}
+
+# Monotonic, process-wide message IDs
+_message_ids = itertools.count(1)
+
+def next_message_id() -> int:
+    return next(_message_ids)
+
+def now_ms() -> int:
+    """Current time as epoch milliseconds"""
+    return int(time.time() * 1000)
+
 class AgentMessage:
-    """Message exchanged between agents"""
+    """
+    Message exchanged between agents
+    
+    Compact: __slots__, integer ID, integer type code and an epoch-ms
+    timestamp. `message_type` and `timestamp` are derived on access.
+    """
+    
+    __slots__ = ('message_id', 'code', 'sender_id', 'receiver_id', 'content', 'ts_ms', 'ttl')
+    
+    def __init__(self, message_id: int, message_type: Union[MessageType, int],
+                 sender_id: str, receiver_id: str, content: Dict,
+                 ts_ms: int = None, ttl: int = 3):
+        self.message_id = message_id
+        self.code = (MessageCode[message_type.name] if isinstance(message_type, MessageType)
+                     else int(message_type))
+        self.sender_id = sys.intern(sender_id)
+        self.receiver_id = sys.intern(receiver_id)  # or "broadcast" / "gossip"
+        self.content = content
+        self.ts_ms = now_ms() if ts_ms is None else ts_ms
+        self.ttl = ttl  # Time-to-live for propagation
+    
+    @property
+    def message_type(self) -> MessageType:
+        return _TYPE_BY_CODE[self.code]
     
-    message_id: str
-    message_type: MessageType
-    sender_id: str
-    receiver_id: str  # or "broadcast"
-    content: Dict
-    timestamp: datetime
-    ttl: int = 3  # Time-to-live for propagation
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.ts_ms / 1000)
+    
+    def copy(self, receiver_id: str, ttl: int) -> 'AgentMessage':
+        """Per-hop copy; the content dict is shared, not duplicated"""
+        return AgentMessage(self.message_id, self.code, self.sender_id, receiver_id,
+                            self.content, self.ts_ms, ttl)
     
     def to_dict(self) -> Dict:
         return {
@@ -36,24 +86,102 @@ class AgentMessage:
             'ttl': self.ttl
         }
 
+class SeenFilter:
+    """
+    Compact set of message IDs an agent has already seen (Bloom filter)
+    
+    False positives (a new message treated as seen) happen at roughly
+    `error_rate`; there are no false negatives. Two generations are kept so
+    the filter can be rotated once `capacity` IDs have been added instead of
+    saturating.
+    """
+    
+    def __init__(self, capacity: int = 1024, error_rate: float = 0.01):
+        self.capacity = capacity
+        # Optimal bit count and hash count for the target error rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._current = bytearray((self.num_bits + 7) // 8)
+        self._previous = bytearray(len(self._current))
+        self._count = 0
+    
+    def _positions(self, key: int):
+        digest = hashlib.blake2b(key.to_bytes(8, 'little'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+    
+    def add(self, key: int):
+        if self._count >= self.capacity:
+            self._previous, self._current = self._current, bytearray(len(self._current))
+            self._count = 0
+        for pos in self._positions(key):
+            self._current[pos >> 3] |= 1 << (pos & 7)
+        self._count += 1
+    
+    def __contains__(self, key: int) -> bool:
+        positions = list(self._positions(key))
+        return (
+            all(self._current[p >> 3] & (1 << (p & 7)) for p in positions) or
+            all(self._previous[p >> 3] & (1 << (p & 7)) for p in positions)
+        )
+
+
 class CommunicationProtocol:
     """
     Protocol for agent-to-agent communication
     Ensures reliable message delivery and consensus
+    
+    Besides direct and broadcast delivery, messages addressed to "gossip"
+    spread hop by hop over the neighbour graph: each holder forwards to a
+    random `fanout` of its neighbours with the TTL decremented, and
+    per-agent SeenFilters drop duplicates. Reaching the network then costs
+    O(n * fanout) transmissions instead of O(n^2) for everyone-broadcasts.
+    
+    Memory is bounded: each agent queue holds at most `queue_capacity`
+    messages ("drop_oldest" evicts, "backpressure" refuses new ones), and
+    history is a ring of `history_capacity` messages whose evictions are
+    optionally appended to `spill_path` as JSON lines.
     """
     
-    def __init__(self):
-        self.message_queue: Dict[str, List[AgentMessage]] = {}
-        self.message_history: List[AgentMessage] = []
+    QUEUE_POLICIES = ('drop_oldest', 'backpressure')
+    
+    def __init__(self, fanout: int = 3, seen_capacity: int = 1024, rng: random.Random = None,
+                 queue_capacity: int = 256, queue_policy: str = 'drop_oldest',
+                 history_capacity: int = 1000, spill_path: str = None):
+        if queue_policy not in self.QUEUE_POLICIES:
+            raise ValueError(f"queue_policy must be one of {self.QUEUE_POLICIES}")
+        
+        self.queue_capacity = queue_capacity
+        self.queue_policy = queue_policy
+        self.message_queue: Dict[str, Deque[AgentMessage]] = {}
+        self.message_history: Deque[AgentMessage] = deque(maxlen=history_capacity)
+        self.spill_path = spill_path
+        self._spill_file = None
+        self.queue_stats = {'dropped': 0, 'rejected': 0, 'spilled': 0}
+        
+        # Gossip state
+        self.fanout = fanout
+        self.seen_capacity = seen_capacity
+        self.seen: Dict[str, SeenFilter] = {}
+        self.rng = rng or random.Random()
+        self.gossip_stats = {'messages': 0, 'transmissions': 0, 'duplicates': 0, 'deliveries': 0,
+                             'inactive': 0}
     
-    def route_message(self, message: AgentMessage, agents: Dict) -> List[str]:
+    def route_message(self, message: AgentMessage, agents: Dict,
+                      neighbors: Callable[[str], List[str]] = None) -> List[str]:
         """
         Route message to appropriate agents
         
+        `neighbors` (agent ID -> neighbour IDs) is required for "gossip".
         Returns list of agent IDs message was sent to
         """
         recipients = []
         
+        if message.receiver_id == "gossip":
+            return self.gossip(message, neighbors)['delivered']
+        
         if message.receiver_id == "broadcast":
             # Send to all agents except sender
             recipients = [aid for aid in agents.keys() if aid != message.sender_id]
@@ -63,24 +191,127 @@ class CommunicationProtocol:
                 recipients = [message.receiver_id]
         
         # Add to each recipient's queue
-        for recipient_id in recipients:
-            if recipient_id not in self.message_queue:
-                self.message_queue[recipient_id] = []
-            self.message_queue[recipient_id].append(message)
+        recipients = [rid for rid in recipients if self._enqueue(rid, message)]
         
         # Store in history
-        self.message_history.append(message)
+        self._record_history(message)
         
         return recipients
     
+    def _enqueue(self, recipient_id: str, message: AgentMessage) -> bool:
+        """Append to a bounded agent queue. False if refused (backpressure)."""
+        queue = self.message_queue.get(recipient_id)
+        if queue is None:
+            maxlen = self.queue_capacity if self.queue_policy == 'drop_oldest' else None
+            queue = deque(maxlen=maxlen)
+            self.message_queue[recipient_id] = queue
+        
+        if len(queue) >= self.queue_capacity:
+            if self.queue_policy == 'backpressure':
+                self.queue_stats['rejected'] += 1
+                return False
+            self.queue_stats['dropped'] += 1  # deque evicts the oldest
+        
+        queue.append(message)
+        return True
+    
+    def _record_history(self, message: AgentMessage):
+        """Append to the history ring, spilling the evicted entry if configured."""
+        history = self.message_history
+        if self.spill_path and history.maxlen and len(history) == history.maxlen:
+            if self._spill_file is None:
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8', buffering=1)
+            self._spill_file.write(json.dumps(history[0].to_dict(), default=str) + "\n")
+            self.queue_stats['spilled'] += 1
+        history.append(message)
+    
+    def close(self):
+        """Close the history spill file, if open."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+    
+    def gossip(self, message: AgentMessage, neighbors: Callable[[str], List[str]],
+               fanout: int = None,
+               deliver: Callable[[str, AgentMessage], bool] = None) -> Dict:
+        """
+        Disseminate a message hop by hop with TTL decrement and random fanout
+        
+        Each first-time recipient gets a copy (receiver_id set, ttl reduced):
+        handed to `deliver` if given, otherwise put in its queue. `deliver`
+        returns False when the recipient has no active agent; such hops still
+        relay the message but are reported as `inactive`, not delivered.
+        Returns delivered and inactive IDs plus transmission/duplicate counts.
+        """
+        fanout = self.fanout if fanout is None else fanout
+        origin = message.sender_id
+        self._seen_filter(origin).add(message.message_id)
+        
+        delivered = []
+        inactive = []
+        transmissions = 0
+        duplicates = 0
+        # (holder, ttl remaining, agent it came from)
+        frontier = deque([(origin, message.ttl, None)])
+        
+        while frontier:
+            holder, ttl, came_from = frontier.popleft()
+            if ttl <= 0:
+                continue
+            
+            candidates = [n for n in neighbors(holder) if n not in (holder, came_from)]
+            targets = self.rng.sample(candidates, min(fanout, len(candidates)))
+            
+            for target in targets:
+                transmissions += 1
+                seen = self._seen_filter(target)
+                if message.message_id in seen:
+                    duplicates += 1
+                    continue
+                
+                copy = message.copy(receiver_id=target, ttl=ttl - 1)
+                if deliver:
+                    (delivered if deliver(target, copy) else inactive).append(target)
+                elif self._enqueue(target, copy):
+                    delivered.append(target)
+                else:
+                    continue  # backpressure: target may still get it via another path
+                seen.add(message.message_id)
+                frontier.append((target, ttl - 1, holder))
+        
+        self._record_history(message)
+        self.gossip_stats['messages'] += 1
+        self.gossip_stats['transmissions'] += transmissions
+        self.gossip_stats['duplicates'] += duplicates
+        self.gossip_stats['deliveries'] += len(delivered)
+        self.gossip_stats['inactive'] += len(inactive)
+        
+        return {
+            'delivered': delivered,
+            'inactive': inactive,
+            'transmissions': transmissions,
+            'duplicates': duplicates
+        }
+    
+    def _seen_filter(self, agent_id: str) -> SeenFilter:
+        seen = self.seen.get(agent_id)
+        if seen is None:
+            seen = SeenFilter(capacity=self.seen_capacity)
+            self.seen[agent_id] = seen
+        return seen
+    
     def get_messages_for_agent(self, agent_id: str) -> List[AgentMessage]:
         """
         Get all pending messages for an agent
         """
-        messages = self.message_queue.get(agent_id, [])
+        queue = self.message_queue.get(agent_id)
+        if not queue:
+            return []
+        
+        messages = list(queue)
         
         # Clear queue
-        self.message_queue[agent_id] = []
+        queue.clear()
         
         return messages
     
@@ -93,12 +324,28 @@ class CommunicationProtocol:
         """Create a query message"""
         
         return AgentMessage(
-            message_id=str(uuid.uuid4()),
+            message_id=next_message_id(),
             message_type=MessageType.QUERY,
             sender_id=sender_id,
             receiver_id=receiver_id,
-            content=query_content,
-            timestamp=datetime.now()
+            content=query_content
+        )
+    
+    def create_alert_message(
+        self,
+        sender_id: str,
+        alert_content: Dict,
+        ttl: int = 3
+    ) -> AgentMessage:
+        """Create an alert / belief summary to gossip through the network"""
+        
+        return AgentMessage(
+            message_id=next_message_id(),
+            message_type=MessageType.ALERT,
+            sender_id=sender_id,
+            receiver_id="gossip",
+            content=alert_content,
+            ttl=ttl
         )
     
     def create_response_message(
@@ -106,18 +353,17 @@ class CommunicationProtocol:
         sender_id: str,
         receiver_id: str,
         response_content: Dict,
-        original_message_id: str
+        original_message_id: int
     ) -> AgentMessage:
         """Create a response message"""
         
         return AgentMessage(
-            message_id=str(uuid.uuid4()),
+            message_id=next_message_id(),
             message_type=MessageType.RESPONSE,
             sender_id=sender_id,
             receiver_id=receiver_id,
             content={
                 'response': response_content,
                 'in_reply_to': original_message_id
-            },
-            timestamp=datetime.now()
+            }
         )
@@ -0,0 +1,110 @@
+"""
+Swarm Event Bus
+
+Fan-out of swarm events (communication log entries, risk-level transitions,
+quantum results) to streaming subscribers such as dashboard SSE
+connections. Publishing never blocks: each subscriber has its own bounded
+buffer. Events published with a coalescing key replace a still-undelivered
+event with the same key: the merged event moves to the tail with the new
+seq and data, keeping the earliest 'from' of a transition. Otherwise a full
+buffer drops its oldest event and counts the drop.
+"""
+
+from typing import Any, Deque, Dict, List, Optional, Set
+from collections import deque
+import asyncio
+import itertools
+
+
+class Subscription:
+    """One subscriber's bounded event buffer."""
+
+    def __init__(self, bus: 'EventBus', capacity: int):
+        self.bus = bus
+        self.capacity = capacity
+        self.dropped = 0
+        self.coalesced = 0
+        self._events: Deque[Dict] = deque()
+        self._pending_keys: Dict[str, Dict] = {}
+        self._ready = asyncio.Event()
+
+    def _offer(self, event: Dict, key: Optional[str]):
+        if key is not None and key in self._pending_keys:
+            # Replace the undelivered event; the merge keeps seq order in the buffer
+            pending = self._pending_keys.pop(key)
+            self._events.remove(pending)
+            self.coalesced += 1
+            data = event['data']
+            if isinstance(data, dict) and isinstance(pending['data'], dict) and 'from' in pending['data']:
+                data = dict(data, **{'from': pending['data']['from']})
+                if data['from'] == data.get('to'):
+                    return  # Transition undone before delivery: nothing to report
+            event = dict(event, data=data)
+
+        if len(self._events) >= self.capacity:
+            evicted = self._events.popleft()
+            self._pending_keys.pop(evicted.get('key'), None)
+            self.dropped += 1
+
+        event = dict(event, key=key)
+        self._events.append(event)
+        if key is not None:
+            self._pending_keys[key] = event
+        self._ready.set()
+
+    async def next_batch(self, timeout: float = None) -> List[Dict]:
+        """Wait for events and return everything buffered ([] on timeout)."""
+        if not self._events:
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        batch = list(self._events)
+        self._events.clear()
+        self._pending_keys.clear()
+        return batch
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """Publish/subscribe hub with per-subscriber buffering."""
+
+    def __init__(self, subscriber_capacity: int = 256):
+        self.subscriber_capacity = subscriber_capacity
+        self._subscribers: Set[Subscription] = set()
+        self._seq = itertools.count(1)
+        self.published = 0
+
+    def subscribe(self, capacity: int = None) -> Subscription:
+        subscription = Subscription(self, capacity or self.subscriber_capacity)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def publish(self, event_type: str, data: Any, key: str = None):
+        """
+        Deliver an event to every subscriber without blocking.
+
+        `key` enables coalescing, e.g. 'risk:v1' keeps only the newest
+        undelivered risk transition for village v1.
+        """
+        self.published += 1
+        if not self._subscribers:
+            return
+        event = {'seq': next(self._seq), 'type': event_type, 'data': data}
+        for subscription in self._subscribers:
+            subscription._offer(event, key)
+
+    def get_metrics(self) -> Dict:
+        return {
+            'subscribers': len(self._subscribers),
+            'published': self.published,
+            'dropped': sum(s.dropped for s in self._subscribers),
+            'coalesced': sum(s.coalesced for s in self._subscribers)
+        }
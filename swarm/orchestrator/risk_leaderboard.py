@@ -0,0 +1,163 @@
+"""
+Risk Leaderboard
+
+Indexed ranking of villages by outbreak belief. Beliefs (0..1) are bucketed
+at 0.001 resolution and bucket counts are kept in a Fenwick tree, so a
+belief change, rank-of-village and threshold-range counts are O(log B)
+(B = 1001 buckets) independent of the number of villages. Top-k walks the
+occupied buckets from the top and only touches the villages it returns.
+Each bucket is kept as a list sorted by (-exact belief, village ID), so
+ordering inside a crowded bucket (e.g. every new agent at 0.0) is a bisect,
+not a sort.
+"""
+
+from typing import Dict, List, Optional, Tuple
+import bisect
+
+BELIEF_RESOLUTION = 1000  # Buckets per unit of belief
+
+
+class RiskLeaderboard:
+    """Villages ordered by outbreak belief, highest first."""
+
+    def __init__(self, resolution: int = BELIEF_RESOLUTION):
+        self.resolution = resolution
+        self._size = resolution + 1                  # buckets 0..resolution
+        self._tree = [0] * (self._size + 1)          # Fenwick tree (1-based)
+        self._buckets: Dict[int, List[Tuple[float, str]]] = {}  # sorted (-belief, id)
+        self._beliefs: Dict[str, float] = {}
+
+    def _bucket(self, belief: float) -> int:
+        return min(max(int(round(belief * self.resolution)), 0), self.resolution)
+
+    # ========================================================================
+    # FENWICK TREE (bucket counts)
+    # ========================================================================
+
+    def _add(self, bucket: int, delta: int):
+        i = bucket + 1
+        while i <= self._size:
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, bucket: int) -> int:
+        """Number of villages in buckets 0..bucket."""
+        i, total = min(bucket, self.resolution) + 1, 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _bucket_of_nth(self, n: int) -> int:
+        """Bucket holding the n-th village in ascending order (1-based)."""
+        pos, step = 0, 1 << self._size.bit_length()
+        while step:
+            nxt = pos + step
+            if nxt <= self._size and self._tree[nxt] < n:
+                pos = nxt
+                n -= self._tree[nxt]
+            step >>= 1
+        return pos  # 1-based index pos + 1 -> bucket pos
+
+    # ========================================================================
+    # UPDATES
+    # ========================================================================
+
+    def update(self, village_id: str, belief: float):
+        """Insert a village or move it to its new belief."""
+        old = self._beliefs.get(village_id)
+        if old == belief:
+            return
+        self._beliefs[village_id] = belief
+        new_bucket = self._bucket(belief)
+
+        if old is not None:
+            old_bucket = self._bucket(old)
+            self._unlink(village_id, old, old_bucket)
+            if old_bucket != new_bucket:
+                self._add(old_bucket, -1)
+                self._add(new_bucket, 1)
+        else:
+            self._add(new_bucket, 1)
+
+        bisect.insort(self._buckets.setdefault(new_bucket, []), (-belief, village_id))
+
+    def remove(self, village_id: str) -> bool:
+        """Drop a village. Returns False if it was not ranked."""
+        belief = self._beliefs.pop(village_id, None)
+        if belief is None:
+            return False
+        bucket = self._bucket(belief)
+        self._unlink(village_id, belief, bucket)
+        self._add(bucket, -1)
+        return True
+
+    def _unlink(self, village_id: str, belief: float, bucket: int):
+        members = self._buckets[bucket]
+        del members[bisect.bisect_left(members, (-belief, village_id))]
+        if not members:
+            del self._buckets[bucket]
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    def top_k(self, k: int) -> List[Tuple[str, float]]:
+        """The k highest-belief villages as (village_id, belief)."""
+        leaders: List[Tuple[str, float]] = []
+        total = len(self._beliefs)
+        while len(leaders) < min(k, total):
+            # Next occupied bucket below what has been collected so far
+            bucket = self._bucket_of_nth(total - len(leaders))
+            for negative_belief, vid in self._buckets[bucket]:
+                leaders.append((vid, -negative_belief))
+                if len(leaders) == k:
+                    break
+        return leaders
+
+    def rank(self, village_id: str) -> Optional[int]:
+        """1-based rank of a village (1 = highest belief), or None."""
+        belief = self._beliefs.get(village_id)
+        if belief is None:
+            return None
+        bucket = self._bucket(belief)
+        above = len(self._beliefs) - self._prefix(bucket)
+        return above + bisect.bisect_left(self._buckets[bucket], (-belief, village_id)) + 1
+
+    def belief_of(self, village_id: str) -> Optional[float]:
+        return self._beliefs.get(village_id)
+
+    def count_in_range(self, min_belief: float = 0.0, max_belief: float = 1.0) -> int:
+        """Number of villages with min_belief <= belief <= max_belief (bucket precision)."""
+        low, high = self._bucket(min_belief), self._bucket(max_belief)
+        if low > high:
+            return 0
+        return self._prefix(high) - (self._prefix(low - 1) if low else 0)
+
+    def in_range(self, min_belief: float = 0.0, max_belief: float = 1.0,
+                 limit: int = None) -> List[Tuple[str, float]]:
+        """Villages with min_belief <= belief <= max_belief, highest first."""
+        found: List[Tuple[str, float]] = []
+        if limit is not None and limit <= 0:
+            return found
+        high = self._bucket(max_belief)
+        low = self._bucket(min_belief)
+        remaining = self._prefix(high)  # villages at or below the top bucket
+        floor = self._prefix(low - 1) if low else 0
+
+        while remaining > floor:
+            bucket = self._bucket_of_nth(remaining)
+            members = self._buckets[bucket]
+            for negative_belief, vid in members:
+                if min_belief <= -negative_belief <= max_belief:
+                    found.append((vid, -negative_belief))
+                    if limit is not None and len(found) >= limit:
+                        return found
+            remaining -= len(members)
+        return found
+
+    def __len__(self) -> int:
+        return len(self._beliefs)
+
+    def __contains__(self, village_id: str) -> bool:
+        return village_id in self._beliefs
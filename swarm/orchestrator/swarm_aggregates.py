@@ -0,0 +1,79 @@
+"""
+Swarm Aggregates
+
+Running totals over all active agents: reports received, villages per risk
+level and the belief sum (hence the mean belief). The orchestrator updates
+them with each agent's before/after state whenever a report changes it, so
+dashboard and workflow reads are O(1) regardless of network size.
+"""
+
+from typing import Dict, NamedTuple
+
+
+class AgentState(NamedTuple):
+    """The parts of an agent's state that feed the aggregates."""
+    belief: float
+    risk_level: str
+    reports: int
+
+
+class SwarmAggregates:
+    """Incrementally maintained swarm-wide totals."""
+
+    def __init__(self, high_belief_threshold: float = 0.6):
+        self.high_belief_threshold = high_belief_threshold
+
+        self.agent_count = 0
+        self.total_reports = 0
+        self.belief_sum = 0.0
+        self.high_belief_count = 0  # Agents with belief >= high_belief_threshold
+        self.risk_histogram: Dict[str, int] = {}
+
+    def add(self, state: AgentState):
+        """Count a newly active agent."""
+        self.agent_count += 1
+        self._apply(state, 1)
+
+    def remove(self, state: AgentState):
+        """Forget an agent that was dropped."""
+        self.agent_count -= 1
+        self._apply(state, -1)
+        if self.agent_count == 0:
+            self.belief_sum = 0.0  # Shed accumulated float error
+
+    def update(self, before: AgentState, after: AgentState):
+        """Replace an agent's contribution after its state changed."""
+        if before != after:
+            self._apply(before, -1)
+            self._apply(after, 1)
+
+    def _apply(self, state: AgentState, sign: int):
+        self.total_reports += sign * state.reports
+        self.belief_sum += sign * state.belief
+        if state.belief >= self.high_belief_threshold:
+            self.high_belief_count += sign
+
+        count = self.risk_histogram.get(state.risk_level, 0) + sign
+        if count:
+            self.risk_histogram[state.risk_level] = count
+        else:
+            self.risk_histogram.pop(state.risk_level, None)
+
+    @property
+    def average_belief(self) -> float:
+        if not self.agent_count:
+            return 0.0
+        return max(self.belief_sum / self.agent_count, 0.0)
+
+    def count_at_risk(self, *levels: str) -> int:
+        """Number of agents currently at any of the given risk levels."""
+        return sum(self.risk_histogram.get(level, 0) for level in levels)
+
+    def snapshot(self) -> Dict:
+        return {
+            'active_agents': self.agent_count,
+            'total_reports': self.total_reports,
+            'average_belief': self.average_belief,
+            'high_belief_agents': self.high_belief_count,
+            'risk_histogram': dict(self.risk_histogram)
+        }
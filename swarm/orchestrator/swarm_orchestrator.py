@@ -9,9 +9,38 @@ Manages village agents and enables swarm intelligence through:
 NO LLM calls - pure rule-based coordination.
 """
 
-from typing import Dict, List
+from typing import Any, Awaitable, Dict, List
 from datetime import datetime
 import asyncio
+import math
+import uuid
+
+from swarm.agents.village_registry import VillageRecord, VillageRegistry
+from swarm.orchestrator.agent_mailbox import AgentMailbox
+from swarm.orchestrator.belief_propagation import BeliefPropagator
+from swarm.orchestrator.communication_log import CommunicationLog
+from swarm.orchestrator.communication_protocol import CommunicationProtocol
+from swarm.orchestrator.event_bus import EventBus
+from swarm.orchestrator.risk_leaderboard import RiskLeaderboard
+from swarm.orchestrator.swarm_aggregates import AgentState, SwarmAggregates
+from swarm.utils.spatial_index import SpatialIndex
+from swarm.workflows.consensus_workflow import ConsensusWorkflow
+
+# ============================================================================
+# Communication Settings
+# ============================================================================
+
+COMMUNICATION_SETTINGS = {
+    'query_timeout': 2.0,   # Seconds to wait for each neighbour to answer
+    'query_quorum': 1.0,    # Fraction of answers needed before returning early
+    'actor_mode': False,    # Route agent work through per-agent mailboxes
+    'mailbox_depth': 100,   # Max queued messages per agent in actor mode
+    'belief_propagation': True,    # Push belief changes instead of re-polling
+    'propagation_epsilon': 0.01,   # Minimum belief change worth pushing
+    'propagation_window': 0.05,    # Seconds to coalesce changes before a push
+    'gossip_fanout': 3,     # Neighbours each holder forwards an alert to
+    'gossip_ttl': 3,        # Hops an alert may travel
+}
 
 
 class SwarmOrchestrator:
@@ -20,74 +49,251 @@ class SwarmOrchestrator:
     Uses simple message passing and voting - NO LLM.
     """
     
-    def __init__(self, quantum_service=None):
+    def __init__(self, quantum_service=None, query_timeout: float = None,
+                 query_quorum: float = None, actor_mode: bool = None,
+                 mailbox_depth: int = None, registry: VillageRegistry = None,
+                 belief_propagation: bool = None):
         self.quantum_service = quantum_service
+        
+        # All known villages (static data); agents exist only for active ones
+        self.registry = registry if registry is not None else VillageRegistry.from_config()
         self.agents: Dict[str, any] = {}
         
-        # Communication log for frontend visibility
-        self.communication_log: List[Dict] = []
+        # Fan-out behaviour for neighbour queries and vote collection
+        self.query_timeout = (query_timeout if query_timeout is not None
+                              else COMMUNICATION_SETTINGS['query_timeout'])
+        self.query_quorum = (query_quorum if query_quorum is not None
+                             else COMMUNICATION_SETTINGS['query_quorum'])
         
-        # Network topology (which villages are neighbors)
-        self.network_topology: Dict[str, List[str]] = {
-            'v1': ['v2', 'v3'],        # Dharavi ↔ Kalyan, Thane
-            'v2': ['v1', 'v3'],        # Kalyan ↔ Dharavi, Thane
-            'v3': ['v1', 'v2', 'v4'],  # Thane ↔ all
-            'v4': ['v3']               # Navi Mumbai ↔ Thane
-        }
+        # Actor mode: one mailbox + worker per agent, created on first use
+        self.actor_mode = (actor_mode if actor_mode is not None
+                           else COMMUNICATION_SETTINGS['actor_mode'])
+        self.mailbox_depth = (mailbox_depth if mailbox_depth is not None
+                              else COMMUNICATION_SETTINGS['mailbox_depth'])
+        self.mailboxes: Dict[str, AgentMailbox] = {}
+        
+        # Push-based neighbour belief updates (None = agents poll every time)
+        if belief_propagation is None:
+            belief_propagation = COMMUNICATION_SETTINGS['belief_propagation']
+        self.propagator = BeliefPropagator(
+            self,
+            epsilon=COMMUNICATION_SETTINGS['propagation_epsilon'],
+            window=COMMUNICATION_SETTINGS['propagation_window']
+        ) if belief_propagation else None
+        
+        # Multi-hop alert dissemination
+        self.protocol = CommunicationProtocol(fanout=COMMUNICATION_SETTINGS['gossip_fanout'])
+        
+        # Communication log for frontend visibility (ring buffer with cursors)
+        self.communication_log = CommunicationLog(capacity=100)
+        
+        # Live event stream for dashboards (communications, risk, quantum)
+        self.events = EventBus()
+        
+        # Vote tallying for escalation proposals (stale ones expired by a reaper)
+        self.consensus = ConsensusWorkflow()
+        
+        # State version, bumped when agent or registry state changes; read endpoints cache per version
+        self.state_version = 0
+        self._instance_tag = uuid.uuid4().hex[:8]
+        self._status_snapshot = None
+        self._status_version = -1
+        
+        # Running totals (reports, risk histogram, belief sum) for O(1) reads
+        self.aggregates = SwarmAggregates()
+        
+        # Villages ranked by outbreak belief (top-k, rank and range queries)
+        self.leaderboard = RiskLeaderboard()
+        
+        # Network topology (which villages are neighbors), from the registry.
+        # Villages without configured neighbours get them from the spatial index.
+        self.network_topology: Dict[str, List[str]] = self.registry.topology
+        self.spatial_index = SpatialIndex(
+            cell_km=max(float(self.registry.neighborhood['radius_km']), 1.0)
+        )
+        for record in self.registry:
+            self.spatial_index.insert(record.village_id, record.location)
+        self._derived_neighbors: Dict[str, List[str]] = {}
         
         self._initialize_swarm()
     
     def _initialize_swarm(self):
-        """Create village agents."""
-        from swarm.agents.village_adk_agent import create_village_agents
+        """
+        Create village agents.
         
-        self.agents = create_village_agents(
-            orchestrator=self,
-            quantum_service=self.quantum_service
+        Small registries are materialized up front; larger ones create each
+        agent on its first report or query.
+        """
+        if len(self.registry) <= self.registry.eager_limit:
+            for record in self.registry:
+                self._materialize_agent(record.village_id)
+        
+        print(f"✓ Swarm initialized: {len(self.agents)} rule-based agents "
+              f"({len(self.registry)} villages registered)")
+    
+    def _materialize_agent(self, village_id: str):
+        """Return the agent for a registered village, creating it if needed."""
+        agent = self.agents.get(village_id)
+        if agent is not None:
+            return agent
+        
+        record = self.registry.get(village_id)
+        if record is None:
+            return None
+        
+        from swarm.agents.village_adk_agent import VillageSwarmAgent
+        
+        agent = VillageSwarmAgent(
+            record.village_id, record.village_name, record.location,
+            orchestrator=self, quantum_service=self.quantum_service
         )
+        self.agents[village_id] = agent
+        self.aggregates.add(self._agent_state(agent))
+        self.leaderboard.update(village_id, agent.outbreak_belief)
+        if self.propagator:
+            self.propagator.watch(village_id, self.neighbors_of(village_id))
+        self._bump_version()
+        return agent
+    
+    @staticmethod
+    def _agent_state(agent) -> AgentState:
+        return AgentState(agent.outbreak_belief, agent.risk_level, len(agent.symptom_history))
+    
+    def _bump_version(self):
+        """Mark swarm state as changed (invalidates cached snapshots)."""
+        self.state_version += 1
+    
+    @property
+    def etag(self) -> str:
+        """Weak ETag for the current state version."""
+        return f'W/"{self._instance_tag}-{self.state_version}"'
+    
+    def _on_agent_updated(self, agent, before: AgentState):
+        """Hook run after an agent's state changed (inside its mailbox)."""
+        self.aggregates.update(before, self._agent_state(agent))
+        self.leaderboard.update(agent.village_id, agent.outbreak_belief)
+        self._bump_version()
+        if self.propagator:
+            self.propagator.mark(agent.village_id, agent.outbreak_belief)
+    
+    # ========================================================================
+    # NEIGHBOURHOODS (configured or derived from coordinates)
+    # ========================================================================
+    
+    def neighbors_of(self, village_id: str) -> List[str]:
+        """Configured neighbours, else the nearest villages by location."""
+        configured = self.network_topology.get(village_id)
+        if configured is not None:
+            return configured
         
-        print(f"✓ Swarm initialized: {len(self.agents)} rule-based agents")
+        derived = self._derived_neighbors.get(village_id)
+        if derived is None:
+            location = self.spatial_index.location_of(village_id)
+            if location is None:
+                return []
+            settings = self.registry.neighborhood
+            if settings['mode'] == 'radius':
+                found = self.spatial_index.within_radius(
+                    location, settings['radius_km'], exclude=village_id
+                )
+            else:
+                found = self.spatial_index.nearest(
+                    location, settings['k'], exclude=village_id,
+                    max_radius_km=settings['radius_km']
+                )
+            derived = [vid for vid, _ in found]
+            self._derived_neighbors[village_id] = derived
+        
+        return derived
+    
+    def get_topology(self) -> Dict[str, List[str]]:
+        """Neighbour lists of all active agents."""
+        return {aid: self.neighbors_of(aid) for aid in self.agents}
+    
+    def add_village(self, record: VillageRecord):
+        """Register a village at runtime (agent is created on first use)."""
+        self.registry.add(record)
+        self.spatial_index.insert(record.village_id, record.location)
+        self._derived_neighbors.clear()
+        if self.propagator:
+            self.propagator.rebuild_watchers(self.get_topology())
+        self._bump_version()
+    
+    async def remove_village(self, village_id: str) -> bool:
+        """Unregister a village, drop its agent and stop its mailbox."""
+        if self.registry.remove(village_id) is None:
+            return False
+        self.spatial_index.remove(village_id)
+        self._derived_neighbors.clear()
+        agent = self.agents.pop(village_id, None)
+        if agent is not None:
+            self.aggregates.remove(self._agent_state(agent))
+        self.leaderboard.remove(village_id)
+        if self.propagator:
+            self.propagator.unwatch(village_id)
+            self.propagator.rebuild_watchers(self.get_topology())
+        mailbox = self.mailboxes.pop(village_id, None)
+        self._bump_version()
+        if mailbox:
+            await mailbox.stop()
+        return True
+    
+    def villages_in_bbox(self, south: float, west: float, north: float, east: float) -> List[Dict]:
+        """Villages inside a map bounding box, with live state for active agents."""
+        villages = []
+        for vid in self.spatial_index.in_bbox(south, west, north, east):
+            record = self.registry.get(vid)
+            agent = self.agents.get(vid)
+            villages.append({
+                'village_id': vid,
+                'name': record.village_name,
+                'location': record.location,
+                'outbreak_belief': round(agent.outbreak_belief, 3) if agent else 0.0,
+                'risk_level': agent.risk_level if agent else 'normal',
+                'active': agent is not None
+            })
+        return villages
     
     def _log_communication(self, from_agent: str, to_agent: str, msg_type: str, content: Dict):
         """Log inter-agent communication for frontend visibility."""
-        self.communication_log.append({
+        entry = self.communication_log.append({
             "timestamp": datetime.now().isoformat(),
             "from": from_agent,
             "to": to_agent,
             "type": msg_type,
             "content": content
         })
-        # Keep only last 100 messages
-        if len(self.communication_log) > 100:
-            self.communication_log = self.communication_log[-100:]
+        # Log traffic is not swarm state: it has its own seq cursor, no version bump
+        self.events.publish("communication", entry)
+    
+    def publish_quantum_result(self, quantum_result: Dict, source: str):
+        """Stream a quantum analysis result to dashboard subscribers."""
+        self.events.publish(
+            "quantum_result",
+            {"source": source, "result": quantum_result},
+            key="quantum"
+        )
 
     def _resolve_village_id(self, village_id: str) -> str:
         """Resolve village name to ID (accepts both 'Dharavi' and 'v1')."""
         if village_id in self.agents:
             return village_id
         
-        # Match by name (case-insensitive)
-        village_lower = village_id.lower().replace(' ', '_')
-        for aid, agent in self.agents.items():
-            if agent.village_name.lower().replace(' ', '_') == village_lower:
-                return aid
-            if agent.village_name.lower() == village_id.lower():
-                return aid
-        
-        return None
+        # ID, name or alias (case-insensitive) via the registry index
+        return self.registry.resolve(village_id)
     
     async def process_symptom_report(self, village_id: str, symptoms: List[str], metadata: Dict) -> Dict:
         """Process symptom report through the appropriate agent."""
         resolved_id = self._resolve_village_id(village_id)
         
         if not resolved_id:
-            # Default to first agent
-            resolved_id = list(self.agents.keys())[0] if self.agents else None
+            # Default to first village
+            resolved_id = self.registry.first_id()
             if not resolved_id:
                 raise ValueError("No agents available")
             print(f"⚠️ Village '{village_id}' not found, using: {resolved_id}")
         
-        agent = self.agents[resolved_id]
+        agent = self._materialize_agent(resolved_id)
         
         # Log the incoming report
         self._log_communication(
@@ -97,15 +303,45 @@ class SwarmOrchestrator:
         )
         
         # Process through rule-based agent (NO LLM)
-        result = await agent.process_symptom_report(symptoms, metadata)
+        async def handle_report():
+            # Risk before/after are read inside the mailbox, so each report
+            # sees only the transition it caused (not one queued ahead of it)
+            before = self._agent_state(agent)
+            report_result = await agent.process_symptom_report(symptoms, metadata)
+            self._on_agent_updated(agent, before)
+            if agent.risk_level != before.risk_level:
+                self.events.publish(
+                    "risk_transition",
+                    {
+                        "village_id": resolved_id,
+                        "village": agent.village_name,
+                        "from": before.risk_level,
+                        "to": agent.risk_level,
+                        "belief": round(agent.outbreak_belief, 3)
+                    },
+                    key=f"risk:{resolved_id}"
+                )
+            return report_result, before.risk_level, agent.risk_level
+        
+        result, risk_before, risk_after = await self._dispatch(resolved_id, handle_report)
+        
+        # Alert the wider region (multi-hop) when a village turns high-risk
+        if risk_after in ('high', 'critical') and risk_after != risk_before:
+            self._gossip_alert(agent)
         
         # Log any neighbor queries that happened
         actions = result.get('actions_taken', [])
         if 'queried_neighbors' in actions:
-            neighbors = self.network_topology.get(resolved_id, [])
-            for n_id in neighbors:
+            unresponsive = result.get('unresponsive_neighbors', {})
+            for n_id in result.get('neighbors_queried', []):
                 n_agent = self.agents.get(n_id)
-                if n_agent:
+                if n_agent and n_id in unresponsive:
+                    self._log_communication(
+                        agent.village_name, n_agent.village_name,
+                        "status_timeout",
+                        {"query": "outbreak_status", "reason": unresponsive[n_id]}
+                    )
+                elif n_agent:
                     self._log_communication(
                         agent.village_name, n_agent.village_name,
                         "status_query",
@@ -138,44 +374,237 @@ class SwarmOrchestrator:
             'autonomous_actions_taken': actions
         }
 
+    def _gossip_alert(self, agent) -> Dict:
+        """Spread a belief summary from `agent` over the neighbour graph."""
+        message = self.protocol.create_alert_message(
+            agent.village_id,
+            {
+                "village": agent.village_name,
+                "belief": round(agent.outbreak_belief, 3),
+                "risk": agent.risk_level
+            },
+            ttl=COMMUNICATION_SETTINGS['gossip_ttl']
+        )
+        
+        def deliver(agent_id, copy) -> bool:
+            recipient = self.agents.get(agent_id)
+            if recipient is None:
+                return False  # No active agent to hand it to
+            recipient.receive_alert(copy.sender_id, copy.content)
+            return True
+        
+        outcome = self.protocol.gossip(message, self.neighbors_of, deliver=deliver)
+        
+        self._log_communication(
+            agent.village_name, "GOSSIP",
+            "gossip_alert",
+            {
+                "risk": agent.risk_level,
+                "reached": len(outcome['delivered']),
+                "transmissions": outcome['transmissions']
+            }
+        )
+        return outcome
+    
     async def query_agent(self, agent_id: str, query_type: str, context: Dict) -> Dict:
         """Query a specific agent."""
         resolved_id = self._resolve_village_id(agent_id)
-        if not resolved_id:
+        agent = self._materialize_agent(resolved_id) if resolved_id else None
+        if not agent:
             return {"error": f"Agent {agent_id} not found"}
         
-        agent = self.agents[resolved_id]
-        return await agent.receive_query(query_type, context)
+        return await self._dispatch(
+            resolved_id, lambda: agent.receive_query(query_type, context), exclusive=False
+        )
     
-    async def collect_votes(self, proposal: Dict, voters: List[str]) -> Dict:
-        """Collect votes from agents using simple threshold logic."""
-        votes = {}
+    async def query_agents(self, agent_ids: List[str], query_type: str, context: Dict,
+                           timeout: float = None, quorum: float = None) -> Dict:
+        """
+        Query several agents concurrently.
         
+        Returns {'responses', 'timed_out', 'failed', 'skipped'} so callers can
+        report slow neighbours instead of silently dropping them.
+        """
+        calls = {
+            agent_id: self.query_agent(agent_id, query_type, context)
+            for agent_id in agent_ids
+        }
+        return await self._fan_out(calls, timeout, quorum)
+    
+    async def collect_votes(self, proposal: Dict, voters: List[str],
+                            timeout: float = None, quorum: float = None) -> Dict:
+        """Collect votes from agents concurrently using simple threshold logic."""
+        voter_agents = {}
         for voter_id in voters:
             resolved_id = self._resolve_village_id(voter_id)
-            if resolved_id and resolved_id in self.agents:
-                agent = self.agents[resolved_id]
-                vote_result = agent.vote_on_proposal(proposal)
-                votes[voter_id] = vote_result
-                
-                # Log the vote
-                self._log_communication(
-                    agent.village_name, proposal.get('proposer', 'unknown'),
-                    "vote",
-                    vote_result
-                )
+            agent = self._materialize_agent(resolved_id) if resolved_id else None
+            if agent:
+                voter_agents[voter_id] = agent
+        
+        # Votes are tallied as they arrive; voters that time out leave the
+        # proposal to the consensus reaper, which closes it at the deadline
+        proposal_id = await self.consensus.initiate_consensus(
+            proposal.get('proposer', 'unknown'), proposal, list(voter_agents),
+            timeout=timeout if timeout is not None else self.query_timeout
+        )
+        
+        async def vote_and_tally(voter_id, agent):
+            vote_result = await self._request_vote(agent, proposal)
+            self.consensus.cast_vote(
+                proposal_id, voter_id, vote_result['vote'], vote_result.get('confidence', 0.0)
+            )
+            return vote_result
+        
+        outcome = await self._fan_out(
+            {vid: vote_and_tally(vid, agent) for vid, agent in voter_agents.items()},
+            timeout, quorum
+        )
+        votes = outcome['responses']
+        
+        for voter_id, vote_result in votes.items():
+            agent = voter_agents[voter_id]
+            # Log the vote
+            self._log_communication(
+                agent.village_name, proposal.get('proposer', 'unknown'),
+                "vote",
+                vote_result
+            )
+        
+        for voter_id in outcome['timed_out']:
+            self._log_communication(
+                voter_agents[voter_id].village_name, proposal.get('proposer', 'unknown'),
+                "vote_timeout",
+                {"timeout": timeout if timeout is not None else self.query_timeout}
+            )
         
         return votes
     
-    def get_communication_log(self, limit: int = 50) -> List[Dict]:
-        """Get recent communication log for frontend."""
-        return self.communication_log[-limit:]
+    async def _request_vote(self, agent, proposal: Dict) -> Dict:
+        """Ask a single agent for its vote."""
+        async def vote():
+            return agent.vote_on_proposal(proposal)
+        
+        return await self._dispatch(agent.village_id, vote, exclusive=False)
+    
+    # ========================================================================
+    # ACTOR MODE (per-agent mailboxes)
+    # ========================================================================
+    
+    async def _dispatch(self, agent_id: str, handler, exclusive: bool = True):
+        """
+        Run agent work directly, or through the agent's mailbox in actor mode.
+        
+        Exclusive work (reports) is serialized per agent; read-only work
+        (queries, votes) may interleave with a report waiting on neighbours.
+        Raises MailboxFullError when the agent's mailbox is at its limit.
+        """
+        if not self.actor_mode:
+            return await handler()
+        
+        mailbox = self.mailboxes.get(agent_id)
+        if mailbox is None:
+            mailbox = AgentMailbox(agent_id, max_depth=self.mailbox_depth)
+            self.mailboxes[agent_id] = mailbox
+        
+        return await mailbox.submit(handler, exclusive=exclusive)
+    
+    def get_mailbox_metrics(self) -> Dict:
+        """Per-agent mailbox depth and throughput metrics."""
+        return {
+            'actor_mode': self.actor_mode,
+            'mailbox_depth_limit': self.mailbox_depth,
+            'mailboxes': {aid: mb.get_metrics() for aid, mb in self.mailboxes.items()}
+        }
+    
+    def start(self):
+        """Start background tasks (needs a running event loop)."""
+        self.consensus.start_reaper()
+    
+    async def shutdown(self):
+        """Stop all mailbox workers, pending belief pushes and the consensus reaper; close the history spill file."""
+        await self.consensus.stop()
+        if self.propagator:
+            await self.propagator.stop()
+        for mailbox in self.mailboxes.values():
+            await mailbox.stop()
+        self.protocol.close()
+    
+    async def _fan_out(self, calls: Dict[str, Awaitable], timeout: float = None,
+                       quorum: float = None) -> Dict[str, Any]:
+        """
+        Await keyed calls concurrently with a shared per-call deadline.
+        
+        Returns as soon as `quorum` (a fraction of the calls) has answered or
+        the deadline passes; anything still running is cancelled.
+        """
+        timeout = self.query_timeout if timeout is None else timeout
+        quorum = self.query_quorum if quorum is None else quorum
+        
+        outcome = {'responses': {}, 'timed_out': [], 'failed': {}, 'skipped': []}
+        if not calls:
+            return outcome
+        
+        tasks = {asyncio.ensure_future(coro): key for key, coro in calls.items()}
+        needed = max(1, math.ceil(len(tasks) * quorum))
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        pending = set(tasks)
+        
+        while pending and len(outcome['responses']) < needed:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(
+                pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                key = tasks[task]
+                if task.cancelled():
+                    # e.g. the neighbour's mailbox was stopped mid-query
+                    outcome['failed'][key] = 'cancelled'
+                elif task.exception() is not None:
+                    outcome['failed'][key] = str(task.exception())
+                else:
+                    outcome['responses'][key] = task.result()
+        
+        quorum_reached = len(outcome['responses']) >= needed
+        for task in pending:
+            task.cancel()
+            if quorum_reached:
+                outcome['skipped'].append(tasks[task])
+            else:
+                outcome['timed_out'].append(tasks[task])
+        
+        return outcome
+    
+    def get_communication_log(self, limit: int = 50, since: int = None) -> List[Dict]:
+        """
+        Get recent communication log for frontend.
+        
+        With `since`, only entries with a higher `seq` are returned.
+        """
+        if since is not None:
+            return self.communication_log.since(since, limit)
+        return self.communication_log.recent(limit)
     
     def get_network_status(self) -> Dict:
-        """Get status of entire swarm network."""
+        """
+        Get status of entire swarm network.
+        
+        Served from a snapshot cached per state version, so repeated reads
+        are O(1) while nothing changes. Treat the result as read-only.
+        """
+        if self._status_version != self.state_version:
+            self._status_snapshot = self._build_network_status()
+            self._status_version = self.state_version
+        return self._status_snapshot
+    
+    def _build_network_status(self) -> Dict:
         return {
+            'version': self.state_version,
             'total_agents': len(self.agents),
-            'network_topology': self.network_topology,
+            'registered_villages': len(self.registry),
+            'network_topology': self.get_topology(),
             'agents': {
                 aid: {
                     'name': agent.village_name,
@@ -183,28 +612,88 @@ class SwarmOrchestrator:
                     'outbreak_belief': round(agent.outbreak_belief, 3),
                     'risk_level': agent.risk_level,
                     'symptom_count': len(agent.symptom_history),
-                    'neighbors': self.network_topology.get(aid, [])
+                    'neighbors': self.neighbors_of(aid)
                 }
                 for aid, agent in self.agents.items()
+            }
+        }
+    
+    def get_metrics(self) -> Dict:
+        """Registry and lookup counters."""
+        return {
+            'registered_villages': len(self.registry),
+            'active_agents': len(self.agents),
+            'unresolved_lookups': self.registry.unresolved_lookups,
+            'belief_propagation': self.propagator.get_metrics() if self.propagator else None,
+            'gossip': dict(self.protocol.gossip_stats),
+            'message_queues': dict(self.protocol.queue_stats),
+            'aggregates': self.aggregates.snapshot(),
+            'consensus': {
+                'active_proposals': len(self.consensus.active_proposals),
+                'closed_proposals': len(self.consensus.closed_proposals)
             },
-            'recent_communications': len(self.communication_log)
+            'event_stream': self.events.get_metrics()
         }
     
+    # ========================================================================
+    # RISK LEADERBOARD
+    # ========================================================================
+    
+    def _leaderboard_entry(self, village_id: str, belief: float, rank: int = None) -> Dict:
+        agent = self.agents[village_id]
+        entry = {
+            'village_id': village_id,
+            'village': agent.village_name,
+            'outbreak_belief': round(belief, 3),
+            'risk_level': agent.risk_level
+        }
+        if rank is not None:
+            entry['rank'] = rank
+        return entry
+    
+    def get_top_risk(self, k: int = 10) -> List[Dict]:
+        """The k highest-belief villages, highest first."""
+        return [
+            self._leaderboard_entry(vid, belief, rank)
+            for rank, (vid, belief) in enumerate(self.leaderboard.top_k(k), start=1)
+        ]
+    
+    def get_risk_rank(self, village_id: str) -> Dict:
+        """Rank of one village among all active agents (1 = highest belief)."""
+        resolved_id = self._resolve_village_id(village_id)
+        rank = self.leaderboard.rank(resolved_id) if resolved_id else None
+        if rank is None:
+            return None
+        entry = self._leaderboard_entry(resolved_id, self.leaderboard.belief_of(resolved_id), rank)
+        entry['ranked_villages'] = len(self.leaderboard)
+        return entry
+    
+    def get_villages_by_belief(self, min_belief: float = 0.0, max_belief: float = 1.0,
+                               limit: int = 100) -> List[Dict]:
+        """Villages whose belief lies in [min_belief, max_belief], highest first."""
+        return [
+            self._leaderboard_entry(vid, belief)
+            for vid, belief in self.leaderboard.in_range(min_belief, max_belief, limit)
+        ]
+    
     def get_agent(self, village_id: str):
         """Get specific agent."""
         resolved_id = self._resolve_village_id(village_id)
-        return self.agents.get(resolved_id) if resolved_id else None
+        return self._materialize_agent(resolved_id) if resolved_id else None
 
-    async def trigger_outbreak_detection_workflow(self, initiator_id: str) -> Dict:
+    async def trigger_outbreak_detection_workflow(self, initiator_id: str, top_k: int = 10) -> Dict:
         """
         Trigger outbreak detection across all agents.
         Uses collective voting - NO LLM.
+        
+        Reads the running aggregates and the `top_k` highest-belief villages
+        from the leaderboard, so the cost does not grow with the swarm size.
         """
         resolved_id = self._resolve_village_id(initiator_id)
-        if not resolved_id:
+        initiator = self._materialize_agent(resolved_id) if resolved_id else None
+        if not initiator:
             return {"error": "Initiator not found"}
         
-        initiator = self.agents[resolved_id]
         
         # Log workflow start
         self._log_communication(
@@ -213,28 +702,33 @@ class SwarmOrchestrator:
             {"workflow": "outbreak_detection"}
         )
         
-        # Gather beliefs from all agents
+        # Highest-belief villages (the rest only contribute via the aggregates)
         beliefs = {}
-        for aid, agent in self.agents.items():
+        for aid, belief in self.leaderboard.top_k(top_k):
+            agent = self.agents[aid]
             beliefs[aid] = {
                 "village": agent.village_name,
-                "belief": agent.outbreak_belief,
+                "belief": belief,
                 "risk_level": agent.risk_level,
                 "symptom_count": len(agent.symptom_history)
             }
-            
-            # Log belief sharing
-            self._log_communication(
-                agent.village_name, "ORCHESTRATOR",
-                "belief_share",
-                {"belief": round(agent.outbreak_belief, 3), "risk": agent.risk_level}
-            )
         
-        # Calculate collective belief (simple average)
-        avg_belief = sum(b["belief"] for b in beliefs.values()) / len(beliefs)
+        # Collective belief (simple average) and high-belief count, from running totals
+        avg_belief = self.aggregates.average_belief
+        
+        # Log belief sharing (one summary entry, not one per agent)
+        self._log_communication(
+            "ALL_AGENTS", "ORCHESTRATOR",
+            "belief_share",
+            {
+                "agents": self.aggregates.agent_count,
+                "avg_belief": round(avg_belief, 3),
+                "risk_histogram": dict(self.aggregates.risk_histogram)
+            }
+        )
         
         # Determine if quantum escalation needed
-        high_risk_count = sum(1 for b in beliefs.values() if b["belief"] >= 0.6)
+        high_risk_count = self.aggregates.high_belief_count
         escalate = high_risk_count >= 2 or avg_belief >= 0.7
         
         result = {
@@ -264,6 +758,7 @@ class SwarmOrchestrator:
                 self.get_network_status()
             )
             result["quantum_analysis"] = quantum_result
+            self.publish_quantum_result(quantum_result, source="outbreak_workflow")
             
             self._log_communication(
                 "QUANTUM_SERVICE", "ALL_AGENTS",
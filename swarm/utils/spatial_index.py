@@ -0,0 +1,177 @@
+"""
+Spatial Index for Village Locations
+
+Uniform lat/lon grid (geohash-style bucketing) over village coordinates.
+Insertion and removal are O(1); radius, k-nearest and bounding-box queries
+only look at the grid cells that can contain a match, so neighbourhood
+lookups stay cheap at district scale.
+"""
+
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Great-circle distance between two (lat, lon) points in km."""
+    lat1, lon1 = math.radians(a[0]), math.radians(a[1])
+    lat2, lon2 = math.radians(b[0]), math.radians(b[1])
+    h = (math.sin((lat2 - lat1) / 2) ** 2 +
+         math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(min(h, 1.0)))
+
+
+class SpatialIndex:
+    """
+    Grid index mapping cell -> village IDs.
+
+    `cell_km` is the approximate cell edge; pick it close to the typical
+    neighbourhood radius.
+    """
+
+    def __init__(self, cell_km: float = 10.0):
+        self.cell_deg = cell_km / KM_PER_DEGREE
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._points: Dict[str, Tuple[float, float]] = {}
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return (math.floor(lat / self.cell_deg), math.floor(lon / self.cell_deg))
+
+    # ========================================================================
+    # UPDATES
+    # ========================================================================
+
+    def insert(self, village_id: str, location: Tuple[float, float]):
+        """Add or move a village."""
+        if village_id in self._points:
+            self.remove(village_id)
+        point = (float(location[0]), float(location[1]))
+        self._points[village_id] = point
+        self._cells.setdefault(self._cell(*point), set()).add(village_id)
+
+    def remove(self, village_id: str) -> bool:
+        """Remove a village. Returns False if it was not indexed."""
+        point = self._points.pop(village_id, None)
+        if point is None:
+            return False
+        cell = self._cell(*point)
+        members = self._cells.get(cell)
+        if members is not None:
+            members.discard(village_id)
+            if not members:
+                del self._cells[cell]
+        return True
+
+    def location_of(self, village_id: str) -> Optional[Tuple[float, float]]:
+        return self._points.get(village_id)
+
+    def __contains__(self, village_id: str) -> bool:
+        return village_id in self._points
+
+    def __len__(self) -> int:
+        return len(self._points)
+
+    # ========================================================================
+    # QUERIES
+    # ========================================================================
+
+    def _ids_in_cells(self, lat_range: Tuple[int, int], lon_range: Tuple[int, int]) -> Iterator[str]:
+        for i in range(lat_range[0], lat_range[1] + 1):
+            for j in range(lon_range[0], lon_range[1] + 1):
+                yield from self._cells.get((i, j), ())
+
+    def within_radius(self, location: Tuple[float, float], radius_km: float,
+                      exclude: str = None) -> List[Tuple[str, float]]:
+        """Villages within `radius_km`, as (id, distance_km) sorted by distance."""
+        lat, lon = location
+        dlat = radius_km / KM_PER_DEGREE
+        dlon = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6))
+        south, west = self._cell(lat - dlat, lon - dlon)
+        north, east = self._cell(lat + dlat, lon + dlon)
+
+        found = []
+        for vid in self._ids_in_cells((south, north), (west, east)):
+            if vid == exclude:
+                continue
+            distance = haversine_km(location, self._points[vid])
+            if distance <= radius_km:
+                found.append((vid, distance))
+        found.sort(key=lambda item: item[1])
+        return found
+
+    def nearest(self, location: Tuple[float, float], k: int, exclude: str = None,
+                max_radius_km: float = None) -> List[Tuple[str, float]]:
+        """
+        The k nearest villages, as (id, distance_km) sorted by distance.
+
+        Searches outward ring by ring and stops once no unvisited cell can
+        hold a closer village.
+        """
+        if k <= 0 or not self._points:
+            return []
+
+        lat, lon = location
+        ci, cj = self._cell(lat, lon)
+        # Shortest edge of a cell near this latitude, in km
+        cell_km = self.cell_deg * KM_PER_DEGREE * max(math.cos(math.radians(lat)), 1e-6)
+        total = len(self._points) - (1 if exclude in self._points else 0)
+
+        best: List[Tuple[float, str]] = []  # max-heap via negated distance
+        seen = 0
+        ring = 0
+        while True:
+            for i, j in self._ring_cells(ci, cj, ring):
+                for vid in self._cells.get((i, j), ()):
+                    if vid == exclude:
+                        continue
+                    seen += 1
+                    distance = haversine_km(location, self._points[vid])
+                    if max_radius_km is not None and distance > max_radius_km:
+                        continue
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, vid))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, vid))
+
+            # Anything outside the visited rings is at least this far away
+            bound = ring * cell_km
+            if seen >= total:
+                break
+            if len(best) == k and -best[0][0] <= bound:
+                break
+            if max_radius_km is not None and bound > max_radius_km:
+                break
+            ring += 1
+
+        return sorted(((vid, -neg) for neg, vid in best), key=lambda item: item[1])
+
+    @staticmethod
+    def _ring_cells(ci: int, cj: int, ring: int) -> Iterator[Tuple[int, int]]:
+        if ring == 0:
+            yield (ci, cj)
+            return
+        for j in range(cj - ring, cj + ring + 1):
+            yield (ci - ring, j)
+            yield (ci + ring, j)
+        for i in range(ci - ring + 1, ci + ring):
+            yield (i, cj - ring)
+            yield (i, cj + ring)
+
+    def in_bbox(self, south: float, west: float, north: float, east: float) -> List[str]:
+        """Village IDs inside a bounding box (e.g. the visible Leaflet map)."""
+        (s, w), (n, e) = self._cell(south, west), self._cell(north, east)
+
+        if (n - s + 1) * (e - w + 1) > len(self._cells):
+            # Box spans more cells than are occupied: scan the occupied ones
+            candidates = (vid for (i, j), ids in self._cells.items()
+                          if s <= i <= n and w <= j <= e for vid in ids)
+        else:
+            candidates = self._ids_in_cells((s, n), (w, e))
+
+        return [
+            vid for vid in candidates
+            if south <= self._points[vid][0] <= north and west <= self._points[vid][1] <= east
+        ]
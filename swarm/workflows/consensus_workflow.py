@@ -1,40 +1,95 @@
-from typing import Dict, List
-from datetime import datetime
+from typing import Dict, List, Optional
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import asyncio
+import heapq
+import time
 import uuid
 
+# Consensus settings
+CONSENSUS_SETTINGS = {
+    'consensus_threshold': 0.66,  # Approval share needed (2/3 majority)
+    'proposal_timeout': 60.0,     # Seconds a proposal stays open for votes
+    'partial_quorum': 0.5,        # Share of voters needed to decide at the deadline
+    'reap_interval': 5.0,         # Seconds between expiry sweeps
+    'closed_history': 256,        # Closed proposals kept for status lookups
+}
+
 class ConsensusWorkflow:
     """
     Workflow for distributed consensus among agents
     Implements Raft-inspired consensus protocol
+    
+    Votes are tallied as they arrive and a proposal is decided as soon as
+    the outcome can no longer change. Proposals that reach their deadline
+    are closed by a reaper with a partial-quorum outcome, and only the most
+    recent closed proposals are retained.
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        consensus_threshold: float = None,
+        proposal_timeout: float = None,
+        partial_quorum: float = None,
+        reap_interval: float = None,
+        closed_history: int = None
+    ):
+        settings = CONSENSUS_SETTINGS
+        self.consensus_threshold = (consensus_threshold if consensus_threshold is not None
+                                    else settings['consensus_threshold'])
+        self.proposal_timeout = (proposal_timeout if proposal_timeout is not None
+                                 else settings['proposal_timeout'])
+        self.partial_quorum = (partial_quorum if partial_quorum is not None
+                               else settings['partial_quorum'])
+        self.reap_interval = (reap_interval if reap_interval is not None
+                              else settings['reap_interval'])
+        self.closed_history = (closed_history if closed_history is not None
+                               else settings['closed_history'])
+        
         self.active_proposals: Dict[str, Dict] = {}
+        self.closed_proposals: "OrderedDict[str, Dict]" = OrderedDict()
+        
+        self._voters: Dict[str, set] = {}     # proposal_id -> eligible voter set
+        self._deadlines: List = []            # heap of (monotonic deadline, proposal_id)
+        self._reaper: asyncio.Task = None
     
     async def initiate_consensus(
         self,
         proposer_id: str,
         proposal: Dict,
-        eligible_voters: List[str]
+        eligible_voters: List[str],
+        timeout: float = None
     ) -> str:
         """
         Initiate consensus round
         
         Returns proposal_id
         """
+        self.reap_expired()
         
         proposal_id = str(uuid.uuid4())
+        voters = set(eligible_voters)
+        timeout = timeout if timeout is not None else self.proposal_timeout
+        created_at = datetime.now()
         
         self.active_proposals[proposal_id] = {
             'id': proposal_id,
             'proposer': proposer_id,
             'proposal': proposal,
-            'eligible_voters': eligible_voters,
+            'eligible_voters': list(voters),
             'votes': {},
+            'approve_votes': 0,
+            'reject_votes': 0,
             'status': 'voting',
-            'created_at': datetime.now(),
+            'created_at': created_at,
+            'deadline': created_at + timedelta(seconds=timeout),
             'consensus_reached': False
         }
+        self._voters[proposal_id] = voters
+        heapq.heappush(self._deadlines, (time.monotonic() + timeout, proposal_id))
+        
+        if not voters:
+            self._close(proposal_id, 'expired')
         
         return proposal_id
     
@@ -50,62 +105,132 @@ class ConsensusWorkflow:
         
         Returns True if vote accepted
         """
-        if proposal_id not in self.active_proposals:
+        proposal_state = self.active_proposals.get(proposal_id)
+        if proposal_state is None:
             return False
         
-        proposal_state = self.active_proposals[proposal_id]
-        
-        if voter_id not in proposal_state['eligible_voters']:
+        if voter_id not in self._voters[proposal_id]:
             return False
         
         if proposal_state['status'] != 'voting':
             return False
         
-        # Record vote
+        # A repeated vote replaces the voter's earlier one
+        previous = proposal_state['votes'].get(voter_id)
+        if previous is not None:
+            tally = 'approve_votes' if previous['vote'] == 'approve' else 'reject_votes'
+            proposal_state[tally] -= 1
+        
+        # Record vote and update the running tally
         proposal_state['votes'][voter_id] = {
             'vote': vote,
             'confidence': confidence,
             'timestamp': datetime.now()
         }
+        if vote == 'approve':
+            proposal_state['approve_votes'] += 1
+        else:
+            proposal_state['reject_votes'] += 1
         
-        # Check if all votes collected
-        if len(proposal_state['votes']) == len(proposal_state['eligible_voters']):
-            self._evaluate_consensus(proposal_id)
+        self._evaluate_consensus(proposal_id)
         
         return True
     
     def _evaluate_consensus(self, proposal_id: str):
         """
-        Evaluate if consensus has been reached
+        Decide the proposal as soon as the outcome is certain
+        
+        Approved once approvals alone reach the threshold of all eligible
+        voters; rejected once the threshold is out of reach even if every
+        remaining voter approves.
         """
         proposal_state = self.active_proposals[proposal_id]
-        votes = proposal_state['votes']
-        
-        # Count votes
-        total_votes = len(votes)
-        approve_votes = sum(1 for v in votes.values() if v['vote'] == 'approve')
-        
-        # Calculate consensus
-        approval_rate = approve_votes / total_votes if total_votes > 0 else 0
-        
-        # Consensus threshold (2/3 majority)
-        consensus_threshold = 0.66
+        eligible = len(self._voters[proposal_id])
+        approve_votes = proposal_state['approve_votes']
+        outstanding = eligible - len(proposal_state['votes'])
+        
+        if approve_votes >= self.consensus_threshold * eligible:
+            self._close(proposal_id, 'approved')
+        elif approve_votes + outstanding < self.consensus_threshold * eligible:
+            self._close(proposal_id, 'rejected')
+    
+    def _close(self, proposal_id: str, status: str, partial: bool = False):
+        """Record the outcome and move the proposal to the bounded history"""
+        proposal_state = self.active_proposals.pop(proposal_id)
+        self._voters.pop(proposal_id, None)
+        
+        total_votes = len(proposal_state['votes'])
+        approve_votes = proposal_state['approve_votes']
+        
+        proposal_state['status'] = status
+        proposal_state['consensus_reached'] = status == 'approved'
+        proposal_state['approval_rate'] = approve_votes / total_votes if total_votes > 0 else 0
+        proposal_state['partial_quorum'] = partial
+        proposal_state['evaluated_at'] = datetime.now()
         
-        if approval_rate >= consensus_threshold:
-            proposal_state['consensus_reached'] = True
-            proposal_state['status'] = 'approved'
-        else:
-            proposal_state['consensus_reached'] = False
-            proposal_state['status'] = 'rejected'
+        self.closed_proposals[proposal_id] = proposal_state
+        while len(self.closed_proposals) > self.closed_history:
+            self.closed_proposals.popitem(last=False)
+    
+    # ========================================================================
+    # EXPIRY
+    # ========================================================================
+    
+    def reap_expired(self) -> int:
+        """
+        Close proposals past their deadline. Returns how many were closed.
         
-        proposal_state['approval_rate'] = approval_rate
-        proposal_state['evaluated_at'] = datetime.now()
+        With at least `partial_quorum` of the voters in, the votes cast are
+        judged against the consensus threshold; otherwise the proposal
+        expires without consensus.
+        """
+        now = time.monotonic()
+        reaped = 0
+        
+        while self._deadlines and self._deadlines[0][0] <= now:
+            _, proposal_id = heapq.heappop(self._deadlines)
+            proposal_state = self.active_proposals.get(proposal_id)
+            if proposal_state is None:
+                continue  # Already decided
+            
+            eligible = len(self._voters[proposal_id])
+            total_votes = len(proposal_state['votes'])
+            if total_votes and total_votes >= self.partial_quorum * eligible:
+                approval_rate = proposal_state['approve_votes'] / total_votes
+                status = 'approved' if approval_rate >= self.consensus_threshold else 'rejected'
+            else:
+                status = 'expired'
+            
+            self._close(proposal_id, status, partial=True)
+            reaped += 1
+        
+        return reaped
+    
+    def start_reaper(self):
+        """Sweep expired proposals every `reap_interval` seconds"""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.get_running_loop().create_task(self._reap_loop())
+    
+    async def _reap_loop(self):
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            self.reap_expired()
+    
+    async def stop(self):
+        """Cancel the reaper task"""
+        if self._reaper and not self._reaper.done():
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
     
     def get_proposal_status(self, proposal_id: str) -> Dict:
         """Get current status of a proposal"""
-        return self.active_proposals.get(proposal_id, {})
+        return (self.active_proposals.get(proposal_id)
+                or self.closed_proposals.get(proposal_id, {}))
     
     def is_consensus_reached(self, proposal_id: str) -> bool:
         """Check if consensus was reached"""
-        proposal = self.active_proposals.get(proposal_id, {})
+        proposal = self.get_proposal_status(proposal_id)
         return proposal.get('consensus_reached', False)
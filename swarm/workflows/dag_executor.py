@@ -0,0 +1,123 @@
+"""
+DAG Workflow Executor
+Runs workflow steps as a dependency graph instead of a list
+"""
+
+from typing import Awaitable, Callable, Dict, List
+import asyncio
+import time
+
+
+class WorkflowGraphError(ValueError):
+    """Raised when step dependencies are unknown or cyclic"""
+    pass
+
+
+class DAGExecutor:
+    """
+    Executes steps as soon as everything they depend on has finished.
+
+    Independent steps run concurrently, each step is bounded by its own
+    `timeout` (and cancelled when it expires), and wall time is recorded per
+    step, so a workflow takes roughly as long as its critical path.
+
+    Steps need `name`, `depends_on` and `timeout` attributes (WorkflowStep).
+    """
+
+    def __init__(
+        self,
+        steps: List,
+        run_step: Callable[[object, Dict], Awaitable[Dict]],
+        should_continue: Callable[[object, Dict], bool] = None
+    ):
+        self.steps = {step.name: step for step in steps}
+        self.run_step = run_step
+        self.should_continue = should_continue or (lambda step, result: not result.get("error"))
+        self._validate()
+
+    def _validate(self):
+        """Reject unknown dependencies and cycles up front"""
+        remaining = {}
+        for name, step in self.steps.items():
+            for dep in step.depends_on or []:
+                if dep not in self.steps:
+                    raise WorkflowGraphError(f"Step '{name}' depends on unknown step '{dep}'")
+            remaining[name] = set(step.depends_on or [])
+
+        # Kahn's algorithm: peel off steps whose dependencies are all resolved
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise WorkflowGraphError(f"Dependency cycle among steps: {sorted(remaining)}")
+            for name in ready:
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+    async def run(self, context: Dict) -> Dict:
+        """
+        Run all steps; results land in context["step_results"].
+
+        Returns per-step timings: {name: {"started_ms", "duration_ms"}}.
+        """
+        step_results = context.setdefault("step_results", {})
+        timings: Dict[str, Dict] = {}
+        failed = set()
+        pending = dict(self.steps)
+        running: Dict[asyncio.Task, str] = {}
+        start = time.perf_counter()
+
+        try:
+            while pending or running:
+                # Launch every step whose dependencies have all finished
+                for name, step in list(pending.items()):
+                    deps = step.depends_on or []
+                    if any(dep not in step_results for dep in deps):
+                        continue
+                    del pending[name]
+
+                    failed_deps = [dep for dep in deps if dep in failed]
+                    if failed_deps:
+                        step_results[name] = {
+                            "skipped": True,
+                            "reason": f"Dependency failed: {', '.join(failed_deps)}"
+                        }
+                        failed.add(name)
+                        timings[name] = {"started_ms": None, "duration_ms": 0.0}
+                        continue
+
+                    task = asyncio.ensure_future(self._run_timed(step, context, start))
+                    running[task] = name
+
+                if not running:
+                    continue  # skips may have unblocked more steps
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    name = running.pop(task)
+                    result, timing = task.result()
+                    step_results[name] = result
+                    timings[name] = timing
+                    if not self.should_continue(self.steps[name], result):
+                        failed.add(name)
+        finally:
+            for task in running:
+                task.cancel()
+
+        return timings
+
+    async def _run_timed(self, step, context: Dict, start: float):
+        """Run one step under its timeout; never raises"""
+        started = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(self.run_step(step, context), step.timeout)
+        except asyncio.TimeoutError:
+            result = {"error": f"Step timed out after {step.timeout}s", "timed_out": True}
+        except Exception as e:
+            result = {"error": str(e)}
+        finished = time.perf_counter()
+
+        return result, {
+            "started_ms": round((started - start) * 1000, 2),
+            "duration_ms": round((finished - started) * 1000, 2)
+        }
@@ -5,6 +5,10 @@ Defines the coordinated workflow for swarm agents
 
 from typing import Dict, List, Any
 from dataclasses import dataclass
+import asyncio
+import time
+
+from swarm.workflows.dag_executor import DAGExecutor
 
 @dataclass
 class WorkflowStep:
@@ -22,7 +26,7 @@ class WorkflowStep:
 class OutbreakDetectionWorkflow:
     """
     Multi-agent workflow for outbreak detection
-    Coordinates agent actions in sequence
+    Coordinates agent actions as a dependency graph (see DAGExecutor)
     """
     
     name = "outbreak_detection"
@@ -48,6 +52,7 @@ class OutbreakDetectionWorkflow:
                 description="Agents query neighbors if anomaly detected",
                 agent_action="query_neighbors",
                 condition="anomaly_detected == true",
+                depends_on=["local_analysis"],
                 parallel=True,
                 timeout=60
             ),
@@ -66,6 +71,7 @@ class OutbreakDetectionWorkflow:
                 description="Agent with strongest evidence proposes action",
                 agent_action="propose_consensus",
                 agent_selector="max_outbreak_belief",
+                depends_on=["collective_reasoning"],
                 timeout=30
             ),
             
@@ -83,6 +89,7 @@ class OutbreakDetectionWorkflow:
                 description="Escalate to quantum if consensus reached",
                 agent_action="escalate_to_quantum",
                 condition="consensus_reached == true",
+                depends_on=["voting"],
                 agent_selector="proposer",
                 timeout=120
             )
@@ -101,19 +108,19 @@ class OutbreakDetectionWorkflow:
             "step_results": {}
         }
         
-        # Execute each step
-        for step in self.steps:
-            try:
-                step_result = await self._execute_step(step, results)
-                results["step_results"][step.name] = step_result
-                
-                # Check if we should continue
-                if not self._should_continue(step, step_result):
-                    break
-                    
-            except Exception as e:
-                results["step_results"][step.name] = {"error": str(e)}
-                break
+        # Independent steps run concurrently; dependents of a failed step are skipped
+        executor = DAGExecutor(self.steps, self._execute_step, self._should_continue)
+        start = time.perf_counter()
+        step_timings = await executor.run(results)
+        
+        # Report steps in declaration order
+        results["step_results"] = {
+            step.name: results["step_results"][step.name] for step in self.steps
+        }
+        results["step_timings_ms"] = {
+            step.name: step_timings[step.name] for step in self.steps
+        }
+        results["wall_time_ms"] = round((time.perf_counter() - start) * 1000, 2)
         
         return results
     
@@ -124,25 +131,23 @@ class OutbreakDetectionWorkflow:
         if step.condition and not self._evaluate_condition(step.condition, context):
             return {"skipped": True, "reason": f"Condition not met: {step.condition}"}
         
-        # Check dependencies
-        if step.depends_on:
-            for dep in step.depends_on:
-                if dep not in context.get("step_results", {}):
-                    return {"skipped": True, "reason": f"Dependency not met: {dep}"}
-        
         # Select agents
         agents = self._select_agents(step)
         
         # Execute action
         if step.parallel:
-            # Execute on all agents in parallel
+            # Fan out across all agents concurrently (cancelled together on step timeout)
+            outcomes = await asyncio.gather(
+                *(self._execute_agent_action(agent, step.agent_action, context)
+                  for agent in agents.values()),
+                return_exceptions=True
+            )
             results = {}
-            for agent_id, agent in agents.items():
-                try:
-                    result = await self._execute_agent_action(agent, step.agent_action, context)
-                    results[agent_id] = result
-                except Exception as e:
-                    results[agent_id] = {"error": str(e)}
+            for agent_id, outcome in zip(agents, outcomes):
+                if isinstance(outcome, Exception):
+                    results[agent_id] = {"error": str(outcome)}
+                else:
+                    results[agent_id] = outcome
             return {"parallel_results": results}
         else:
             # Execute on selected agent
@@ -159,7 +164,11 @@ class OutbreakDetectionWorkflow:
         all_agents = self.orchestrator.agents
         
         if step.agent_selector == "max_outbreak_belief":
-            # Select agent with highest outbreak belief
+            # Select agent with highest outbreak belief (leaderboard head)
+            leaderboard = getattr(self.orchestrator, 'leaderboard', None)
+            if leaderboard is not None:
+                leaders = leaderboard.top_k(1)
+                return {leaders[0][0]: all_agents[leaders[0][0]]} if leaders else {}
             max_agent = max(all_agents.items(), key=lambda x: x[1].outbreak_belief)
             return {max_agent[0]: max_agent[1]}
         elif step.agent_selector == "proposer":
@@ -0,0 +1,11 @@
+"""
+Shared pytest setup: make the project root importable.
+
+Async code is driven with asyncio.run() inside plain test functions, so the
+suite needs no asyncio plugin.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
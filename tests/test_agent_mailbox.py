@@ -0,0 +1,121 @@
+"""AgentMailbox: exclusive ordering, read-only interleaving, limits and stop()."""
+
+import asyncio
+
+import pytest
+
+from swarm.orchestrator.agent_mailbox import AgentMailbox, MailboxFullError
+
+
+def test_exclusive_messages_run_one_at_a_time_in_order():
+    log = []
+
+    async def run():
+        mailbox = AgentMailbox('v1')
+
+        def report(n):
+            async def handler():
+                log.append(('start', n))
+                await asyncio.sleep(0.01)
+                log.append(('end', n))
+                return n
+            return handler
+
+        results = await asyncio.gather(*(mailbox.submit(report(n)) for n in range(5)))
+        await mailbox.stop()
+        return results
+
+    assert asyncio.run(run()) == [0, 1, 2, 3, 4]
+    assert log == [(event, n) for n in range(5) for event in ('start', 'end')]
+
+
+def test_read_only_message_answered_while_exclusive_waits():
+    async def run():
+        mailbox = AgentMailbox('v1')
+        release = asyncio.Event()
+
+        async def report():
+            await release.wait()
+            return 'report'
+
+        async def query():
+            return 'query'
+
+        report_future = asyncio.ensure_future(mailbox.submit(report))
+        await asyncio.sleep(0)
+        # Would deadlock if queries had to wait behind the report
+        answer = await asyncio.wait_for(mailbox.submit(query, exclusive=False), 1.0)
+        release.set()
+        result = await report_future
+        await mailbox.stop()
+        return answer, result
+
+    assert asyncio.run(run()) == ('query', 'report')
+
+
+def test_handler_error_reaches_caller_and_worker_survives():
+    async def run():
+        mailbox = AgentMailbox('v1')
+
+        async def broken():
+            raise ValueError("bad report")
+
+        async def fine():
+            return 'ok'
+
+        with pytest.raises(ValueError):
+            await mailbox.submit(broken)
+        result = await mailbox.submit(fine)
+        metrics = mailbox.get_metrics()
+        await mailbox.stop()
+        return result, metrics
+
+    result, metrics = asyncio.run(run())
+    assert result == 'ok'
+    assert metrics['failed'] == 1 and metrics['processed'] == 2
+
+
+def test_full_mailbox_rejects():
+    async def run():
+        mailbox = AgentMailbox('v1', max_depth=2)
+        release = asyncio.Event()
+
+        async def report():
+            await release.wait()
+
+        queued = [asyncio.ensure_future(mailbox.submit(report))]
+        await asyncio.sleep(0.01)  # Running, so no longer counted in the depth
+        queued += [asyncio.ensure_future(mailbox.submit(report)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        with pytest.raises(MailboxFullError):
+            await mailbox.submit(report)
+        release.set()
+        await asyncio.gather(*queued)
+        rejected = mailbox.rejected
+        await mailbox.stop()
+        return rejected
+
+    assert asyncio.run(run()) == 1
+
+
+def test_stop_cancels_running_and_queued_messages():
+    finished = []
+
+    async def run():
+        mailbox = AgentMailbox('v1')
+
+        async def slow_report():
+            await asyncio.sleep(0.2)
+            finished.append(True)
+
+        futures = [asyncio.ensure_future(mailbox.submit(slow_report)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        await mailbox.stop()
+        outcomes = await asyncio.gather(*futures, return_exceptions=True)
+        await asyncio.sleep(0.3)  # Nothing left running in the background
+        return outcomes, mailbox.get_metrics()['running']
+
+    outcomes, running = asyncio.run(run())
+    assert all(isinstance(outcome, asyncio.CancelledError) for outcome in outcomes)
+    assert finished == []
+    assert running is False
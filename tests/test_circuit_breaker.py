@@ -0,0 +1,141 @@
+"""CircuitBreaker transitions and AsyncModelClient slot/cancellation handling."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from edge.circuit_breaker import CALL, CLOSED, HALF_OPEN, OPEN, PROBE, CircuitBreaker, CircuitOpenError
+from edge.model_client import AsyncModelClient, ModelCallTimeout
+
+
+def opened_breaker(open_seconds=0.05) -> CircuitBreaker:
+    breaker = CircuitBreaker(min_calls=2, failure_threshold=0.5, open_seconds=open_seconds)
+    for _ in range(2):
+        breaker.record(False, 0.1, breaker.allow())
+    assert breaker.state == OPEN
+    return breaker
+
+
+def test_opens_on_failure_rate_and_refuses_calls():
+    breaker = opened_breaker(open_seconds=60)
+    assert breaker.allow() is None
+    assert breaker.is_open
+    metrics = breaker.get_metrics()
+    assert metrics['short_circuited'] == 1 and metrics['times_opened'] == 1
+    assert metrics['rejection_rate'] == round(1 / 3, 3)
+
+
+def test_slow_calls_count_as_failures():
+    breaker = CircuitBreaker(min_calls=2, slow_call_seconds=1.0)
+    breaker.record(True, 5.0, breaker.allow())
+    breaker.record(True, 5.0, breaker.allow())
+    assert breaker.state == OPEN
+
+
+def test_half_open_lets_one_probe_through():
+    breaker = opened_breaker()
+    time.sleep(0.06)
+    assert breaker.allow() == PROBE
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is None  # Only one probe at a time
+
+
+@pytest.mark.parametrize('success, expected', [(True, CLOSED), (False, OPEN)])
+def test_probe_outcome_decides_half_open(success, expected):
+    breaker = opened_breaker()
+    time.sleep(0.06)
+    breaker.record(success, 0.1, breaker.allow())
+    assert breaker.state == expected
+
+
+def test_late_non_probe_call_does_not_decide_half_open():
+    breaker = CircuitBreaker(min_calls=2, open_seconds=0.05)
+    straggler = breaker.allow()  # Admitted while closed, finishes late
+    for _ in range(2):
+        breaker.record(False, 0.1, breaker.allow())
+    time.sleep(0.06)
+    probe = breaker.allow()
+
+    breaker.record(True, 0.1, straggler)
+    assert breaker.state == HALF_OPEN
+    breaker.record(True, 0.1, probe)
+    assert breaker.state == CLOSED
+
+
+def test_abandoned_probe_frees_the_probe_slot():
+    breaker = opened_breaker()
+    time.sleep(0.06)
+    probe = breaker.allow()
+    breaker.abandon(probe)
+    assert breaker.allow() == PROBE
+    breaker.abandon(CALL)  # Abandoning an ordinary call changes nothing
+    assert breaker.state == HALF_OPEN
+
+
+def test_client_fails_fast_while_open():
+    class Model:
+        calls = 0
+
+        async def generate_content_async(self, contents):
+            Model.calls += 1
+            raise RuntimeError("upstream 503")
+
+    async def run():
+        client = AsyncModelClient(Model(), breaker=CircuitBreaker(min_calls=2, open_seconds=60))
+        for _ in range(2):
+            with pytest.raises(RuntimeError):
+                await client.generate('x')
+        with pytest.raises(CircuitOpenError):
+            await client.generate('x')
+
+    asyncio.run(run())
+    assert Model.calls == 2
+
+
+def test_cancelled_calls_are_not_recorded_as_failures():
+    class Slow:
+        async def generate_content_async(self, contents):
+            await asyncio.sleep(5)
+
+    async def run():
+        client = AsyncModelClient(Slow(), breaker=CircuitBreaker(min_calls=1))
+        calls = [asyncio.ensure_future(client.generate(n)) for n in range(3)]
+        await asyncio.sleep(0.01)
+        for call in calls:
+            call.cancel()
+        await asyncio.gather(*calls, return_exceptions=True)
+        await asyncio.sleep(0)
+        return client
+
+    client = asyncio.run(run())
+    assert client.breaker.state == CLOSED
+    assert client.breaker.get_metrics()['window_calls'] == 0
+    assert client.in_flight == 0
+
+
+def test_timed_out_thread_calls_keep_their_slot():
+    active, peak, lock = [0], [0], threading.Lock()
+
+    class Blocking:
+        def generate_content(self, contents):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.2)
+            with lock:
+                active[0] -= 1
+            return contents
+
+    async def run():
+        client = AsyncModelClient(Blocking(), max_in_flight=2, call_timeout=0.02,
+                                  breaker=CircuitBreaker(min_calls=100))
+        results = await asyncio.gather(*(client.generate(n) for n in range(6)), return_exceptions=True)
+        await asyncio.sleep(0.3)
+        return results, client.in_flight
+
+    results, in_flight = asyncio.run(run())
+    assert all(isinstance(result, ModelCallTimeout) for result in results)
+    assert peak[0] <= 2
+    assert in_flight == 0
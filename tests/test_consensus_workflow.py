@@ -0,0 +1,84 @@
+"""ConsensusWorkflow: early decisions, vote rules, reaper and history bound."""
+
+import asyncio
+import time
+
+from swarm.workflows.consensus_workflow import ConsensusWorkflow
+
+
+def propose(workflow, voters, timeout=None) -> str:
+    return asyncio.run(workflow.initiate_consensus('p', {'action': 'alert'}, voters, timeout=timeout))
+
+
+def test_approved_as_soon_as_threshold_is_reached():
+    workflow = ConsensusWorkflow(consensus_threshold=0.66)
+    proposal_id = propose(workflow, ['a', 'b', 'c'])
+    workflow.cast_vote(proposal_id, 'a', 'approve', 0.9)
+    assert workflow.get_proposal_status(proposal_id)['status'] == 'voting'
+    workflow.cast_vote(proposal_id, 'b', 'approve', 0.8)
+    # 2 of 3 already meets 0.66 of all voters: decided without waiting for 'c'
+    assert workflow.is_consensus_reached(proposal_id)
+    assert workflow.cast_vote(proposal_id, 'c', 'reject', 0.8) is False
+    assert proposal_id in workflow.closed_proposals
+
+
+def test_rejected_once_threshold_is_out_of_reach():
+    workflow = ConsensusWorkflow(consensus_threshold=0.5)
+    proposal_id = propose(workflow, ['a', 'b', 'c', 'd'])
+    workflow.cast_vote(proposal_id, 'a', 'reject', 0.9)
+    workflow.cast_vote(proposal_id, 'b', 'reject', 0.9)
+    assert proposal_id in workflow.active_proposals  # 2 outstanding approvals could still reach 0.5
+    workflow.cast_vote(proposal_id, 'c', 'reject', 0.9)
+    status = workflow.get_proposal_status(proposal_id)
+    assert status['status'] == 'rejected' and not status['consensus_reached']
+
+
+def test_vote_rules():
+    workflow = ConsensusWorkflow(consensus_threshold=0.66)
+    proposal_id = propose(workflow, ['a', 'b', 'c'])
+    assert workflow.cast_vote(proposal_id, 'stranger', 'approve', 1.0) is False
+    assert workflow.cast_vote('unknown-proposal', 'a', 'approve', 1.0) is False
+    assert workflow.cast_vote(proposal_id, 'a', 'reject', 1.0) is True
+    assert workflow.cast_vote(proposal_id, 'a', 'approve', 1.0) is True  # Replaces the reject
+    state = workflow.get_proposal_status(proposal_id)
+    assert (state['approve_votes'], state['reject_votes']) == (1, 0)
+    workflow.cast_vote(proposal_id, 'b', 'approve', 1.0)
+    assert workflow.is_consensus_reached(proposal_id)
+    assert workflow.cast_vote(proposal_id, 'b', 'reject', 1.0) is False  # Closed
+
+
+def test_reap_expired_uses_partial_quorum():
+    workflow = ConsensusWorkflow(consensus_threshold=0.66, partial_quorum=0.5)
+    decided = propose(workflow, ['a', 'b', 'c', 'd'], timeout=0.05)
+    silent = propose(workflow, ['a', 'b', 'c', 'd'], timeout=0.05)
+    workflow.cast_vote(decided, 'a', 'approve', 1.0)
+    workflow.cast_vote(decided, 'b', 'approve', 1.0)
+    assert workflow.reap_expired() == 0  # Still open
+
+    time.sleep(0.06)
+    assert workflow.reap_expired() == 2
+    assert workflow.get_proposal_status(decided)['status'] == 'approved'
+    assert workflow.get_proposal_status(decided)['partial_quorum'] is True
+    assert workflow.get_proposal_status(silent)['status'] == 'expired'
+    assert workflow.active_proposals == {}
+
+
+def test_reaper_task_closes_expired_proposals():
+    async def run():
+        workflow = ConsensusWorkflow(reap_interval=0.01)
+        workflow.start_reaper()
+        proposal_id = await workflow.initiate_consensus('p', {}, ['a', 'b'], timeout=0.02)
+        await asyncio.sleep(0.1)
+        await workflow.stop()
+        return workflow, proposal_id
+
+    workflow, proposal_id = asyncio.run(run())
+    assert workflow.get_proposal_status(proposal_id)['status'] == 'expired'
+    assert workflow._reaper.done()
+
+
+def test_closed_history_is_bounded():
+    workflow = ConsensusWorkflow(closed_history=3)
+    ids = [propose(workflow, []) for _ in range(5)]  # No voters: closed immediately
+    assert list(workflow.closed_proposals) == ids[-3:]
+    assert workflow.get_proposal_status(ids[0]) == {}
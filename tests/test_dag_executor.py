@@ -0,0 +1,82 @@
+"""DAGExecutor: graph validation, dependency ordering, concurrency, failures."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from swarm.workflows.dag_executor import DAGExecutor, WorkflowGraphError
+from swarm.workflows.outbreak_detection_workflow import OutbreakDetectionWorkflow
+
+
+def step(name, depends_on=None, timeout=1.0):
+    return SimpleNamespace(name=name, depends_on=depends_on, timeout=timeout)
+
+
+def recorder(delays=None, errors=()):
+    """run_step that logs start/end events and sleeps per step."""
+    events = []
+
+    async def run_step(s, context):
+        events.append(('start', s.name))
+        await asyncio.sleep((delays or {}).get(s.name, 0.01))
+        events.append(('end', s.name))
+        if s.name in errors:
+            raise RuntimeError(f"{s.name} failed")
+        return {'ok': s.name}
+
+    return run_step, events
+
+
+def test_cycle_is_rejected():
+    steps = [step('a', ['c']), step('b', ['a']), step('c', ['b']), step('d')]
+    with pytest.raises(WorkflowGraphError, match="cycle"):
+        DAGExecutor(steps, recorder()[0])
+
+
+def test_unknown_dependency_is_rejected():
+    with pytest.raises(WorkflowGraphError, match="unknown"):
+        DAGExecutor([step('a', ['missing'])], recorder()[0])
+
+
+def test_dependents_start_after_dependencies_finish():
+    run_step, events = recorder()
+    steps = [step('a'), step('b', ['a']), step('c', ['a']), step('d', ['b', 'c'])]
+    context = {}
+    asyncio.run(DAGExecutor(steps, run_step).run(context))
+
+    position = {event: i for i, event in enumerate(events)}
+    for name, deps in (('b', ['a']), ('c', ['a']), ('d', ['b', 'c'])):
+        for dep in deps:
+            assert position[('end', dep)] < position[('start', name)]
+    assert set(context['step_results']) == {'a', 'b', 'c', 'd'}
+
+
+def test_independent_steps_run_concurrently():
+    run_step, events = recorder(delays={'a': 0.2, 'b': 0.2})
+    timings = asyncio.run(DAGExecutor([step('a'), step('b')], run_step).run({}))
+    # Both started before either finished
+    assert set(events[:2]) == {('start', 'a'), ('start', 'b')}
+    assert max(t['started_ms'] for t in timings.values()) < 100
+
+
+def test_failed_or_timed_out_step_skips_its_dependents():
+    run_step, events = recorder(delays={'slow': 5.0}, errors={'broken'})
+    steps = [step('broken'), step('after_broken', ['broken']),
+             step('slow', timeout=0.05), step('after_slow', ['slow']), step('fine')]
+    context = {}
+    asyncio.run(DAGExecutor(steps, run_step).run(context))
+
+    results = context['step_results']
+    assert results['broken'] == {'error': 'broken failed'}
+    assert results['slow']['timed_out'] is True
+    assert results['after_broken']['skipped'] and results['after_slow']['skipped']
+    assert results['fine'] == {'ok': 'fine'}
+    assert ('start', 'after_broken') not in events
+
+
+def test_outbreak_workflow_steps_form_the_sequential_chain():
+    steps = OutbreakDetectionWorkflow().steps
+    for previous, current in zip(steps, steps[1:]):
+        assert current.depends_on == [previous.name]
+    assert not steps[0].depends_on
@@ -0,0 +1,67 @@
+"""SwarmOrchestrator._fan_out: per-call deadline, quorum and failed calls."""
+
+import asyncio
+
+from swarm.orchestrator.swarm_orchestrator import SwarmOrchestrator
+
+
+def make_orchestrator(**kwargs) -> SwarmOrchestrator:
+    return SwarmOrchestrator(belief_propagation=False, **kwargs)
+
+
+async def answer(value, delay: float = 0.0):
+    await asyncio.sleep(delay)
+    return value
+
+
+async def fail(message: str):
+    raise RuntimeError(message)
+
+
+async def cancelled():
+    raise asyncio.CancelledError()
+
+
+def test_all_answers_collected():
+    orchestrator = make_orchestrator()
+    outcome = asyncio.run(orchestrator._fan_out({'a': answer(1), 'b': answer(2)}, timeout=1.0))
+    assert outcome['responses'] == {'a': 1, 'b': 2}
+    assert outcome['timed_out'] == [] and outcome['failed'] == {} and outcome['skipped'] == []
+
+
+def test_slow_call_times_out_without_delaying_others():
+    orchestrator = make_orchestrator()
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        outcome = await orchestrator._fan_out({'fast': answer(1), 'slow': answer(2, delay=5.0)}, timeout=0.1)
+        return outcome, loop.time() - started
+
+    outcome, elapsed = asyncio.run(run())
+    assert outcome['responses'] == {'fast': 1}
+    assert outcome['timed_out'] == ['slow']
+    assert elapsed < 1.0
+
+
+def test_quorum_returns_early_and_skips_the_rest():
+    orchestrator = make_orchestrator()
+    calls = {'a': answer(1), 'b': answer(2), 'c': answer(3, delay=5.0), 'd': answer(4, delay=5.0)}
+    outcome = asyncio.run(orchestrator._fan_out(calls, timeout=2.0, quorum=0.5))
+    assert outcome['responses'] == {'a': 1, 'b': 2}
+    assert sorted(outcome['skipped']) == ['c', 'd']
+    assert outcome['timed_out'] == []
+
+
+def test_failed_and_cancelled_calls_do_not_abort_the_fan_out():
+    orchestrator = make_orchestrator()
+    calls = {'ok': answer(1), 'error': fail("boom"), 'gone': cancelled()}
+    outcome = asyncio.run(orchestrator._fan_out(calls, timeout=1.0))
+    assert outcome['responses'] == {'ok': 1}
+    assert outcome['failed'] == {'error': 'boom', 'gone': 'cancelled'}
+
+
+def test_no_calls():
+    orchestrator = make_orchestrator()
+    outcome = asyncio.run(orchestrator._fan_out({}))
+    assert outcome == {'responses': {}, 'timed_out': [], 'failed': {}, 'skipped': []}
@@ -0,0 +1,73 @@
+"""RiskLeaderboard: rank, top-k and range queries after updates and removals."""
+
+import random
+
+from swarm.orchestrator.risk_leaderboard import RiskLeaderboard
+
+
+def reference_order(beliefs):
+    return sorted(beliefs.items(), key=lambda item: (-item[1], item[0]))
+
+
+def test_rank_and_top_k_follow_updates():
+    board = RiskLeaderboard()
+    for vid, belief in {'a': 0.2, 'b': 0.9, 'c': 0.5}.items():
+        board.update(vid, belief)
+    assert board.top_k(3) == [('b', 0.9), ('c', 0.5), ('a', 0.2)]
+    assert [board.rank(v) for v in 'abc'] == [3, 1, 2]
+
+    board.update('a', 0.95)
+    assert board.top_k(2) == [('a', 0.95), ('b', 0.9)]
+    assert board.rank('a') == 1 and board.rank('c') == 3
+
+
+def test_same_bucket_ties_break_by_exact_belief_then_id():
+    board = RiskLeaderboard()
+    board.update('z', 0.0)
+    board.update('y', 0.0)
+    board.update('x', 0.0001)  # Same 0.001 bucket, higher exact belief
+    assert board.top_k(3) == [('x', 0.0001), ('y', 0.0), ('z', 0.0)]
+    assert board.rank('y') == 2
+
+
+def test_removal():
+    board = RiskLeaderboard()
+    for vid, belief in {'a': 0.3, 'b': 0.6, 'c': 0.6}.items():
+        board.update(vid, belief)
+    assert board.remove('b') is True
+    assert board.remove('b') is False
+    assert 'b' not in board and len(board) == 2
+    assert board.rank('b') is None
+    assert board.rank('c') == 1 and board.rank('a') == 2
+    assert board.count_in_range(0.5, 1.0) == 1
+
+
+def test_range_queries():
+    board = RiskLeaderboard()
+    for vid, belief in {'a': 0.1, 'b': 0.4, 'c': 0.6, 'd': 0.8}.items():
+        board.update(vid, belief)
+    assert board.count_in_range(0.4, 0.8) == 3
+    assert board.in_range(0.4, 0.8) == [('d', 0.8), ('c', 0.6), ('b', 0.4)]
+    assert board.in_range(0.4, 0.8, limit=1) == [('d', 0.8)]
+    assert board.in_range(0.9, 1.0) == []
+
+
+def test_matches_a_sorted_reference_under_random_churn():
+    rng = random.Random(7)
+    board = RiskLeaderboard()
+    beliefs = {}
+    for _ in range(2000):
+        vid = f"v{rng.randrange(60)}"
+        if rng.random() < 0.2:
+            assert board.remove(vid) == (beliefs.pop(vid, None) is not None)
+        else:
+            belief = round(rng.random(), rng.choice([1, 3, 5]))
+            board.update(vid, belief)
+            beliefs[vid] = belief
+
+        order = reference_order(beliefs)
+        assert board.top_k(10) == order[:10]
+        probe = rng.choice(order)[0] if order else None
+        if probe:
+            assert board.rank(probe) == order.index((probe, beliefs[probe])) + 1
+    assert len(board) == len(beliefs)
@@ -0,0 +1,51 @@
+"""SwarmAggregates: incremental totals stay equal to a full recomputation."""
+
+import asyncio
+
+from swarm.orchestrator.swarm_aggregates import AgentState, SwarmAggregates
+from swarm.orchestrator.swarm_orchestrator import SwarmOrchestrator
+
+
+def test_add_update_remove():
+    aggregates = SwarmAggregates(high_belief_threshold=0.6)
+    first, second = AgentState(0.2, 'low', 1), AgentState(0.7, 'high', 3)
+    aggregates.add(first)
+    aggregates.add(second)
+    assert aggregates.agent_count == 2 and aggregates.total_reports == 4
+    assert abs(aggregates.average_belief - 0.45) < 1e-9
+    assert aggregates.high_belief_count == 1
+    assert aggregates.count_at_risk('high', 'critical') == 1
+
+    aggregates.update(first, AgentState(0.9, 'critical', 2))
+    assert aggregates.count_at_risk('high', 'critical') == 2
+    assert aggregates.risk_histogram == {'high': 1, 'critical': 1}
+    assert aggregates.total_reports == 5
+
+    aggregates.remove(second)
+    assert aggregates.agent_count == 1
+    assert aggregates.snapshot()['risk_histogram'] == {'critical': 1}
+
+
+def test_orchestrator_aggregates_match_agents_after_reports():
+    async def run():
+        orchestrator = SwarmOrchestrator(belief_propagation=False)
+        villages = list(orchestrator.agents)
+        for n in range(12):
+            await orchestrator.process_symptom_report(
+                villages[n % len(villages)], ['fever', 'vomiting', 'rash'][:1 + n % 3], {}
+            )
+        await orchestrator.remove_village(villages[-1])
+        await orchestrator.shutdown()
+        return orchestrator
+
+    orchestrator = asyncio.run(run())
+    agents = list(orchestrator.agents.values())
+    aggregates = orchestrator.aggregates
+    histogram = {}
+    for agent in agents:
+        histogram[agent.risk_level] = histogram.get(agent.risk_level, 0) + 1
+
+    assert aggregates.agent_count == len(agents)
+    assert aggregates.total_reports == sum(len(agent.symptom_history) for agent in agents)
+    assert abs(aggregates.average_belief - sum(a.outbreak_belief for a in agents) / len(agents)) < 1e-9
+    assert aggregates.risk_histogram == histogram